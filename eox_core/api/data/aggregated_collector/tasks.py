@@ -6,23 +6,27 @@ and posting the results to the Shipyard API.
 import logging
 
 from celery import shared_task
-from django.db.utils import DatabaseError, OperationalError
+from django.conf import settings
 
 from eox_core.api.data.aggregated_collector.queries import PREDEFINED_QUERIES
-from eox_core.api.data.aggregated_collector.utils import execute_query, post_data_to_api, post_process_query_results
+from eox_core.api.data.aggregated_collector.utils import execute_queries, get_queries_database, post_data_to_api
 
 logger = logging.getLogger(__name__)
 
 COUNTDOWN = 60
 MAX_RETRIES = 3
+# Default seconds a query can run and number of queries executed at the same time
+QUERY_TIMEOUT = 600
+MAX_WORKERS = 4
 
 
 @shared_task(bind=True)
 def generate_report(self, destination_url: str, token_generation_url: str, current_host: str):
     """
     Async task to generate a report:
-    1. Executes all predefined queries.
-    2. Sends the results to the Shipyard API.
+    1. Executes all predefined queries concurrently, against the read replica when
+       it is configured, each one with a statement timeout.
+    2. Sends the results and the duration of every query to the Shipyard API.
 
     Args:
         self (Task): The Celery task instance.
@@ -32,19 +36,14 @@ def generate_report(self, destination_url: str, token_generation_url: str, curre
         Retry: If an error occurs, the task retries up to 3 times with a 60-second delay.
     """
     try:
-        report_data = {}
-        for query_name, query_sql in PREDEFINED_QUERIES.items():
-            logger.info("Executing query: %s", query_name)
-            try:
-                result = execute_query(query_sql)
-
-                processed_result = post_process_query_results(result)
-                report_data[query_name] = processed_result
-            except (DatabaseError, OperationalError) as e:
-                logger.error("Failed to execute query '%s': %s", query_name, e)
-                continue
-
-        post_data_to_api(destination_url, report_data, token_generation_url, current_host)
+        report_data, query_stats = execute_queries(
+            PREDEFINED_QUERIES,
+            using=get_queries_database(),
+            timeout=getattr(settings, "EOX_CORE_AGGREGATED_COLLECTOR_QUERY_TIMEOUT", QUERY_TIMEOUT),
+            max_workers=getattr(settings, "EOX_CORE_AGGREGATED_COLLECTOR_MAX_WORKERS", MAX_WORKERS),
+        )
+
+        post_data_to_api(destination_url, report_data, token_generation_url, current_host, query_stats)
 
         logger.info("Report generation task completed successfully.")
     except Exception as e:
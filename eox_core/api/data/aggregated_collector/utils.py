@@ -3,23 +3,90 @@ Utility functions for report generation, including query execution and data post
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import requests
 from django.conf import settings
-from django.db import connection
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.utils import DatabaseError, OperationalError
 
 from eox_core.utils import get_access_token
 
 logger = logging.getLogger(__name__)
 
 
-def execute_query(sql_query: str):
+def get_queries_database():
+    """
+    Return the alias of the database used by the report queries: the one set in
+    EOX_CORE_AGGREGATED_COLLECTOR_DATABASE, else the read replica when it is configured.
+    """
+    alias = getattr(settings, "EOX_CORE_AGGREGATED_COLLECTOR_DATABASE", None)
+    if alias:
+        return alias
+    if "read_replica" in connections.databases:
+        return "read_replica"
+    return DEFAULT_DB_ALIAS
+
+
+def execute_queries(queries: dict, using: str = None, timeout: int = None, max_workers: int = 1):
+    """
+    Execute the queries concurrently, each one in its own thread and database connection.
+
+    Args:
+        queries (dict): The raw SQL queries by name.
+        using (str): The alias of the database, the default one if not given.
+        timeout (int): The seconds a query can run before the database cancels it.
+        max_workers (int): The number of queries executed at the same time.
+
+    Returns:
+        tuple: The processed results by name, without the failed queries, and the stats
+            of every query: its duration in seconds and whether it succeeded.
+    """
+    def run_query(query_name, query_sql):
+        logger.info("Executing query: %s", query_name)
+        start = time.monotonic()
+        try:
+            return post_process_query_results(execute_query(query_sql, using, timeout)), True
+        except (DatabaseError, OperationalError) as e:
+            logger.error("Failed to execute query '%s': %s", query_name, e)
+            return None, False
+        finally:
+            duration = time.monotonic() - start
+            logger.info("Query '%s' took %.3f seconds", query_name, duration)
+            durations[query_name] = duration
+            # The connections are opened per thread, close it before the thread is reused.
+            connections[using or DEFAULT_DB_ALIAS].close()
+
+    durations = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            query_name: executor.submit(run_query, query_name, query_sql)
+            for query_name, query_sql in queries.items()
+        }
+
+    report_data = {}
+    query_stats = {}
+    for query_name, future in futures.items():
+        result, succeeded = future.result()
+        if succeeded:
+            report_data[query_name] = result
+        query_stats[query_name] = {
+            "duration": round(durations[query_name], 3),
+            "status": "success" if succeeded else "failed",
+        }
+    return report_data, query_stats
+
+
+def execute_query(sql_query: str, using: str = None, timeout: int = None):
     """
     Execute a raw SQL query and return the results in a structured format.
 
     Args:
         sql_query (str): The raw SQL query to execute.
+        using (str): The alias of the database, the default one if not given.
+        timeout (int): The seconds the query can run before the database cancels it.
 
     Returns:
         list or dict: Structured query results.
@@ -31,7 +98,10 @@ def execute_query(sql_query: str):
             {"id": 2, "username": "jane_doe"}
         ]
     """
-    with connection.cursor() as cursor:
+    db_connection = connections[using] if using else connection
+    with db_connection.cursor() as cursor:
+        if timeout:
+            set_statement_timeout(db_connection, cursor, timeout)
         cursor.execute(sql_query)
         rows = cursor.fetchall()
         # If the query returns more than one column, return rows as is.
@@ -43,6 +113,23 @@ def execute_query(sql_query: str):
         return rows
 
 
+def set_statement_timeout(db_connection, cursor, timeout: int):
+    """
+    Limit the time the statements of the connection session can run, when the database supports it.
+
+    Args:
+        db_connection: The database connection of the cursor.
+        cursor: The cursor used to set the limit.
+        timeout (int): The limit in seconds.
+    """
+    if db_connection.vendor == "mysql" and getattr(db_connection, "mysql_is_mariadb", False):
+        cursor.execute("SET SESSION max_statement_time = %s", [timeout])
+    elif db_connection.vendor == "mysql":
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", [int(timeout * 1000)])
+    elif db_connection.vendor == "postgresql":
+        cursor.execute("SET statement_timeout = %s", [int(timeout * 1000)])
+
+
 def post_process_query_results(data: any):
     """
     Cleans and processes query results by:
@@ -68,12 +155,19 @@ def post_process_query_results(data: any):
     return data
 
 
-def post_data_to_api(api_url: str, report_data: dict, token_generation_url: str, current_host: str):
+def post_data_to_api(
+    api_url: str,
+    report_data: dict,
+    token_generation_url: str,
+    current_host: str,
+    query_stats: dict = None,
+):
     """
     Sends the generated report data to the Shipyard API.
 
     Args:
         report_data (dict): The data to be sent to the Shipyard API.
+        query_stats (dict): The duration and status of every query, sent along with the data.
 
     Raises:
         Exception: If the API request fails.
@@ -88,6 +182,8 @@ def post_data_to_api(api_url: str, report_data: dict, token_generation_url: str,
         "Content-Type": "application/json",
     }
     payload = {"instance_domain": current_host, "data": report_data}
+    if query_stats is not None:
+        payload["query_stats"] = query_stats
 
     try:
         response = requests.post(api_url, json=payload, headers=headers, timeout=10)
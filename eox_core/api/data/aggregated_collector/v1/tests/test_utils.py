@@ -1,11 +1,12 @@
 """
 Test suite for Aggregated Data Collector API.
 """
-from unittest.mock import patch
+from unittest.mock import call, patch
 
+from django.db.utils import OperationalError
 from django.test import TestCase
 
-from eox_core.api.data.aggregated_collector.utils import execute_query
+from eox_core.api.data.aggregated_collector.utils import execute_queries, execute_query
 
 
 class UtilsTests(TestCase):
@@ -55,3 +56,56 @@ class UtilsTests(TestCase):
         ]
 
         self.assertEqual(result, expected_result)
+
+    @patch("eox_core.api.data.aggregated_collector.utils.connection")
+    def test_execute_query_timeout(self, mock_connection):
+        """
+        Test that execute_query limits the execution time of the query when a timeout is given.
+        """
+        mock_connection.vendor = "mysql"
+        mock_connection.mysql_is_mariadb = False
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.fetchall.return_value = [(1,)]
+        mock_cursor.description = [("COUNT(*)",)]
+
+        result = execute_query("SELECT COUNT(*) FROM auth_user;", timeout=30)
+
+        self.assertEqual(result, [1])
+        self.assertEqual(
+            mock_cursor.execute.call_args_list,
+            [
+                call("SET SESSION MAX_EXECUTION_TIME = %s", [30000]),
+                call("SELECT COUNT(*) FROM auth_user;"),
+            ],
+        )
+
+    @patch("eox_core.api.data.aggregated_collector.utils.execute_query")
+    def test_execute_queries(self, mock_execute):
+        """
+        Test that execute_queries returns the results of the queries that succeed and the stats of all of them.
+        """
+        results = {
+            "users": [10],
+            "courses": [{"Year": 2024, "Courses": 2}],
+        }
+
+        def execute(sql_query, using, timeout):  # pylint: disable=unused-argument
+            if sql_query not in results:
+                raise OperationalError("Query execution was interrupted")
+            return results[sql_query]
+
+        mock_execute.side_effect = execute
+
+        report_data, query_stats = execute_queries(
+            {"Users": "users", "Courses": "courses", "Slow": "slow"},
+            timeout=30,
+            max_workers=3,
+        )
+
+        self.assertEqual(report_data, {"Users": 10, "Courses": {"Year": 2024, "Courses": 2}})
+        self.assertEqual(list(query_stats), ["Users", "Courses", "Slow"])
+        self.assertEqual(
+            {name: stats["status"] for name, stats in query_stats.items()},
+            {"Users": "success", "Courses": "success", "Slow": "failed"},
+        )
+        mock_execute.assert_any_call("slow", None, 30)
@@ -26,7 +26,7 @@ class AggregatedCollectorViewTests(TestCase):
         settings.EOX_CORE_AGGREGATED_COLLECTOR_TARGET_CLIENT_ID = "test-client-id"
         settings.EOX_CORE_AGGREGATED_COLLECTOR_TARGET_CLIENT_SECRET = "test-client-secret"
 
-    @patch("eox_core.api.data.aggregated_collector.tasks.execute_query")
+    @patch("eox_core.api.data.aggregated_collector.utils.execute_query")
     @patch("eox_core.api.data.aggregated_collector.tasks.post_data_to_api")
     def test_generate_report(self, mock_post, mock_execute):
         """
@@ -37,6 +37,10 @@ class AggregatedCollectorViewTests(TestCase):
         generate_report.run("http://mock-api.com", "http://mock-token.com", "localhost")
 
         mock_post.assert_called_once()
+        report_data, query_stats = mock_post.call_args.args[1], mock_post.call_args.args[4]
+        self.assertEqual(report_data["Total Users"], {"id": 1, "data": "sample"})
+        self.assertEqual(query_stats["Total Users"]["status"], "success")
+        self.assertEqual(mock_execute.call_count, len(report_data))
 
     @patch("eox_core.api.data.aggregated_collector.v1.views.generate_report.delay")
     def test_aggregated_collector_view(self, mock_task):
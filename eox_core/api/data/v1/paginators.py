@@ -1,14 +1,215 @@
 """
 TODO: add me
 """
+from collections import OrderedDict
+
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from eox_core.utils import fasthash
+
+COUNT_EXACT = "exact"
+COUNT_NONE = "none"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_NONE, COUNT_CACHED, COUNT_ESTIMATED)
+
+# Row estimates kept by the database statistics, per vendor.
+TABLE_ROWS_ESTIMATE_QUERIES = {
+    "mysql": (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    ),
+    "postgresql": "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+}
+
+
+class UncountedPage(Page):
+    """
+    A page that knows if there is a next one without counting the objects.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next_page):
+        super().__init__(object_list, number, paginator)
+        self.has_next_page = has_next_page
+
+    def has_next(self):
+        return self.has_next_page
+
+
+class UncountedPaginator(DjangoPaginator):
+    """
+    A paginator that reads one extra object to find out if there is a next
+    page, so the queryset is never counted.
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError) as error:
+            raise PageNotAnInteger("That page number is not an integer") from error
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage("That page contains no results")
+        return UncountedPage(object_list[:self.per_page], number, self, len(object_list) > self.per_page)
 
 
 class DataApiResultsSetPagination(PageNumberPagination):
     """
     A subset of data of any queryset
+
+    The `count_strategy` query param selects how the `count` is calculated:
+    `exact` counts the filtered queryset, `none` skips the count, `cached`
+    reuses the count of the same filtered query for EOX_CORE_DATA_API_COUNT_CACHE_TTL
+    seconds and `estimated` reads the table statistics of the database when
+    the queryset is not filtered, falling back to `cached` otherwise. Only
+    `exact` counts before paginating, the rest read one extra object to know
+    if there is a next page.
+    """
+    page_size = settings.DATA_API_DEF_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.DATA_API_MAX_PAGE_SIZE
+    count_strategy_query_param = 'count_strategy'
+
+    def __init__(self):
+        self.count = None
+        self.count_strategy = COUNT_EXACT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_strategy = self.get_count_strategy(request)
+        if self.count_strategy == COUNT_EXACT:
+            page = super().paginate_queryset(queryset, request, view)
+            if page is not None:
+                self.count = self.page.paginator.count
+            return page
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = UncountedPaginator(queryset, page_size)
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page = paginator.page(page_number)  # pylint: disable=attribute-defined-outside-init
+        except InvalidPage as error:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(error)
+            )) from error
+        self.request = request  # pylint: disable=attribute-defined-outside-init
+
+        self.count = self.get_count(queryset)
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('count_strategy', self.count_strategy),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        response_schema['properties']['count_strategy'] = {
+            'type': 'string',
+            'enum': list(COUNT_STRATEGIES),
+        }
+        return response_schema
+
+    def get_count_strategy(self, request):
+        """
+        Return the count strategy requested, or the default one of EOX_CORE_DATA_API_COUNT_STRATEGY.
+        """
+        count_strategy = request.query_params.get(
+            self.count_strategy_query_param,
+            getattr(settings, "EOX_CORE_DATA_API_COUNT_STRATEGY", COUNT_EXACT),
+        )
+        if count_strategy not in COUNT_STRATEGIES:
+            raise ValidationError({
+                self.count_strategy_query_param: f"Must be one of {', '.join(COUNT_STRATEGIES)}."
+            })
+        return count_strategy
+
+    def get_count(self, queryset):
+        """
+        Return the count of the queryset with the selected strategy, updating the
+        strategy when it falls back to another one.
+        """
+        if self.count_strategy == COUNT_ESTIMATED:
+            count = self.get_estimated_count(queryset)
+            if count is not None:
+                return count
+            self.count_strategy = COUNT_CACHED
+
+        if self.count_strategy == COUNT_CACHED:
+            return self.get_cached_count(queryset)
+
+        return None
+
+    def get_cached_count(self, queryset):
+        """
+        Return the count of the queryset, cached by its SQL, which holds the filters of the request.
+        """
+        try:
+            sql = str(queryset.query)
+        except EmptyResultSet:
+            return 0
+
+        cache_key = f"eox_core.data_api.count.{fasthash(sql)}"
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, getattr(settings, "EOX_CORE_DATA_API_COUNT_CACHE_TTL", 300))
+        return count
+
+    def get_estimated_count(self, queryset):
+        """
+        Return the rows of the queryset table estimated by the database statistics, or
+        None when the queryset is filtered or the database does not keep the estimate.
+        """
+        if queryset.query.where or queryset.query.distinct:
+            return None
+
+        connection = connections[queryset.db]
+        estimate_query = TABLE_ROWS_ESTIMATE_QUERIES.get(connection.vendor)
+        if not estimate_query:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(estimate_query, [queryset.model._meta.db_table])  # pylint: disable=protected-access
+            row = cursor.fetchone()
+
+        # A table never analyzed has no estimate
+        if not row or row[0] is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+class DataApiCursorPagination(CursorPagination):
+    """
+    A subset of data of any queryset, walked by its ordering fields.
+
+    Unlike the page number pagination, there is no count nor offset query, so
+    the deep pages of large tables are as fast as the first one. The viewset
+    sets the ordering, the first field should be indexed and nearly unique.
     """
     page_size = settings.DATA_API_DEF_PAGE_SIZE
     page_size_query_param = 'page_size'
     max_page_size = settings.DATA_API_MAX_PAGE_SIZE
+    ordering = 'pk'
@@ -0,0 +1,224 @@
+"""
+Files of the data-api reports.
+
+Large task results are stored as gzip files in a django storage instead of the
+celery result backend, and the tasks only return their metadata. Each chunk of
+a report is written as a gzip member, so the chunks can be joined by
+concatenating them.
+
+The reports hold personal data, so they are only written to the private storage
+set in EOX_CORE_DATA_API_REPORTS_STORAGE, under names that can not be guessed,
+and downloaded through urls signed by eox-core that expire.
+"""
+import csv
+import gzip
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+REPORT_FORMATS = ("jsonl", "csv")
+REPORT_URL_SALT = "eox_core.data_api.reports"
+
+
+def get_reports_storage():
+    """
+    Return the storage of the reports, set in EOX_CORE_DATA_API_REPORTS_STORAGE.
+
+    There is no fallback to the default storage, which usually serves its files publicly.
+    """
+    storage_class = getattr(settings, "EOX_CORE_DATA_API_REPORTS_STORAGE", None)
+    if not storage_class:
+        raise ImproperlyConfigured(
+            "EOX_CORE_DATA_API_REPORTS_STORAGE must be set to a private storage to store the data-api reports."
+        )
+    return import_string(storage_class)()
+
+
+def get_report_name(report_id, report_format):
+    """
+    Return the name of the report file in the storage, with a random token so it can not be guessed.
+    """
+    reports_path = getattr(settings, "EOX_CORE_DATA_API_REPORTS_PATH", "eox_core/data_api_reports")
+    return f"{reports_path}/{report_id}-{uuid4().hex}.{report_format}.gz"
+
+
+def write_report_part(name, rows, report_format, header=False):
+    """
+    Write the rows as a gzip file with the given name and return the name used by the storage.
+
+    Args:
+        name (str): The name of the file.
+        rows (list): The rows to write, as dicts.
+        report_format (str): `jsonl` or `csv`.
+        header (bool): Whether to write the csv header before the rows.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb") as gzip_file:
+        text_file = io.TextIOWrapper(gzip_file, encoding="utf-8", newline="")
+        text_file.writelines(encode_rows(rows, report_format, header=header))
+        text_file.flush()
+        text_file.detach()
+
+    return get_reports_storage().save(name, ContentFile(buffer.getvalue()))
+
+
+def read_report_rows(name):
+    """
+    Yield the rows of a JSON Lines report, one row at a time.
+    """
+    with get_reports_storage().open(name, "rb") as report_file:
+        with gzip.GzipFile(fileobj=report_file, mode="rb") as gzip_file:
+            for line in io.TextIOWrapper(gzip_file, encoding="utf-8"):
+                yield json.loads(line)
+
+
+def encode_rows(rows, report_format, header=True):
+    """
+    Yield the lines of the rows in the given format, one row at a time.
+
+    Args:
+        rows (iterable): The rows to encode, as dicts.
+        report_format (str): `jsonl` or `csv`. The csv columns are the ones of the first row.
+        header (bool): Whether to yield the csv header before the rows.
+    """
+    if report_format != "csv":
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder) + "\n"
+        return
+
+    writer = None
+    for row in rows:
+        row = _flatten_row(row)
+        if writer is None:
+            writer = csv.DictWriter(_EchoBuffer(), fieldnames=list(row))
+            if header:
+                yield writer.writeheader()
+        yield writer.writerow(row)
+
+
+def save_report(name, part_names, report_format, count):
+    """
+    Join the parts of a report in a single file, remove the parts and return the report metadata.
+    """
+    storage = get_reports_storage()
+    if not part_names:
+        name = write_report_part(name, [], report_format)
+    else:
+        with tempfile.TemporaryFile() as report_file:
+            for part_name in part_names:
+                with storage.open(part_name, "rb") as part_file:
+                    shutil.copyfileobj(part_file, report_file)
+            report_file.seek(0)
+            name = storage.save(name, File(report_file))
+        for part_name in part_names:
+            storage.delete(part_name)
+
+    ttl = getattr(settings, "EOX_CORE_DATA_API_REPORTS_TTL", 604800)
+    return {
+        "report": name,
+        "format": report_format,
+        "count": count,
+        "size": storage.size(name),
+        "expires_at": (timezone.now() + timedelta(seconds=ttl)).isoformat(),
+    }
+
+
+def get_report_download_token(report):
+    """
+    Return the signed token of the url to download the report, or None when it has already expired.
+
+    The token expires after EOX_CORE_DATA_API_REPORTS_URL_TTL seconds, see `get_signed_report_name`.
+    """
+    if not get_reports_storage().exists(report["report"]):
+        return None
+    return signing.dumps(report["report"], salt=REPORT_URL_SALT)
+
+
+def get_signed_report_name(token):
+    """
+    Return the name of the report signed in a download token.
+
+    Raises:
+        signing.BadSignature: The token was not signed by eox-core or it has expired.
+    """
+    return signing.loads(
+        token,
+        salt=REPORT_URL_SALT,
+        max_age=getattr(settings, "EOX_CORE_DATA_API_REPORTS_URL_TTL", 3600),
+    )
+
+
+def delete_expired_reports():
+    """
+    Delete the reports and the orphan parts older than EOX_CORE_DATA_API_REPORTS_TTL seconds.
+
+    Returns:
+        list: The names of the deleted files.
+    """
+    storage = get_reports_storage()
+    reports_path = getattr(settings, "EOX_CORE_DATA_API_REPORTS_PATH", "eox_core/data_api_reports")
+    ttl = getattr(settings, "EOX_CORE_DATA_API_REPORTS_TTL", 604800)
+    expired_before = timezone.now() - timedelta(seconds=ttl)
+
+    try:
+        _, file_names = storage.listdir(reports_path)
+    except FileNotFoundError:
+        return []
+
+    deleted = []
+    for file_name in file_names:
+        name = f"{reports_path}/{file_name}"
+        modified_time = storage.get_modified_time(name)
+        if timezone.is_naive(modified_time):
+            modified_time = timezone.make_aware(modified_time)
+        if modified_time < expired_before:
+            storage.delete(name)
+            deleted.append(name)
+    return deleted
+
+
+class _EchoBuffer:
+    """
+    File-like object that returns what is written, so the csv writer returns its lines.
+    """
+
+    def write(self, value):
+        """
+        Return the value instead of storing it.
+        """
+        return value
+
+
+def _flatten_row(row):
+    """
+    Flatten the nested dicts of a row into dotted columns, encoding deeper values as JSON.
+    """
+    flat_row = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            for nested_key, nested_value in value.items():
+                flat_row[f"{key}.{nested_key}"] = _csv_value(nested_value)
+        else:
+            flat_row[key] = _csv_value(value)
+    return flat_row
+
+
+def _csv_value(value):
+    """
+    Return the value as it is written in a csv cell.
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=JSONEncoder)
+    return value
@@ -83,6 +83,12 @@ class UserSerializer(serializers.Serializer):  # pylint: disable=abstract-method
 
     site = CustomRelatedField(source='usersignupsource_set', field='site', many=True)
 
+    # Model fields read by the fields that are properties, used to serialize the rows of values()
+    values_sources = {
+        "gender_display": ("profile.gender", "display"),
+        "level_of_education_display": ("profile.level_of_education", "display"),
+    }
+
 
 class CourseEnrollmentSerializer(serializers.Serializer):  # pylint: disable=abstract-method
     """
@@ -104,12 +110,14 @@ class CourseEnrollmentWithGradesSerializer(CourseEnrollmentSerializer):  # pylin
 
     def get_grades(self, obj):
         """
-        TODO: add me
+        Return the grade summary of the enrollment, loading each course once per serialization.
         """
+        courses = self.context.setdefault("courses", {})
+        if obj.course_id not in courses:
+            courses[obj.course_id] = get_courseware_courses().get_course_by_id(obj.course_id)
+
         grade_factory = get_course_grade_factory()
-        course = get_courseware_courses().get_course_by_id(obj.course_id)
-        user = obj.user
-        gradeset = grade_factory().read(user, course).summary
+        gradeset = grade_factory().read(obj.user, courses[obj.course_id]).summary
         return gradeset
 
 
@@ -160,6 +168,11 @@ class ProctoredExamStudentAttemptSerializer(serializers.Serializer):  # pylint:
 
     time_taken = serializers.SerializerMethodField()
 
+    # Model fields read by the method fields, used to load only what the requested fields need
+    field_sources = {
+        "time_taken": ("started_at", "completed_at"),
+    }
+
     def get_time_taken(self, obj):
         """
         TODO: add me
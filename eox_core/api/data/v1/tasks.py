@@ -1,27 +1,115 @@
 """
-TODO: add me
+Async tasks of the data-api.
 """
-from celery import Task
+from celery import Task, chord, shared_task
+from django.conf import settings
+from django.http import QueryDict
+from django.utils.module_loading import import_string
 
 from eox_core.edxapp_wrapper.users import get_course_enrollment
 
+from .reports import get_report_name, save_report, write_report_part
 from .serializers import CourseEnrollmentWithGradesSerializer
 
 
 class EnrollmentsGrades(Task):
     """
-    TODO: add me
+    Builds the grades report of the enrollments matching the filters of a data-api request.
     """
 
-    def run(self, data, *args, **kwargs):  # pylint: disable=unused-argument
+    def run(  # pylint: disable=unused-argument, keyword-arg-before-vararg
+        self, filters=None, org_filters=None, report_format="jsonl", *args, **kwargs
+    ):
         """
-        This task receives a list with enrollments, and returns the same
-        enrollments with grades data
+        This task receives the filters of the request and is replaced by a chord that reads
+        the grades of the matching enrollments by chunks, in parallel, and joins the chunks
+        in a single report file. The result of the chord, the metadata of the report, is
+        kept under the id of this task.
+
+        The enrollments are read from the db in chunks ordered by primary key, each one
+        with its own query after the last key of the previous one, and every chunk is
+        sorted by course, so every course is loaded once per chunk.
+
+        Args:
+            filters (dict): The query params of the request, as lists of values.
+            org_filters (str or list): The orgs of the site of the request, or None when
+                the enrollments are not restricted to the site orgs.
+            report_format (str): `jsonl` or `csv`.
         """
+        report_name = get_report_name(self.request.id, report_format)
+        queryset = get_enrollments_queryset(filters or {}, org_filters)
+        chunk_size = getattr(settings, "EOX_CORE_GRADES_REPORT_CHUNK_SIZE", 500)
+        routing_key = getattr(settings, "GRADES_DOWNLOAD_ROUTING_KEY", None)
+
+        # The viewsets module is loaded on run because it dispatches this task.
+        iter_pk_chunks = import_string("eox_core.api.data.v1.viewsets.iter_pk_chunks")
+        chunks = [
+            [row["pk"] for row in chunk]
+            for chunk in iter_pk_chunks(queryset.values("pk"), chunk_size)
+        ]
+
+        if not chunks:
+            return save_report(report_name, [], report_format, 0)
+
+        header = [
+            enrollments_grades_chunk.s(
+                chunk,
+                f"{report_name}.part{index:06d}",
+                report_format,
+                header=index == 0,
+            ).set(routing_key=routing_key)
+            for index, chunk in enumerate(chunks)
+        ]
+        body = save_enrollments_grades_report.s(report_name, report_format).set(routing_key=routing_key)
+        raise self.replace(chord(header, body))
+
+
+@shared_task
+def enrollments_grades_chunk(enrollment_ids, part_name, report_format, header=False):
+    """
+    Write the given enrollments with their grades data as a part of the report, loading each course once.
+
+    Returns:
+        dict: The name of the part in the storage and the number of enrollments written.
+    """
+    enrollments_queryset = get_course_enrollment().objects.filter(
+        id__in=enrollment_ids,
+    ).select_related("user").order_by("course_id", "id")
 
-        enrollments_ids = [el["id"] for el in data]
-        enrollments_queryset = get_course_enrollment().objects.filter(id__in=enrollments_ids)
+    serializer = CourseEnrollmentWithGradesSerializer(enrollments_queryset, many=True)
+    rows = serializer.data
+
+    return {
+        "part": write_report_part(part_name, rows, report_format, header=header),
+        "count": len(rows),
+    }
+
+
+@shared_task
+def save_enrollments_grades_report(parts, report_name, report_format):
+    """
+    Join the parts of the grades report, in the order of the chunks, and return the report metadata.
+    """
+    return save_report(
+        report_name,
+        [part["part"] for part in parts],
+        report_format,
+        sum(part["count"] for part in parts),
+    )
+
+
+def get_enrollments_queryset(filters, org_filters=None):
+    """
+    Return the enrollments matching the filters the same way the grades viewset does.
+    """
+    # The viewset is loaded on run because the viewsets module dispatches the task.
+    viewset = import_string("eox_core.api.data.v1.viewsets.CourseEnrollmentWithGradesViewset")()
+    queryset = viewset.queryset.all()
+    if org_filters is not None:
+        queryset = viewset.filter_queryset_by_orgs(queryset, org_filters)
 
-        serializer = CourseEnrollmentWithGradesSerializer(enrollments_queryset, many=True)
+    query_params = QueryDict(mutable=True)
+    for name, values in filters.items():
+        query_params.setlist(name, values)
 
-        return serializer.data
+    return viewset.filter_class(query_params, queryset=queryset).qs
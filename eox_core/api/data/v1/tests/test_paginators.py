@@ -0,0 +1,154 @@
+"""
+Test suite for the data-api paginators.
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from eox_core.api.data.v1.paginators import DataApiCursorPagination, DataApiResultsSetPagination
+from eox_core.api.data.v1.viewsets import CourseEnrollmentViewset, UsersViewSet
+
+
+class PaginatorsTests(TestCase):
+    """
+    Test suite for the data-api pagination modes.
+    """
+
+    def setUp(self):
+        """
+        Create the users to paginate.
+        """
+        self.factory = APIRequestFactory()
+        for index in range(5):
+            User.objects.create(username=f"user{index}", email=f"user{index}@example.com")
+
+    def get_viewset(self, viewset_class, query_params):
+        """
+        Return a viewset instance handling a request with the given query params.
+        """
+        viewset = viewset_class()
+        viewset.request = Request(self.factory.get("/", query_params))
+        return viewset
+
+    def test_page_number_pagination_by_default(self):
+        """
+        Test that the page number pagination is kept unless the request opts in.
+        """
+        viewset = self.get_viewset(UsersViewSet, {})
+
+        self.assertIsInstance(viewset.paginator, DataApiResultsSetPagination)
+
+    def test_cursor_pagination_ordering(self):
+        """
+        Test that the cursor pagination is ordered by the primary key, which is unique and never null.
+        """
+        users_paginator = self.get_viewset(UsersViewSet, {"pagination": "cursor"}).paginator
+        enrollments_paginator = self.get_viewset(CourseEnrollmentViewset, {"pagination": "cursor"}).paginator
+
+        self.assertIsInstance(users_paginator, DataApiCursorPagination)
+        self.assertEqual(users_paginator.ordering, ("pk",))
+        self.assertEqual(enrollments_paginator.ordering, ("pk",))
+
+    def test_cursor_pagination_walks_all_pages_without_counts(self):
+        """
+        Test that all the pages are walked by cursor without count or offset queries.
+        """
+        query_params = {"pagination": "cursor", "page_size": 2}
+        usernames = []
+
+        with CaptureQueriesContext(connection) as queries:
+            while query_params:
+                viewset = self.get_viewset(UsersViewSet, query_params)
+                page = viewset.paginator.paginate_queryset(User.objects.all(), viewset.request, view=viewset)
+                usernames += [user.username for user in page]
+                next_link = viewset.paginator.get_next_link()
+                query_params = next_link and dict(Request(self.factory.get(next_link)).query_params.items())
+
+        self.assertEqual(usernames, [f"user{index}" for index in range(5)])
+        self.assertFalse(any("COUNT(" in query["sql"] or "OFFSET" in query["sql"] for query in queries))
+
+
+class CountStrategiesTests(TestCase):
+    """
+    Test suite for the count strategies of the page number pagination.
+    """
+
+    def setUp(self):
+        """
+        Create the users to paginate.
+        """
+        self.factory = APIRequestFactory()
+        for index in range(5):
+            User.objects.create(username=f"user{index}", email=f"user{index}@example.com")
+
+    def paginate(self, query_params, queryset=None):
+        """
+        Return the paginated response of the users for the given query params.
+        """
+        paginator = DataApiResultsSetPagination()
+        request = Request(self.factory.get("/", query_params))
+        page = paginator.paginate_queryset(
+            queryset if queryset is not None else User.objects.order_by("id"),
+            request,
+        )
+        return paginator.get_paginated_response([user.username for user in page]).data
+
+    def test_exact_count(self):
+        """
+        Test that the exact count is kept by default.
+        """
+        response = self.paginate({"page_size": 2})
+
+        self.assertEqual(response["count"], 5)
+        self.assertEqual(response["count_strategy"], "exact")
+        self.assertIsNotNone(response["next"])
+
+    def test_no_count(self):
+        """
+        Test that the pages are walked without counting the queryset.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            last_page = self.paginate({"page_size": 2, "page": 3, "count_strategy": "none"})
+
+        self.assertEqual(last_page["count"], None)
+        self.assertEqual(last_page["count_strategy"], "none")
+        self.assertEqual(last_page["results"], ["user4"])
+        self.assertIsNone(last_page["next"])
+        self.assertIsNotNone(last_page["previous"])
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+
+    def test_cached_count(self):
+        """
+        Test that the count of the same filtered query is reused.
+        """
+        queryset = User.objects.filter(username__startswith="user").order_by("id")
+        first = self.paginate({"count_strategy": "cached"}, queryset)
+        User.objects.create(username="user5")
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.paginate({"count_strategy": "cached"}, queryset)
+
+        self.assertEqual(first["count"], 5)
+        self.assertEqual(second["count"], 5)
+        self.assertEqual(second["count_strategy"], "cached")
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+
+    def test_estimated_count_falls_back_to_cached(self):
+        """
+        Test that the cached count is used when the database has no table statistics.
+        """
+        response = self.paginate({"count_strategy": "estimated"})
+
+        self.assertEqual(response["count"], 5)
+        self.assertEqual(response["count_strategy"], "cached")
+
+    def test_invalid_count_strategy(self):
+        """
+        Test that only the supported strategies are accepted.
+        """
+        with self.assertRaises(ValidationError):
+            self.paginate({"count_strategy": "approximate"})
@@ -0,0 +1,148 @@
+"""
+Test suite for the data-api report files.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from mock import patch
+
+from eox_core.api.data.v1.reports import (
+    delete_expired_reports,
+    get_report_download_token,
+    get_report_name,
+    get_reports_storage,
+    save_report,
+    write_report_part,
+)
+
+
+class ReportsTests(TestCase):
+    """
+    Test suite for the reports stored as gzip files.
+    """
+
+    def setUp(self):
+        """
+        Store the reports in a temporary directory.
+        """
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            EOX_CORE_DATA_API_REPORTS_STORAGE="django.core.files.storage.FileSystemStorage",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def read_report(self, name):
+        """
+        Return the uncompressed content of a report.
+        """
+        with get_reports_storage().open(name, "rb") as report_file:
+            return gzip.decompress(report_file.read()).decode("utf-8")
+
+    def test_jsonl_report_joined_in_order(self):
+        """
+        Test that the parts of a JSON Lines report are joined in order and removed.
+        """
+        name = get_report_name("task-id", "jsonl")
+        parts = [
+            write_report_part(f"{name}.part000000", [{"id": 1}, {"id": 2}], "jsonl"),
+            write_report_part(f"{name}.part000001", [{"id": 3}], "jsonl"),
+        ]
+
+        report = save_report(name, parts, "jsonl", 3)
+
+        self.assertEqual(report["report"], name)
+        self.assertEqual(report["count"], 3)
+        self.assertEqual(self.read_report(name), '{"id": 1}\n{"id": 2}\n{"id": 3}\n')
+        self.assertFalse(any(get_reports_storage().exists(part) for part in parts))
+        self.assertIsNotNone(get_report_download_token(report))
+
+    def test_csv_report_with_nested_columns(self):
+        """
+        Test that the nested values of a csv report are flattened and the header is written once.
+        """
+        name = get_report_name("task-id", "csv")
+        rows = [{"id": 1, "grades": {"percent": 0.5, "section_breakdown": []}}]
+        parts = [
+            write_report_part(f"{name}.part000000", rows, "csv", header=True),
+            write_report_part(f"{name}.part000001", rows, "csv"),
+        ]
+
+        save_report(name, parts, "csv", 2)
+
+        self.assertEqual(
+            self.read_report(name).splitlines(),
+            ["id,grades.percent,grades.section_breakdown", "1,0.5,[]", "1,0.5,[]"],
+        )
+
+    def test_delete_expired_reports(self):
+        """
+        Test that only the reports older than the TTL are deleted.
+        """
+        expired = save_report(get_report_name("expired", "jsonl"), [], "jsonl", 0)
+        current = save_report(get_report_name("current", "jsonl"), [], "jsonl", 0)
+        expired_time = time.time() - 3600
+        os.utime(os.path.join(self.media_root, expired["report"]), (expired_time, expired_time))
+
+        with override_settings(EOX_CORE_DATA_API_REPORTS_TTL=60):
+            deleted = delete_expired_reports()
+
+        self.assertEqual(deleted, [expired["report"]])
+        self.assertIsNone(get_report_download_token(expired))
+        self.assertIsNotNone(get_report_download_token(current))
+
+    def test_delete_expired_reports_without_reports(self):
+        """
+        Test that nothing fails before the first report is stored.
+        """
+        self.assertEqual(delete_expired_reports(), [])
+
+    def test_private_storage_required(self):
+        """
+        Test that the reports are not written when there is no private storage set.
+        """
+        with override_settings(EOX_CORE_DATA_API_REPORTS_STORAGE=None):
+            with self.assertRaises(ImproperlyConfigured):
+                write_report_part(get_report_name("task-id", "jsonl"), [{"id": 1}], "jsonl")
+
+    def test_report_name_not_guessable(self):
+        """
+        Test that the name of a report can not be derived from its task id.
+        """
+        self.assertNotEqual(get_report_name("task-id", "jsonl"), get_report_name("task-id", "jsonl"))
+
+    @patch("eox_core.api.data.v1.views.AsyncResult")
+    def test_download_signed_url(self, async_result):
+        """
+        Test that the report is downloaded with the signed url returned in the status of its task.
+        """
+        report = save_report(get_report_name("task-id", "jsonl"), [], "jsonl", 0)
+        async_result.return_value.state = "SUCCESS"
+        async_result.return_value.result = report
+
+        response = self.client.get(reverse("eox-data-api:celery-data-api-tasks", kwargs={"task_id": "task-id"}))
+        download = self.client.get(response.data["result"]["download_url"])
+
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(gzip.decompress(b"".join(download.streaming_content)), b"")
+
+    def test_download_invalid_url(self):
+        """
+        Test that the reports can not be downloaded with a tampered or an expired signature.
+        """
+        report = save_report(get_report_name("task-id", "jsonl"), [], "jsonl", 0)
+        with patch("django.core.signing.time.time", return_value=time.time() - 7200):
+            expired_token = get_report_download_token(report)
+
+        for token in (get_report_download_token(report) + "x", expired_token, "task-id"):
+            response = self.client.get(reverse("eox-data-api:data-api-reports", kwargs={"token": token}))
+
+            self.assertEqual(response.status_code, 404)
@@ -0,0 +1,42 @@
+"""
+Test suite for the data-api tasks.
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from mock import Mock, patch
+
+from eox_core.api.data.v1.tasks import EnrollmentsGrades
+
+
+class EnrollmentsGradesTests(TestCase):
+    """
+    Test suite for the task building the grades report.
+    """
+
+    @override_settings(EOX_CORE_GRADES_REPORT_CHUNK_SIZE=2)
+    @patch.object(EnrollmentsGrades, "request", Mock(id="task-id"))
+    @patch("eox_core.api.data.v1.tasks.chord")
+    @patch("eox_core.api.data.v1.tasks.get_enrollments_queryset")
+    def test_chunks_by_primary_key(self, get_enrollments_queryset, chord):
+        """
+        Test that the enrollments are split in chunks read after the last primary key of the previous one.
+        """
+        users = [User.objects.create(username=f"user{index}") for index in range(3)]
+        get_enrollments_queryset.return_value = User.objects.all()
+        task = EnrollmentsGrades()
+        task.replace = Mock(return_value=StopIteration())
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaises(StopIteration):
+                task.run(filters={})
+
+        header, _ = chord.call_args.args
+        self.assertEqual(
+            [signature.args[0] for signature in header],
+            [[users[0].pk, users[1].pk], [users[2].pk]],
+        )
+        self.assertEqual([signature.kwargs["header"] for signature in header], [True, False])
+        self.assertTrue(all('"auth_user"."id" >' in query["sql"] for query in queries[1:]))
+        self.assertEqual(len(queries), 3)
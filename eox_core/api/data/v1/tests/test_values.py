@@ -0,0 +1,213 @@
+"""
+Test suite for the values() serialization of the data-api.
+"""
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application, RefreshToken
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from eox_core.api.data.v1.fields import CustomRelatedField
+from eox_core.api.data.v1.values import ValuesSerializer
+from eox_core.api.data.v1.viewsets import DataApiExportMixin, DataApiViewSet
+
+
+class ValuesUserSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Serializer of the users read with values() in the tests.
+    """
+    id = serializers.IntegerField(read_only=True)  # pylint: disable=invalid-name
+    username = serializers.CharField(read_only=True)
+    is_active = serializers.BooleanField(read_only=True)
+    last_login = serializers.DateTimeField(read_only=True)
+    date_joined = serializers.DateTimeField(read_only=True)
+    group = CustomRelatedField(source="groups", field="name", many=True)
+
+
+class ApplicationSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Serializer with a choice display read from a property of the model.
+    """
+    name = serializers.CharField(read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    client_type_display = serializers.CharField(source="get_client_type_display", read_only=True)
+
+    values_sources = {
+        "client_type_display": ("client_type", "display"),
+    }
+
+
+class AccessTokenSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Serializer with sources crossing nullable relations.
+    """
+    token = serializers.CharField(read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    application = serializers.CharField(source="application.name", allow_null=True, read_only=True)
+    refresh_token = serializers.CharField(source="refresh_token.token", read_only=True)
+
+
+class ValuesUsersViewSet(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
+    """
+    Viewset listing the users read with values() in the tests.
+    """
+    serializer_class = ValuesUserSerializer
+    queryset = User.objects.order_by("id")
+    filter_backends = ()
+    values_serialization = True
+
+
+class ValuesSerializerTests(TestCase):
+    """
+    Test suite for the ValuesSerializer.
+    """
+
+    def setUp(self):
+        """
+        Create the users to serialize.
+        """
+        self.admin = User.objects.create(
+            username="admin",
+            email="admin@example.com",
+            is_staff=True,
+            last_login=timezone.now(),
+        )
+        User.objects.create(username="user", email="user@example.com")
+        self.admin.groups.add(Group.objects.create(name="staff"), Group.objects.create(name="authors"))
+
+    def test_same_representation(self):
+        """
+        Test that the rows are serialized as the serializer does with the objects.
+        """
+        queryset = User.objects.order_by("id")
+        values_serializer = ValuesSerializer.from_serializer(ValuesUserSerializer(), User)
+
+        data = values_serializer.serialize(values_serializer.get_values_queryset(queryset))
+
+        self.assertEqual(data, ValuesUserSerializer(queryset, many=True).data)
+        self.assertEqual(data[0]["group"], ["staff", "authors"])
+        self.assertEqual(data[1]["last_login"], None)
+
+    def test_choice_display(self):
+        """
+        Test that the fields declared in `values_sources` return the name of the choice.
+        """
+        Application.objects.create(
+            name="app",
+            user=self.admin,
+            client_type=Application.CLIENT_CONFIDENTIAL,
+            authorization_grant_type=Application.GRANT_PASSWORD,
+        )
+        queryset = Application.objects.all()
+        values_serializer = ValuesSerializer.from_serializer(ApplicationSerializer(), Application)
+
+        data = values_serializer.serialize(values_serializer.get_values_queryset(queryset))
+
+        self.assertEqual(data, ApplicationSerializer(queryset, many=True).data)
+        self.assertEqual(data[0]["client_type_display"], "Confidential")
+
+    def test_missing_related_rows(self):
+        """
+        Test that the rows without their related rows are serialized as the serializer does:
+        None for a missing reverse one-to-one, as a user without profile, and no key or None
+        for an empty foreign key.
+        """
+        expires = timezone.now()
+        application = Application.objects.create(
+            name="app",
+            client_type=Application.CLIENT_CONFIDENTIAL,
+            authorization_grant_type=Application.GRANT_PASSWORD,
+        )
+        refreshed = AccessToken.objects.create(  # pylint: disable=no-member
+            user=self.admin,
+            application=application,
+            token="refreshed",
+            expires=expires,
+        )
+        RefreshToken.objects.create(  # pylint: disable=no-member
+            user=self.admin,
+            application=application,
+            token="refresh",
+            access_token=refreshed,
+        )
+        AccessToken.objects.create(token="anonymous", expires=expires)  # pylint: disable=no-member
+        queryset = AccessToken.objects.order_by("id")  # pylint: disable=no-member
+        values_serializer = ValuesSerializer.from_serializer(AccessTokenSerializer(), AccessToken)
+
+        data = values_serializer.serialize(values_serializer.get_values_queryset(queryset))
+
+        self.assertEqual(data, AccessTokenSerializer(queryset, many=True).data)
+        self.assertEqual(data[0], {
+            "token": "refreshed",
+            "username": "admin",
+            "application": "app",
+            "refresh_token": "refresh",
+        })
+        self.assertEqual(data[1], {"token": "anonymous", "application": None, "refresh_token": None})
+
+    def test_method_fields(self):
+        """
+        Test that the serializers with fields that are not model columns are not supported.
+        """
+        serializer = ValuesUserSerializer()
+        serializer.fields["full_name"] = serializers.CharField(source="get_full_name", read_only=True)
+
+        self.assertIsNone(ValuesSerializer.from_serializer(serializer, User))
+
+    def test_viewset_list(self):
+        """
+        Test that the list of the viewset is the same with and without the values serialization.
+        """
+        view = ValuesUsersViewSet.as_view({"get": "list"}, basename="users")
+        request = APIRequestFactory().get("/data-api/v1/users/")
+        force_authenticate(request, user=self.admin)
+
+        with self.assertNumQueries(3):
+            response = view(request)
+        with override_settings(EOX_CORE_DATA_API_VALUES_SERIALIZATION=False):
+            expected = view(request)
+
+        self.assertEqual(response.data, expected.data)
+
+    def test_viewset_export(self):
+        """
+        Test that the export of the viewset is the same with and without the values serialization.
+        """
+        view = ValuesUsersViewSet.as_view({"get": "export"}, basename="users")
+        request = APIRequestFactory().get("/data-api/v1/users/export/")
+        force_authenticate(request, user=self.admin)
+
+        content = b"".join(view(request).streaming_content)
+        with override_settings(EOX_CORE_DATA_API_VALUES_SERIALIZATION=False):
+            expected = b"".join(view(request).streaming_content)
+
+        self.assertEqual(content, expected)
+
+    def test_viewset_export_by_pk_chunks(self):
+        """
+        Test that the export reads the rows in chunks after the last primary key, with both serializations.
+        """
+        view = ValuesUsersViewSet.as_view({"get": "export"}, basename="users")
+        request = APIRequestFactory().get("/data-api/v1/users/export/")
+        force_authenticate(request, user=self.admin)
+        expected = b"".join(view(request).streaming_content)
+
+        for values_serialization in (True, False):
+            with override_settings(
+                EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE=1,
+                EOX_CORE_DATA_API_VALUES_SERIALIZATION=values_serialization,
+            ):
+                with CaptureQueriesContext(connection) as queries:
+                    content = b"".join(view(request).streaming_content)
+
+            user_queries = [
+                query["sql"] for query in queries
+                if 'FROM "auth_user"' in query["sql"] and "LIMIT 1" in query["sql"]
+            ]
+            self.assertEqual(content, expected)
+            # One query per user and the last one, which is empty
+            self.assertEqual(len(user_queries), 3)
+            self.assertTrue(all('"auth_user"."id" >' in sql for sql in user_queries[1:]))
@@ -0,0 +1,201 @@
+"""
+Test suite for the data-api viewsets.
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from edx_proctoring.models import ProctoredExam  # pylint: disable=import-error
+from mock import patch
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from eox_core.api.data.v1.viewsets import DataApiExportMixin, DataApiViewSet, ProctoredExamStudentViewSet
+
+
+class ExportUserSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """
+    Serializer of the users exported in the tests.
+    """
+    id = serializers.IntegerField(read_only=True)  # pylint: disable=invalid-name
+    username = serializers.CharField(read_only=True)
+    extra = serializers.SerializerMethodField()
+
+    def get_extra(self, obj):
+        """
+        Return a nested value to export.
+        """
+        return {"email": obj.email}
+
+
+class ExportUsersViewSet(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
+    """
+    Viewset exporting the users in the tests.
+    """
+    serializer_class = ExportUserSerializer
+    queryset = User.objects.order_by("id")
+    filter_backends = ()
+
+
+class ExportTests(TestCase):
+    """
+    Test suite for the streaming export of the data-api viewsets.
+    """
+
+    def setUp(self):
+        """
+        Create the users to export.
+        """
+        self.admin = User.objects.create(username="admin", email="admin@example.com", is_staff=True)
+        User.objects.create(username="user", email="user@example.com")
+        self.view = ExportUsersViewSet.as_view({"get": "export"}, basename="users")
+
+    def export(self, query_params):
+        """
+        Return the response of the export endpoint and its streamed content.
+        """
+        request = APIRequestFactory().get("/data-api/v1/users/export/", query_params)
+        force_authenticate(request, user=self.admin)
+        response = self.view(request)
+        content = b"".join(response.streaming_content).decode() if response.streaming else None
+        return response, content
+
+    def test_export_jsonl(self):
+        """
+        Test that the objects are streamed as JSON Lines by default.
+        """
+        response, content = self.export({})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="users.jsonl"')
+        self.assertEqual(
+            content.splitlines(),
+            [
+                f'{{"id": {self.admin.id}, "username": "admin", "extra": {{"email": "admin@example.com"}}}}',
+                f'{{"id": {self.admin.id + 1}, "username": "user", "extra": {{"email": "user@example.com"}}}}',
+            ],
+        )
+
+    def test_export_csv(self):
+        """
+        Test that the objects are streamed as CSV with the nested values flattened.
+        """
+        response, content = self.export({"export_format": "csv"})
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            content.splitlines(),
+            [
+                "id,username,extra.email",
+                f"{self.admin.id},admin,admin@example.com",
+                f"{self.admin.id + 1},user,user@example.com",
+            ],
+        )
+
+    def test_export_invalid_format(self):
+        """
+        Test that only the supported formats are accepted.
+        """
+        response, _ = self.export({"export_format": "xml"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldsTests(TestCase):
+    """
+    Test suite for the `fields` query param of the data-api viewsets.
+    """
+
+    def setUp(self):
+        """
+        Create the users to list.
+        """
+        self.admin = User.objects.create(username="admin", email="admin@example.com", is_staff=True)
+        self.view = ExportUsersViewSet.as_view({"get": "list"}, basename="users")
+
+    def list_users(self, query_params):
+        """
+        Return the response of the list endpoint.
+        """
+        request = APIRequestFactory().get("/data-api/v1/users/", query_params)
+        force_authenticate(request, user=self.admin)
+        return self.view(request)
+
+    def test_requested_fields_only(self):
+        """
+        Test that only the requested fields are serialized and loaded from the db.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.list_users({"fields": "username"})
+
+        self.assertEqual(response.data["results"], [{"username": "admin"}])
+        select_query = queries[-1]["sql"]
+        self.assertIn('"auth_user"."username"', select_query)
+        self.assertNotIn('"auth_user"."email"', select_query)
+
+    def test_method_fields_load_whole_row(self):
+        """
+        Test that the method fields without declared sources load the whole row.
+        """
+        response = self.list_users({"fields": "id,extra"})
+
+        self.assertEqual(response.data["results"], [{"id": self.admin.id, "extra": {"email": "admin@example.com"}}])
+
+    def test_unknown_fields(self):
+        """
+        Test that only the fields of the serializer can be requested.
+        """
+        response = self.list_users({"fields": "username,password"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_fields_of_related_and_method_fields(self):
+        """
+        Test that the dotted sources and the declared sources of method fields are loaded.
+        """
+        viewset = ProctoredExamStudentViewSet()
+        viewset.request = Request(APIRequestFactory().get("/", {"fields": "username,exam_name,time_taken"}))
+
+        sources = viewset.get_fields_sources(viewset.get_requested_fields())
+
+        self.assertEqual(
+            viewset.get_only_fields(viewset.queryset.model, sources),
+            ["completed_at", "proctored_exam__exam_name", "started_at", "user__username"],
+        )
+
+
+@patch("eox_core.api.data.v1.viewsets.get_course_overview", return_value=ProctoredExam)
+class OrgFilterTests(TestCase):
+    """
+    Test suite for the microsite org filter of the data-api viewsets.
+
+    The course overviews are replaced by another model, only the query built is checked.
+    """
+
+    def test_filter_by_course_overviews(self, _):
+        """
+        Test that the course key column is filtered with a subquery of the course overviews matching the org terms.
+
+        The rows of courses without an overview are not returned, the keys are read on every query instead of cached.
+        """
+        viewset = ProctoredExamStudentViewSet()
+
+        queryset = viewset.filter_queryset_by_orgs(viewset.queryset.all(), ["org", "other"])
+
+        outer_query, subquery = str(queryset.query).split("IN (SELECT", 1)
+        self.assertNotIn("LIKE", outer_query)
+        self.assertIn('"proctoring_proctoredexam"."course_id"', outer_query)
+        self.assertIn("%:org+%", subquery)
+        self.assertIn("%:other+%", subquery)
+
+    def test_filter_without_orgs(self, get_course_overview):
+        """
+        Test that nothing is returned when the site has no orgs.
+        """
+        viewset = ProctoredExamStudentViewSet()
+
+        queryset = viewset.filter_queryset_by_orgs(viewset.queryset.all(), [])
+
+        self.assertFalse(queryset.exists())
+        get_course_overview.assert_not_called()
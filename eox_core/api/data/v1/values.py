@@ -0,0 +1,255 @@
+"""
+Fast serialization of the data-api rows.
+
+The data-api serializers are read only projections of the model fields, so the
+rows can be read with `queryset.values()` and converted field by field, without
+building the model objects nor resolving the dotted sources attribute by
+attribute. The column mapping and the converters are computed once per request
+from the serializer fields, so the output is the same as the serializer one.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+from rest_framework.fields import SkipField, empty
+
+from .fields import CustomRelatedField
+
+# Converters of the fields whose `to_representation` is a plain type cast
+TYPE_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+}
+
+
+class ValuesSerializer:
+    """
+    Serializes the rows of `queryset.values()` as the given serializer does with the model objects.
+
+    The fields read from a property of the model are declared in the `values_sources`
+    of the serializer, as a dotted source of a model field and the kind of conversion:
+    `display` returns the name of the choice of the value.
+
+    The sources crossing a nullable relation also read the column telling whether the
+    related row exists, so a row without it is serialized as the serializer does: None
+    for a missing reverse one-to-one, as a user without profile, and the field default,
+    None or no key at all for an empty foreign key.
+    """
+
+    def __init__(self, model, fields):
+        """
+        Args:
+            model: The model of the serialized queryset.
+            fields (list): The name, the lookup, the converter, whether it reads a list of
+                related values, the joins of nullable relations and the serializer field, of
+                every field, in the order of the serializer.
+        """
+        self.model = model
+        self.fields = fields
+
+    @classmethod
+    def from_serializer(cls, serializer, model):
+        """
+        Return the values serializer of a serializer instance, or None when some of its
+        fields can not be read from the columns of the model.
+        """
+        values_sources = getattr(serializer, "values_sources", {})
+        fields = []
+        for name, field in serializer.fields.items():
+            source, kind = values_sources.get(name, (field.source, None))
+            lookup = get_lookup(model, source)
+            if lookup is None:
+                return None
+
+            lookup, many = lookup
+            if many and not isinstance(getattr(field, "child_relation", None), CustomRelatedField):
+                return None
+            if many:
+                lookup = f"{lookup}__{field.child_relation.field}"
+
+            convert = get_converter(field, model, lookup, kind)
+            fields.append((name, lookup, convert, many, get_nullable_joins(model, source), field))
+        return cls(model, fields)
+
+    @property
+    def columns(self):
+        """
+        The columns read with `values()`, the related lists are read by `serialize`.
+        """
+        columns = []
+        for _, lookup, _, many, joins, _ in self.fields:
+            if not many:
+                columns += [column for column, _ in joins] + [lookup]
+        return columns
+
+    def get_values_queryset(self, queryset, *extra_columns):
+        """
+        Return the queryset of the rows, with the pk and the extra columns, as the ordering ones.
+        """
+        columns = dict.fromkeys(["pk", *self.columns, *extra_columns])
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def serialize(self, rows):
+        """
+        Return the representation of the rows, as the serializer returns the one of the objects.
+        """
+        rows = list(rows)
+        related_values = {
+            lookup: self.get_related_values(lookup, [row["pk"] for row in rows])
+            for _, lookup, _, many, _, _ in self.fields if many
+        }
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, lookup, convert, many, joins, field in self.fields:
+                if many:
+                    item[name] = [convert(value) for value in related_values[lookup].get(row["pk"], [])]
+                    continue
+                try:
+                    value = self.get_value(row, lookup, joins, field)
+                except SkipField:
+                    continue
+                item[name] = None if value is None else convert(value)
+            data.append(item)
+        return data
+
+    @staticmethod
+    def get_value(row, lookup, joins, field):
+        """
+        Return the value of a field in a row, as `Field.get_attribute` returns it from the object.
+
+        Raises SkipField when the serializer omits the field because its source crosses an empty foreign key.
+        """
+        for column, reverse in joins:
+            if row[column] is not None:
+                continue
+            if reverse:
+                # The missing related object raises ObjectDoesNotExist, read as None
+                return None
+            # The attribute of the empty related object raises AttributeError
+            if field.default is not empty:
+                return field.get_default()
+            if field.allow_null:
+                return None
+            raise SkipField()
+        return row[lookup]
+
+    def get_related_values(self, lookup, pks):
+        """
+        Return the values of a to-many lookup of the given objects, as lists by pk, in the
+        ordering of the related model, as they are prefetched.
+        """
+        relation, _ = lookup.rsplit("__", 1)
+        related_model = get_lookup_field(self.model, relation).related_model
+        ordering = related_model._meta.ordering or ["pk"]  # pylint: disable=protected-access
+        order_by = [
+            f"-{relation}__{order.lstrip('-')}" if order.startswith("-") else f"{relation}__{order}"
+            for order in ordering
+        ]
+
+        values = defaultdict(list)
+        queryset = self.model._default_manager.filter(  # pylint: disable=protected-access
+            pk__in=pks,
+            **{f"{relation}__isnull": False},
+        )
+        for pk, value in queryset.order_by("pk", *order_by).values_list("pk", lookup):
+            values[pk].append(value)
+        return values
+
+
+def get_model_field(model, attr):
+    """
+    Return the model field of an attribute, including the `<name>_set`
+    managers of the reverse relations, or None for properties.
+    """
+    for name in (attr, attr[:-len("_set")] if attr.endswith("_set") else None):
+        if not name:
+            continue
+        try:
+            return model._meta.get_field(name)  # pylint: disable=protected-access
+        except FieldDoesNotExist:
+            continue
+    return None
+
+
+def get_lookup(model, source):
+    """
+    Return the lookup of a dotted source and whether it reads a to-many relation,
+    or None when the source does not end in a column nor in a to-many relation.
+    """
+    if source == "*":
+        return None
+
+    path = []
+    attrs = source.split(".")
+    for index, attr in enumerate(attrs):
+        field = get_model_field(model, attr)
+        if field is None:
+            return None
+        last = index == len(attrs) - 1
+        if field.one_to_many or field.many_to_many:
+            # The related objects are read as a list, the serializer field reads their attribute
+            return ("__".join(path + [field.name]), True) if last else None
+        if field.concrete and (not field.is_relation or attr == field.attname):
+            # A column, including the `<name>_id` of the foreign keys
+            return ("__".join(path + [attr]), False) if last else None
+        path.append(field.name)
+        model = field.related_model
+    return None
+
+
+def get_nullable_joins(model, source):
+    """
+    Return the columns telling whether the related rows of the nullable relations crossed
+    by a dotted source exist, and whether each relation is a reverse one-to-one.
+    """
+    joins = []
+    path = []
+    for attr in source.split(".")[:-1]:
+        field = get_model_field(model, attr)
+        if field is None or not field.is_relation:
+            break
+        if field.one_to_one and not field.concrete:
+            related_pk = field.related_model._meta.pk.name  # pylint: disable=protected-access
+            joins.append(("__".join(path + [field.name, related_pk]), True))
+        elif field.concrete and field.null:
+            joins.append(("__".join(path + [field.attname]), False))
+        path.append(field.name)
+        model = field.related_model
+    return joins
+
+
+def get_lookup_field(model, lookup):
+    """
+    Return the model field at the end of a lookup.
+    """
+    field = None
+    for name in lookup.split("__"):
+        field = model._meta.get_field(name)  # pylint: disable=protected-access
+        model = field.related_model
+    return field
+
+
+def get_converter(field, model, lookup, kind=None):
+    """
+    Return the function converting a value of the column to the representation of the serializer field.
+    """
+    if isinstance(field, relations.ManyRelatedField):
+        # CustomRelatedField represents the attribute of each related object as text
+        return str
+
+    convert = TYPE_CONVERTERS.get(type(field), field.to_representation)
+    if kind != "display":
+        return convert
+
+    choices = dict(get_lookup_field(model, lookup).flatchoices)
+
+    def convert_display(value):
+        """
+        Return the name of the choice of the value, None when it is not set.
+        """
+        display = choices.get(value) if value else None
+        return None if display is None else convert(display)
+
+    return convert_display
@@ -1,11 +1,18 @@
 """
 TODO: add me
 """
+import os
+
 from celery.result import AsyncResult
+from django.core import signing
+from django.http import FileResponse
+from django.urls import reverse
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .reports import get_report_download_token, get_reports_storage, get_signed_report_name
+
 
 class CeleryTasksStatus(APIView):
     """
@@ -26,6 +33,15 @@ class CeleryTasksStatus(APIView):
         result = None
         if task_res.ready():
             result = task_res.result
+            # The reports are stored as files, the url is signed on every request.
+            if isinstance(result, dict) and "report" in result:
+                token = get_report_download_token(result)
+                download_url = None
+                if token:
+                    download_url = request.build_absolute_uri(
+                        reverse(f"{request.resolver_match.namespace}:data-api-reports", kwargs={"token": token})
+                    )
+                result = {**result, "download_url": download_url}
 
         response = {
             "state": task_res.state,
@@ -33,3 +49,30 @@ class CeleryTasksStatus(APIView):
         }
 
         return Response(response)
+
+
+class ReportDownload(APIView):
+    """
+    view to download the report of a task with the signed url returned by its status
+    """
+    authentication_classes = ()
+
+    def get(self, request, token, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Return the report file while the signature of the url is valid.
+        """
+        try:
+            name = get_signed_report_name(token)
+        except signing.BadSignature as error:
+            raise NotFound() from error
+
+        storage = get_reports_storage()
+        if not storage.exists(name):
+            raise NotFound()
+
+        return FileResponse(
+            storage.open(name, "rb"),
+            as_attachment=True,
+            filename=os.path.basename(name),
+            content_type="application/gzip",
+        )
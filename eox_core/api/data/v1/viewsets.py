@@ -1,27 +1,31 @@
 """
 Controllers for the data-api. Used in the report generation process
 """
-import random
-from datetime import datetime
+from uuid import uuid4
 
 import six
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django_filters import rest_framework as filters  # pylint: disable=import-error
 from edx_proctoring.models import ProctoredExamStudentAttempt  # pylint: disable=import-error
 from rest_framework import mixins, status, viewsets
 from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
 from eox_core.edxapp_wrapper.bearer_authentication import BearerAuthentication
 from eox_core.edxapp_wrapper.certificates import get_generated_certificate
+from eox_core.edxapp_wrapper.courses import get_course_overview
 from eox_core.edxapp_wrapper.users import get_course_enrollment
 
 from .filters import CourseEnrollmentFilter, GeneratedCerticatesFilter, ProctoredExamStudentAttemptFilter, UserFilter
-from .paginators import DataApiResultsSetPagination
+from .paginators import DataApiCursorPagination, DataApiResultsSetPagination
+from .reports import REPORT_FORMATS, encode_rows, get_reports_storage
 from .serializers import (
     CertificateSerializer,
     CourseEnrollmentSerializer,
@@ -29,6 +33,7 @@ from .serializers import (
     UserSerializer,
 )
 from .tasks import EnrollmentsGrades
+from .values import ValuesSerializer, get_model_field
 
 
 class DataApiViewSet(mixins.ListModelMixin,
@@ -40,24 +45,156 @@ class DataApiViewSet(mixins.ListModelMixin,
     permission_classes = (IsAdminUser,)
 
     pagination_class = DataApiResultsSetPagination
+    # Pagination used when the request sends pagination=cursor
+    cursor_pagination_class = DataApiCursorPagination
+    cursor_ordering = ("pk",)
     filter_backends = (filters.DjangoFilterBackend,)
     prefetch_fields = False
+    # Serialize the rows read with values() when the serializer fields are model columns
+    values_serialization = False
     # Microsite enforcement filter settings
     enforce_microsite_filter = False
     enforce_microsite_filter_lookup_field = "test_lookup_field"
     enforce_microsite_filter_term = "org_in_course_id"
+    # Indexed course key column, filtered with a subquery of the course overviews of the orgs instead of the lookup field
+    enforce_microsite_filter_course_field = None
+
+    @property
+    def paginator(self):
+        """
+        The paginator instance of the request, the cursor one when the request
+        opts in with `pagination=cursor`.
+        """
+        if not hasattr(self, '_paginator') and self.request.query_params.get("pagination") == "cursor":
+            self._paginator = self.cursor_pagination_class()  # pylint: disable=attribute-defined-outside-init
+            self._paginator.ordering = self.cursor_ordering
+        return super().paginator
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = values_serializer.get_values_queryset(
+            self.filter_queryset(self.get_queryset()),
+            *[order.lstrip("-") for order in self.cursor_ordering],
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
+
+    def get_values_serializer(self):
+        """
+        This method returns the serializer of the rows read with values(), or
+        None when the objects must be serialized by the serializer class.
+        """
+        if not self.values_serialization or not getattr(settings, "EOX_CORE_DATA_API_VALUES_SERIALIZATION", True):
+            return None
+        return ValuesSerializer.from_serializer(self.get_serializer(), self.get_queryset().model)
 
     def get_queryset(self):
         """
         This method returns the queryset to be processed by the viewset
         """
         queryset = self.queryset
-        if self.prefetch_fields:
-            queryset = self.add_prefetch_fields_to_queryset(queryset, self.prefetch_fields)
+        prefetch_fields = self.prefetch_fields
+        only_fields = None
+
+        requested_fields = self.get_requested_fields()
+        if requested_fields is not None:
+            sources = self.get_fields_sources(requested_fields)
+            only_fields = self.get_only_fields(queryset.model, sources)
+            # Only the relations read by the requested fields are joined or prefetched
+            relations = {source.split(".")[0] for source in sources}
+            prefetch_fields = [val for val in prefetch_fields or [] if val.get("name", "") in relations]
+
+        if prefetch_fields:
+            queryset = self.add_prefetch_fields_to_queryset(queryset, prefetch_fields)
         if self.enforce_microsite_filter:
             queryset = self.enforce_microsite_filter_qset(queryset)
+        if only_fields is not None:
+            queryset = queryset.only(*only_fields)
         return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        """
+        Return the serializer instance, restricted to the fields requested with `fields=`.
+        """
+        serializer = super().get_serializer(*args, **kwargs)
+        requested_fields = self.get_requested_fields()
+        if requested_fields is not None:
+            fields = serializer.child.fields if hasattr(serializer, "child") else serializer.fields
+            for name in list(fields):
+                if name not in requested_fields:
+                    fields.pop(name)
+        return serializer
+
+    def get_requested_fields(self):
+        """
+        This method returns the names of the fields requested with the
+        comma separated `fields` query param, or None to return all of them.
+        """
+        value = self.request.query_params.get("fields") if self.request else None
+        if not value:
+            return None
+
+        requested_fields = [name.strip() for name in value.split(",") if name.strip()]
+        serializer_fields = self.get_serializer_class()().fields  # pylint: disable=not-callable
+        unknown_fields = set(requested_fields) - set(serializer_fields)
+        if unknown_fields:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown_fields))}."})
+        return requested_fields
+
+    def get_fields_sources(self, field_names):
+        """
+        This method returns the dotted sources read by the given serializer
+        fields. The method fields declare theirs in the `field_sources` of the
+        serializer, otherwise their source is `*`, the whole object.
+        """
+        serializer_class = self.get_serializer_class()
+        serializer_fields = serializer_class().fields  # pylint: disable=not-callable
+        field_sources = getattr(serializer_class, "field_sources", {})
+
+        sources = []
+        for name in field_names:
+            sources.extend(field_sources.get(name, (serializer_fields[name].source,)))
+        return sources
+
+    def get_only_fields(self, model, sources):
+        """
+        This method returns the model fields, as lookup paths, read by the
+        given sources, or None when some of them needs the whole row.
+        """
+        paths = set()
+        for source in sources:
+            path = None if source == "*" else self.get_source_path(model, source)
+            if path is None:
+                return None
+            if path:
+                paths.add(path)
+        return sorted(paths)
+
+    def get_source_path(self, model, source):
+        """
+        This method turns the dotted source of a serializer field into a lookup
+        path. When the source ends in a property, the path of the object that
+        has it is returned, so the object is fully loaded.
+        """
+        path = []
+        for attr in source.split("."):
+            field = get_model_field(model, attr)
+            if field is None:
+                return "__".join(path) or None
+            # Read from a prefetched relation, it needs no column of this row
+            if field.one_to_many or field.many_to_many:
+                return "__".join(path)
+            path.append(attr)
+            if not field.is_relation:
+                break
+            model = field.related_model
+        return "__".join(path)
+
     def add_prefetch_fields_to_queryset(self, queryset, fields=None):
         """
         This method adds prefetched fields to the queryset in order to
@@ -80,18 +217,30 @@ class DataApiViewSet(mixins.ListModelMixin,
         organization filters belonging to the queried site (which should map
         to a microsite).
         """
-        # Check if multitenancy is enabled
-        if not settings.EOX_CORE_USER_ENABLE_MULTI_TENANCY:
+        orgs_filter = self.get_microsite_orgs_filter()
+        if orgs_filter is None:
             return queryset
 
-        orgs_filter = getattr(settings, 'course_org_filter', set([]))
-
         queryset = self.filter_queryset_by_orgs(
             queryset,
             orgs_filter
         )
         return queryset
 
+    def get_microsite_orgs_filter(self):
+        """
+        This method returns the organization filters of the queried site, as
+        a string or a list, or None when the queryset must not be filtered.
+        """
+        # Check if multitenancy is enabled
+        if not settings.EOX_CORE_USER_ENABLE_MULTI_TENANCY:
+            return None
+
+        orgs_filter = getattr(settings, 'course_org_filter', set([]))
+        if isinstance(orgs_filter, six.string_types):
+            return orgs_filter
+        return list(orgs_filter)
+
     def filter_queryset_by_orgs(self, queryset, org_filters):
         """
         This method filters a given queryset based on the org filters belonging
@@ -106,6 +255,9 @@ class DataApiViewSet(mixins.ListModelMixin,
         }
         term = term_types.get(self.enforce_microsite_filter_term, "{}")
 
+        if self.enforce_microsite_filter_course_field and self.enforce_microsite_filter_term == "org_in_course_id":
+            return self.filter_queryset_by_org_course_keys(queryset, org_filters, term)
+
         # Handling the case when the course_org_filter value is a string
         if isinstance(org_filters, six.string_types):
             term_search = term.format(org_filters)
@@ -127,14 +279,100 @@ class DataApiViewSet(mixins.ListModelMixin,
         queryset = queryset.filter(query)
         return queryset
 
+    def filter_queryset_by_org_course_keys(self, queryset, org_filters, term):
+        """
+        This method filters a given queryset by the course keys of the orgs.
+
+        The term of the orgs is matched against the course overviews, a small table,
+        and the course key column of the queryset, which is indexed, is filtered with
+        them in a subquery. The keys are read on every query, so new courses are
+        found as soon as their overview exists. The rows of courses without an
+        overview, as the deleted ones, are not returned.
+        """
+        if isinstance(org_filters, six.string_types):
+            org_filters = [org_filters]
+
+        query = Q()
+        for org in org_filters:
+            query = query | Q(id__contains=term.format(org))
+        course_keys = get_course_overview().objects.filter(query).values("id")
+
+        return queryset.filter(**{f"{self.enforce_microsite_filter_course_field}__in": course_keys})
 
-class UsersViewSet(DataApiViewSet):  # pylint: disable=too-many-ancestors
+
+def iter_pk_chunks(queryset, chunk_size):
+    """
+    Yield the objects, or the rows of a values() queryset, in chunks ordered by primary key.
+
+    Each chunk is read with its own query starting after the last primary key of the
+    previous one. `queryset.iterator()` does not stream on MySQL, whose driver reads
+    the whole result before returning the first row.
+    """
+    queryset = queryset.order_by("pk")
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield chunk
+        last = chunk[-1]
+        last_pk = last["pk"] if isinstance(last, dict) else last.pk
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+
+
+class DataApiExportMixin:
+    """
+    Adds the `export` endpoint, which streams every object matching the
+    filters of the request as CSV or JSON Lines.
+    """
+    export_content_types = {
+        "jsonl": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def export(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Stream the objects matching the filters, read from the db by chunks, so
+        the memory used does not depend on the number of objects.
+
+        The objects are exported in the order of their primary key. The format is
+        JSON Lines by default or CSV with `export_format=csv`.
+        """
+        export_format = request.query_params.get("export_format", "jsonl")
+        if export_format not in REPORT_FORMATS:
+            raise ValidationError({"export_format": f"Must be one of {', '.join(REPORT_FORMATS)}."})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        chunk_size = getattr(settings, "EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE", 2000)
+        values_serializer = self.get_values_serializer()
+        if values_serializer is not None:
+            rows = (
+                row
+                for chunk in iter_pk_chunks(values_serializer.get_values_queryset(queryset), chunk_size)
+                for row in values_serializer.serialize(chunk)
+            )
+        else:
+            serializer = self.get_serializer()
+            rows = (
+                serializer.to_representation(instance)
+                for chunk in iter_pk_chunks(queryset, chunk_size)
+                for instance in chunk
+            )
+
+        response = StreamingHttpResponse(
+            encode_rows(rows, export_format),
+            content_type=self.export_content_types[export_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{self.basename}.{export_format}"'
+        return response
+
+
+class UsersViewSet(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
     """
     A viewset for viewing users in the platform.
     """
     serializer_class = UserSerializer
     queryset = User.objects.all()
     filter_class = UserFilter
+    values_serialization = True
     prefetch_fields = [
         {
             "name": "profile",
@@ -147,7 +385,7 @@ class UsersViewSet(DataApiViewSet):  # pylint: disable=too-many-ancestors
     ]
 
 
-class CourseEnrollmentViewset(DataApiViewSet):  # pylint: disable=too-many-ancestors
+class CourseEnrollmentViewset(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
     """
     A viewset for viewing Course Enrollments.
     """
@@ -158,6 +396,7 @@ class CourseEnrollmentViewset(DataApiViewSet):  # pylint: disable=too-many-ances
     enforce_microsite_filter = True
     enforce_microsite_filter_lookup_field = "course__id__contains"
     enforce_microsite_filter_term = "org_in_course_id"
+    enforce_microsite_filter_course_field = "course_id"
 
 
 class CourseEnrollmentWithGradesViewset(DataApiViewSet):  # pylint: disable=too-many-ancestors
@@ -165,7 +404,9 @@ class CourseEnrollmentWithGradesViewset(DataApiViewSet):  # pylint: disable=too-
     A viewset for viewing Course Enrollments with grades data.
     This view will create a celery task to fetch grades data for
     enrollments in the background, and will return the id of the
-    celery task
+    celery task. The task only receives the filters of the request
+    and reads the enrollments by chunks. The grades are stored as a
+    gzip file, JSON Lines by default or CSV with `report_format=csv`.
     """
     serializer_class = CourseEnrollmentSerializer
     queryset = get_course_enrollment().objects.all()
@@ -174,18 +415,25 @@ class CourseEnrollmentWithGradesViewset(DataApiViewSet):  # pylint: disable=too-
     enforce_microsite_filter = True
     enforce_microsite_filter_lookup_field = "course__id__contains"
     enforce_microsite_filter_term = "org_in_course_id"
+    enforce_microsite_filter_course_field = "course_id"
 
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+        # The filters are validated here, the task reads the enrollments by itself.
+        self.filter_queryset(self.get_queryset())
+
+        report_format = request.query_params.get("report_format", "jsonl")
+        if report_format not in REPORT_FORMATS:
+            raise ValidationError({"report_format": f"Must be one of {', '.join(REPORT_FORMATS)}."})
 
-        now_date = datetime.now()
-        string_now_date = now_date.strftime("%Y-%m-%d-%H-%M-%S")
-        randnum = random.randint(100, 999)
-        task_id = "data_api-" + string_now_date + "-" + str(randnum)
+        # Fail before dispatching the task when there is no private storage for the report.
+        get_reports_storage()
+        # The status of the task and its report are only reachable by this id.
+        task_id = "data_api-" + uuid4().hex
 
         named_args = {
-            "data": serializer.data,
+            "filters": dict(request.query_params.lists()),
+            "org_filters": self.get_microsite_orgs_filter(),
+            "report_format": report_format,
         }
 
         task = EnrollmentsGrades().apply_async(
@@ -204,7 +452,7 @@ class CourseEnrollmentWithGradesViewset(DataApiViewSet):  # pylint: disable=too-
         return Response(data_response, status=status.HTTP_202_ACCEPTED)
 
 
-class CertificateViewSet(DataApiViewSet):  # pylint: disable=too-many-ancestors
+class CertificateViewSet(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
     """
     A viewset for viewing certificates generated for users.
     """
@@ -220,13 +468,14 @@ class CertificateViewSet(DataApiViewSet):  # pylint: disable=too-many-ancestors
     enforce_microsite_filter = True
     enforce_microsite_filter_lookup_field = "course_id__contains"
     enforce_microsite_filter_term = "org_in_course_id"
+    enforce_microsite_filter_course_field = "course_id"
 
     def get_queryset(self):
         self.queryset = get_generated_certificate().objects.all()
         return super().get_queryset()
 
 
-class ProctoredExamStudentViewSet(DataApiViewSet):  # pylint: disable=too-many-ancestors
+class ProctoredExamStudentViewSet(DataApiExportMixin, DataApiViewSet):  # pylint: disable=too-many-ancestors
     """
     A viewset for viewing proctored exams attempts made by students.
     """
@@ -248,3 +497,4 @@ class ProctoredExamStudentViewSet(DataApiViewSet):  # pylint: disable=too-many-a
     enforce_microsite_filter = True
     enforce_microsite_filter_lookup_field = "proctored_exam__course_id__contains"
     enforce_microsite_filter_term = "org_in_course_id"
+    enforce_microsite_filter_course_field = "proctored_exam__course_id"
@@ -5,19 +5,14 @@ Support API v1 serializers.
 from __future__ import absolute_import, unicode_literals
 
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from oauth2_provider.models import Application
 from rest_framework import serializers
 
-from eox_core.api.v1.serializers import MAX_SIGNUP_SOURCES_ALLOWED
-from eox_core.edxapp_wrapper.users import (
-    check_edxapp_account_conflicts,
-    get_user_signup_source,
-    get_username_max_length,
-)
+from eox_core.api.v1.serializers import MAX_SIGNUP_SOURCES_ALLOWED, EdxappUsernameField
+from eox_core.edxapp_wrapper.users import check_edxapp_account_conflicts, get_user_signup_source
 
-UserSignupSource = get_user_signup_source()  # pylint: disable=invalid-name
-
-USERNAME_MAX_LENGTH = get_username_max_length()
+UserSignupSource = SimpleLazyObject(get_user_signup_source)  # pylint: disable=invalid-name
 
 
 class WrittableEdxappRemoveUserSerializer(serializers.Serializer):
@@ -78,8 +73,7 @@ class WrittableEdxappUsernameSerializer(WrittableEdxappUserSerializer):
     Handles the serialization of the data required to update the username of an edxapp user.
     """
 
-    new_username = serializers.CharField(
-        max_length=USERNAME_MAX_LENGTH,
+    new_username = EdxappUsernameField(
         required=True,
         allow_blank=False,
         allow_null=False,
@@ -119,7 +113,7 @@ class OauthApplicationUserSerializer(serializers.Serializer):
     Oauth Application owner serializer.
     """
     email = serializers.EmailField()
-    username = serializers.CharField(max_length=USERNAME_MAX_LENGTH)
+    username = EdxappUsernameField()
     fullname = serializers.CharField(max_length=255, write_only=True)
     permissions = serializers.ListField(
         child=serializers.CharField(),
@@ -24,7 +24,7 @@ class EdxappReplaceUsernameAPITest(TestCase):
     @patch_permissions
     @patch('eox_core.api.support.v1.views.replace_username_cs_user')
     @patch('eox_core.api.support.v1.serializers.UserSignupSource')
-    @patch('eox_core.api.support.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.get_edxapp_user')
     @patch('eox_core.api.support.v1.views.EdxappUserReadOnlySerializer')
     def test_replace_username_success(self, user_serializer, get_edxapp_user, signup_source, replace_username_cs_user, _):
         """Test the replacement of the username of an edxapp user."""
@@ -44,7 +44,7 @@ class EdxappReplaceUsernameAPITest(TestCase):
 
     @patch_permissions
     @patch('eox_core.api.support.v1.serializers.UserSignupSource')
-    @patch('eox_core.api.support.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.get_edxapp_user')
     def test_replace_username_bad_sign_up_source(self, get_edxapp_user, signup_source, _):
         """
         Tests that when a user has more than one signup source then the
@@ -66,7 +66,7 @@ class EdxappReplaceUsernameAPITest(TestCase):
 
     @patch_permissions
     @patch('eox_core.api.support.v1.serializers.UserSignupSource')
-    @patch('eox_core.api.support.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.get_edxapp_user')
     def test_replace_username_staff_user(self, get_edxapp_user, signup_source, _):
         """Tests that if a user is staff or superuser then the username cannot be replaced."""
         user = User(username="test", email="test@example.com", password="testtest", is_staff=True)
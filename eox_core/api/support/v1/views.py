@@ -11,6 +11,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.sites.shortcuts import get_current_site
 from django.db import transaction
+from django.utils.functional import SimpleLazyObject
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from oauth2_provider.models import Application
 from rest_framework import status
@@ -41,7 +42,7 @@ from eox_core.edxapp_wrapper.users import (
 from eox_core.utils import get_or_create_site_from_oauth_app_uris
 
 User = get_user_model()
-UserSignupSource = get_user_signup_source()  # pylint: disable=invalid-name
+UserSignupSource = SimpleLazyObject(get_user_signup_source)  # pylint: disable=invalid-name
 
 try:
     from eox_audit_model.decorators import audit_drf_api
@@ -89,7 +90,7 @@ class EdxappUser(UserQueryMixin, APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
         data["site"] = get_current_site(request)
-        data["user"] = get_edxapp_user(**query)
+        data["user"] = self.get_edxapp_user(**query)
 
         message, status = delete_edxapp_user(**data)  # pylint: disable=redefined-outer-name
 
@@ -118,7 +119,7 @@ class EdxappUserUpdateBase(UserQueryMixin, APIView):
         Allows to safely update an Edxapp user's attribute.
         """
         query = self.get_user_query(request)
-        user = get_edxapp_user(**query)
+        user = self.get_edxapp_user(**query)
         data = request.data
 
         with transaction.atomic():
@@ -171,7 +172,7 @@ class EdxappReplaceUsername(EdxappUserUpdateBase):
             User serialized.
         """
         query = self.get_user_query(request)
-        user = get_edxapp_user(**query)
+        user = self.get_edxapp_user(**query)
         data = request.data
 
         with transaction.atomic():
@@ -0,0 +1,47 @@
+"""
+API v1 parsers.
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONStream:
+    """
+    Iterable over the objects of a newline delimited JSON body.
+
+    The body is read line by line while it is iterated, so it can only be iterated once.
+    """
+
+    def __init__(self, stream, encoding):
+        self.stream = stream
+        self.encoding = encoding
+
+    def __iter__(self):
+        for line_number, line in enumerate(codecs.getreader(self.encoding)(self.stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                raise ParseError(f"NDJSON parse error on line {line_number} - {error}") from error
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline delimited JSON bodies lazily, one object per line.
+    """
+    media_type = NDJSON_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        return NDJSONStream(stream, encoding)
@@ -7,9 +7,12 @@ from __future__ import absolute_import, unicode_literals
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.validators import MaxLengthValidator
+from django.utils.functional import SimpleLazyObject
 from django_countries.serializer_fields import CountryField
 from rest_framework import serializers
 from rest_framework.fields import HiddenField
+from rest_framework.utils.formatting import lazy_format
 
 from eox_core.edxapp_wrapper.coursekey import get_valid_course_key, validate_org
 from eox_core.edxapp_wrapper.enrollments import check_edxapp_enrollment_is_valid
@@ -29,17 +32,31 @@ from eox_core.utils import (
     set_select_custom_field,
 )
 
-UserSignupSource = get_user_signup_source()  # pylint: disable=invalid-name
+UserSignupSource = SimpleLazyObject(get_user_signup_source)  # pylint: disable=invalid-name
 
 MAX_SIGNUP_SOURCES_ALLOWED = 1
 
-USERNAME_MAX_LENGTH = get_username_max_length()
-
 ALLOWED_TYPES = ["text", "email", "select", "textarea", "checkbox", "plaintext", "password", "hidden"]
 
 YEAR_OF_BIRTH_CHOICES = [(str(year), str(year)) for year in get_valid_years()]
 
 
+class EdxappUsernameField(serializers.CharField):
+    """
+    CharField limited to the username length allowed by the platform.
+
+    The limit lives in the users backend, so it is only resolved when the field
+    is bound to a serializer instance instead of when this module is imported.
+    """
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        if self.max_length is None:
+            self.max_length = get_username_max_length()
+            message = lazy_format(self.error_messages['max_length'], max_length=self.max_length)
+            self.validators.append(MaxLengthValidator(self.max_length, message=message))
+
+
 class EdxappWithWarningSerializer(serializers.Serializer):
     """
     Mixin serializer to add a warning field to Edxapp serializers
@@ -71,7 +88,7 @@ class EdxappUserSerializer(serializers.Serializer):
     """
 
     email = serializers.EmailField()
-    username = serializers.CharField(max_length=USERNAME_MAX_LENGTH)
+    username = EdxappUsernameField()
     password = serializers.CharField(
         style={'input_type': 'password'},
         write_only=True,
@@ -110,7 +127,8 @@ class EdxappExtendedUserSerializer(EdxappUserSerializer):
     endpoint.
     """
     year_of_birth = serializers.ChoiceField(choices=YEAR_OF_BIRTH_CHOICES)
-    gender = serializers.ChoiceField(choices=get_gender_choices())
+    # The choices of the UserProfile fields are set in __init__, so importing this module does not load the backend.
+    gender = serializers.ChoiceField(choices=())
     city = serializers.CharField()
     goals = serializers.CharField()
     bio = serializers.CharField(max_length=3000)
@@ -118,7 +136,7 @@ class EdxappExtendedUserSerializer(EdxappUserSerializer):
     phone_number = serializers.CharField(max_length=50)
     mailing_address = serializers.CharField()
     courseware = serializers.CharField(max_length=255)
-    level_of_education = serializers.ChoiceField(choices=get_level_of_education_choices())
+    level_of_education = serializers.ChoiceField(choices=())
     country = CountryField(required=False)
     terms_of_service = serializers.HiddenField(default='true')
     honor_code = serializers.HiddenField(default='true')
@@ -129,6 +147,9 @@ class EdxappExtendedUserSerializer(EdxappUserSerializer):
         """
         super().__init__(*args, **kwargs)
 
+        self.fields["gender"].choices = get_gender_choices()
+        self.fields["level_of_education"].choices = get_level_of_education_choices()
+
         extended_profile_fields = getattr(settings, "extended_profile_fields", [])
         extra_fields = get_registration_extra_fields()
         ednx_custom_registration_fields = getattr(settings, "EDNX_CUSTOM_REGISTRATION_FIELDS", [])
@@ -283,6 +304,22 @@ class EdxappUserQuerySerializer(EdxappExtendedUserSerializer):
             self.fields.pop("password", None)
 
 
+class EdxappUserLookupSerializer(serializers.Serializer):
+    """
+    Handles the serialization of each identifier sent to look up many users at once
+    """
+    username = EdxappUsernameField(required=False)
+    email = serializers.CharField(max_length=255, required=False)
+
+    def validate(self, attrs):
+        """
+        Check that the user can be identified
+        """
+        if not attrs.get("username") and not attrs.get("email"):
+            raise serializers.ValidationError("Email or username needed")
+        return attrs
+
+
 class EdxappEnrollmentAttributeSerializer(serializers.Serializer):
     """
     Attributes serializer
@@ -318,7 +355,7 @@ class EdxappCourseEnrollmentSerializer(serializers.Serializer):
 
     """
 
-    username = serializers.CharField(max_length=USERNAME_MAX_LENGTH, default=None, source='user')
+    username = EdxappUsernameField(default=None, source='user')
     is_active = serializers.BooleanField(default=True)
     mode = serializers.CharField(max_length=100)
     enrollment_attributes = EdxappEnrollmentAttributeSerializer(many=True, required=False)
@@ -357,7 +394,7 @@ class EdxappCourseEnrollmentQuerySerializer(EdxappCourseEnrollmentSerializer):
     Handles the serialization of the context data required to create an enrollment
     on different backends
     """
-    username = serializers.CharField(max_length=USERNAME_MAX_LENGTH, default=None)
+    username = EdxappUsernameField(default=None)
     email = serializers.CharField(max_length=255, default=None)
     force = serializers.BooleanField(default=False)
     course_id = EdxappValidatedCourseIDField(default=None)
@@ -465,3 +502,40 @@ class EdxappGradeSerializer(serializers.Serializer):
                 ]
             }
         }
+
+
+class EdxappGradeBatchSerializer(serializers.Serializer):
+    """
+    Handles the query to read the grades of many users in a course, or of a user in many courses
+    """
+    course_id = serializers.CharField(required=False)
+    users = EdxappUserLookupSerializer(many=True, required=False)
+    username = EdxappUsernameField(required=False)
+    email = serializers.CharField(max_length=255, required=False)
+    course_ids = serializers.ListField(child=serializers.CharField(), required=False)
+    detailed = serializers.BooleanField(default=False)
+    grading_policy = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        """
+        Check that the query is either for one course or for one user
+        """
+        by_course = "course_id" in attrs or "users" in attrs
+        by_user = "username" in attrs or "email" in attrs or "course_ids" in attrs
+        if by_course == by_user:
+            raise serializers.ValidationError(
+                "Provide either a course_id and users, or a username or email and course_ids"
+            )
+
+        if by_course and not (attrs.get("course_id") and attrs.get("users")):
+            raise serializers.ValidationError("A course_id and a list of users are needed")
+        if by_user and not (attrs.get("username") or attrs.get("email")):
+            raise serializers.ValidationError("Email or username needed")
+        if by_user and not attrs.get("course_ids"):
+            raise serializers.ValidationError("A list of course_ids is needed")
+
+        max_size = getattr(settings, "EOX_CORE_GRADES_BATCH_MAX_SIZE", 1000)
+        if len(attrs.get("users") or attrs.get("course_ids")) > max_size:
+            raise serializers.ValidationError(f"No more than {max_size} grades can be read at once")
+
+        return attrs
@@ -0,0 +1,76 @@
+"""
+Async tasks for the API v1.
+"""
+import logging
+
+from celery import shared_task
+from crum import set_current_request
+from django.contrib.sites.models import Site
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+from rest_framework.exceptions import ValidationError
+
+from eox_core.api.data.v1.reports import get_report_name, get_reports_storage, read_report_rows, write_report_part
+
+LOG = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def bulk_enrollments(self, action, request_file, site_id=None):
+    """
+    Async task to process a bulk enrollment request in the background.
+
+    The enrollments are processed by batches as in a synchronous request, and the
+    progress is reported after each batch with the `PROGRESS` state. The request and
+    the results are kept in the reports storage, so neither the celery message nor
+    the result backend hold the enrollments.
+
+    Args:
+        self (Task): The Celery task instance.
+        action (str): `create` or `update`.
+        request_file (str): The JSON Lines report with the enrollments sent in the request,
+            removed once they are read.
+        site_id (int): The site of the request.
+
+    Returns:
+        dict: The number of enrollments processed and failed, plus the name of the JSON Lines
+        report with the result of each enrollment or the validation errors of the request.
+    """
+    request_data = list(read_report_rows(request_file))
+    get_reports_storage().delete(request_file)
+    total = len(request_data)
+
+    def report_progress(processed, errors):
+        """
+        Store the progress of the job.
+        """
+        if self.request.id:
+            self.update_state(state="PROGRESS", meta={"total": total, "processed": processed, "errors": errors})
+
+    # The backends read the site and the identity map from the current request.
+    request = HttpRequest()
+    site = Site.objects.filter(id=site_id).first() if site_id else None
+    if site:
+        request.site = site
+    set_current_request(request)
+
+    try:
+        # The view is loaded on run because the views module dispatches this task.
+        view = import_string("eox_core.api.v1.views.EdxappEnrollment")()
+        view.request = request
+        view.site = site
+        action_method = {
+            "create": view.single_enrollment_create,
+            "update": view.single_enrollment_update,
+        }[action]
+
+        LOG.info("Processing %s bulk enrollments (%s) on site %s", total, action, site)
+        try:
+            results, errors = view.process_enrollments(request_data, action_method, on_batch=report_progress)
+        except ValidationError as error:
+            return {"total": total, "processed": 0, "errors": total, "detail": error.detail}
+    finally:
+        set_current_request(None)
+
+    results_file = write_report_part(get_report_name(f"enrollment-job-{self.request.id}", "jsonl"), results, "jsonl")
+    return {"total": total, "processed": total, "errors": errors, "results_file": results_file}
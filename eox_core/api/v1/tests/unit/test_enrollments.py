@@ -1,10 +1,21 @@
 # -*- coding: utf-8 -*-
 """ . """
+import json
+import shutil
+import tempfile
+
 from django.contrib.auth.models import User
-from django.test import TestCase
-from mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mock import Mock, patch
+from rest_framework.exceptions import NotFound
 from rest_framework.test import APIClient
 
+from eox_core.api.data.v1.reports import get_report_name, get_reports_storage, read_report_rows, write_report_part
+from eox_core.api.v1.tasks import bulk_enrollments
+from eox_core.api.v1.views import ENROLLMENT_JOB_CACHE_KEY_TPL
+from eox_core.utils import get_request_identity_map
+
 
 class TestEnrollmentsAPI(TestCase):
     """ Tests for the enrollments endpoints """
@@ -139,6 +150,79 @@ class TestEnrollmentsAPI(TestCase):
         self.assertIn('is_active', response.data[0])
         self.assertEqual(2, len(response.data))
 
+    @patch_permissions
+    @patch('eox_core.api.v1.serializers.validate_org')
+    @patch('eox_core.api.v1.serializers.get_valid_course_key')
+    @patch('eox_core.api.v1.serializers.check_edxapp_enrollment_is_valid', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    @patch('eox_core.api.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.update_enrollment')
+    def test_api_put_resolves_users_once(self, m_update_enrollment, m_get_user, m_get_users, *_):
+        """ Test that the users of a bulk update are retrieved in one pass """
+        user = User(username='test', email='test@example.com')
+        m_get_users.return_value = [user]
+        m_update_enrollment.return_value = {
+            'mode': 'audit',
+            'user': 'test',
+            'course_id': 'course-v1:org+course+run',
+            'is_active': True,
+        }
+        params = [{
+            'mode': 'audit',
+            'username': 'test',
+            'course_id': 'course-v1:org+course+run',
+        }, {
+            'mode': 'audit',
+            'username': 'test',
+            'course_id': 'course-v1:org+course_2+run',
+        }]
+
+        response = self.client.put('/api/v1/enrollment/', data=params, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        m_get_users.assert_called_once_with([{'username': 'test'}], site=None)
+        m_get_user.assert_not_called()
+        self.assertEqual(2, m_update_enrollment.call_count)
+        for call in m_update_enrollment.call_args_list:
+            self.assertIs(user, call.args[0])
+
+    @patch_permissions
+    @patch('eox_core.api.v1.serializers.validate_org')
+    @patch('eox_core.api.v1.serializers.get_valid_course_key', side_effect=lambda course_id: course_id)
+    @patch('eox_core.api.v1.serializers.check_edxapp_enrollment_is_valid', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_users', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.create_enrollment')
+    def test_api_bulk_post_keeps_order(self, m_create_enrollment, *_):
+        """ Test that a bulk creation grouped by course answers in the order of the request """
+        def create_enrollment(user, **kwargs):
+            if kwargs['username'] == 'missing':
+                raise NotFound('No user found')
+            return {
+                'mode': 'audit',
+                'user': kwargs['username'],
+                'course_id': kwargs['course_id'],
+                'is_active': True,
+            }, None
+
+        m_create_enrollment.side_effect = create_enrollment
+        params = [
+            {'mode': 'audit', 'username': 'first', 'course_id': 'course-v1:org+course+run'},
+            {'mode': 'audit', 'username': 'missing', 'course_id': 'course-v1:org+course_2+run'},
+            {'mode': 'audit', 'username': 'third', 'course_id': 'course-v1:org+course+run'},
+        ]
+
+        with override_settings(EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE=1):
+            response = self.client.post('/api/v1/enrollment/', data=params, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(['first', 'missing', 'third'], [item['username'] for item in response.data])
+        self.assertIn('error', response.data[1])
+        self.assertEqual(
+            ['first', 'third', 'missing'],
+            [call.kwargs['username'] for call in m_create_enrollment.call_args_list],
+        )
+
     @patch_permissions
     @patch('eox_core.api.v1.views.get_edxapp_user')
     @patch('eox_core.api.v1.views.delete_enrollment')
@@ -153,3 +237,253 @@ class TestEnrollmentsAPI(TestCase):
         m_get_user.assert_called_once_with(username='test')
         m_delete_enrollment.assert_called_once_with(course_id='course-v1:org+course+run', user=m_get_user.return_value)
         self.assertEqual(response.status_code, 204)
+
+
+class TestEnrollmentJobsAPI(TestCase):
+    """ Tests for the async mode of the enrollments endpoints """
+
+    patch_permissions = patch('eox_core.api.v1.permissions.EoxCoreAPIPermission.has_permission', return_value=True)
+
+    def setUp(self):
+        """ setup """
+        super().setUp()
+        self.api_user = User(1, 'test@example.com', 'test')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.api_user)
+        cache.clear()
+        self.params = [{
+            'mode': 'audit',
+            'username': 'test',
+            'course_id': 'course-v1:org+course+run',
+        }]
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            EOX_CORE_DATA_API_REPORTS_STORAGE='django.core.files.storage.FileSystemStorage',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.bulk_enrollments')
+    def test_api_post_async(self, m_bulk_enrollments, _):
+        """ Test that the async mode creates a job instead of processing the enrollments """
+        m_bulk_enrollments.name = 'eox_core.api.v1.tasks.bulk_enrollments'
+        m_bulk_enrollments.apply_async.side_effect = lambda **kwargs: Mock(id=kwargs['task_id'])
+
+        response = self.client.post('/api/v1/enrollment/?async=true', data=self.params, format='json')
+
+        job_id = response.data['job_id']
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.data['job_url'].endswith(f'/api/v1/enrollment/jobs/{job_id}/'))
+        task_kwargs = m_bulk_enrollments.apply_async.call_args.kwargs['kwargs']
+        self.assertEqual({'action': 'create', 'site_id': None}, {
+            key: value for key, value in task_kwargs.items() if key != 'request_file'
+        })
+        self.assertEqual(self.params, list(read_report_rows(task_kwargs['request_file'])))
+        self.assertEqual(
+            {'task': 'eox_core.api.v1.tasks.bulk_enrollments', 'site_id': None, 'user_id': 1},
+            cache.get(ENROLLMENT_JOB_CACHE_KEY_TPL.format(job_id=job_id)),
+        )
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.bulk_enrollments')
+    def test_api_put_async_requires_list(self, m_bulk_enrollments, _):
+        """ Test that the async mode is only available for a list of enrollments """
+        response = self.client.put('/api/v1/enrollment/?async=true', data=self.params[0], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        m_bulk_enrollments.apply_async.assert_not_called()
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.AsyncResult')
+    def test_api_job_progress(self, m_async_result, _):
+        """ Test that the status of a job includes its progress """
+        self.set_job('job-id', site_id=None)
+        m_async_result.return_value.state = 'PROGRESS'
+        m_async_result.return_value.failed.return_value = False
+        m_async_result.return_value.info = {'total': 10, 'processed': 5, 'errors': 1}
+
+        response = self.client.get('/api/v1/enrollment/jobs/job-id/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {'job_id': 'job-id', 'state': 'PROGRESS', 'total': 10, 'processed': 5, 'errors': 1},
+            response.data,
+        )
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.AsyncResult')
+    def test_api_job_results(self, m_async_result, _):
+        """ Test that the results of a finished job are read from the reports storage """
+        self.set_job('job-id', site_id=None)
+        results_file = write_report_part(get_report_name('enrollment-job-job-id', 'jsonl'), self.params, 'jsonl')
+        m_async_result.return_value.state = 'SUCCESS'
+        m_async_result.return_value.failed.return_value = False
+        m_async_result.return_value.info = {'total': 1, 'processed': 1, 'errors': 0, 'results_file': results_file}
+
+        response = self.client.get('/api/v1/enrollment/jobs/job-id/')
+
+        self.assertEqual(
+            {'job_id': 'job-id', 'state': 'SUCCESS', 'total': 1, 'processed': 1, 'errors': 0, 'results': self.params},
+            response.data,
+        )
+
+        get_reports_storage().delete(results_file)
+        response = self.client.get('/api/v1/enrollment/jobs/job-id/')
+
+        self.assertNotIn('results', response.data)
+        self.assertEqual('The results of the job have expired.', response.data['detail'])
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.AsyncResult')
+    def test_api_job_not_found(self, m_async_result, _):
+        """ Test that only the bulk enrollment jobs created on the site of the request are found """
+        self.set_job('other-site-job', site_id=2)
+        self.set_job('other-task', site_id=None, task='eox_core.tasks.other')
+
+        for job_id in ('unknown-job', 'other-site-job', 'other-task'):
+            response = self.client.get(f'/api/v1/enrollment/jobs/{job_id}/')
+
+            self.assertEqual(response.status_code, 404)
+        m_async_result.assert_not_called()
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.AsyncResult')
+    def test_api_job_failed(self, m_async_result, _):
+        """ Test that a failed job does not return the error of the task """
+        self.set_job('job-id', site_id=None)
+        m_async_result.return_value.state = 'FAILURE'
+        m_async_result.return_value.failed.return_value = True
+        m_async_result.return_value.result = Exception('Access denied for user "edxapp"')
+
+        response = self.client.get('/api/v1/enrollment/jobs/job-id/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('edxapp', response.data['detail'])
+
+    @staticmethod
+    def set_job(job_id, site_id, task='eox_core.api.v1.tasks.bulk_enrollments'):
+        """ Store the data of a job as enqueue_enrollment_job does """
+        cache.set(ENROLLMENT_JOB_CACHE_KEY_TPL.format(job_id=job_id), {'task': task, 'site_id': site_id, 'user_id': 1})
+
+    @patch('eox_core.api.v1.views.EdxappEnrollment.process_enrollments')
+    def test_bulk_enrollments_task(self, m_process_enrollments):
+        """ Test that the task processes the enrollments of the request file and stores their results """
+        m_process_enrollments.return_value = [{'username': 'test'}], 0
+        request_file = write_report_part(get_report_name('enrollment-job-request', 'jsonl'), self.params, 'jsonl')
+
+        result = bulk_enrollments('create', request_file)  # pylint: disable=no-value-for-parameter
+
+        results_file = result.pop('results_file')
+        self.assertEqual({'total': 1, 'processed': 1, 'errors': 0}, result)
+        self.assertEqual([{'username': 'test'}], list(read_report_rows(results_file)))
+        self.assertEqual(self.params, m_process_enrollments.call_args.args[0])
+        self.assertFalse(get_reports_storage().exists(request_file))
+
+
+class TestEnrollmentsStreamAPI(TestCase):
+    """ Tests for the NDJSON variant of the enrollments endpoints """
+
+    patch_permissions = patch('eox_core.api.v1.permissions.EoxCoreAPIPermission.has_permission', return_value=True)
+
+    def setUp(self):
+        """ setup """
+        super().setUp()
+        self.api_user = User(1, 'test@example.com', 'test')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.api_user)
+
+    @staticmethod
+    def read_lines(response):
+        """ Read the lines of a streamed NDJSON response """
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    @patch_permissions
+    @patch('eox_core.api.v1.serializers.validate_org')
+    @patch('eox_core.api.v1.serializers.get_valid_course_key', side_effect=lambda course_id: course_id)
+    @patch('eox_core.api.v1.serializers.check_edxapp_enrollment_is_valid', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_users', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.create_enrollment')
+    def test_api_post_ndjson(self, m_create_enrollment, *_):
+        """ Test that the enrollments of a NDJSON request are processed by chunks and streamed back """
+        m_create_enrollment.side_effect = lambda user, **kwargs: ({
+            'mode': 'audit',
+            'user': kwargs['username'],
+            'course_id': kwargs['course_id'],
+            'is_active': True,
+        }, None)
+        body = '\n'.join([
+            json.dumps({'mode': 'audit', 'username': 'first', 'course_id': 'course-v1:org+course+run'}),
+            json.dumps({'username': 'invalid', 'course_id': 'course-v1:org+course+run'}),
+            '',
+            json.dumps({'mode': 'audit', 'username': 'third', 'course_id': 'course-v1:org+course_2+run'}),
+        ])
+
+        with override_settings(EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE=2):
+            response = self.client.post('/api/v1/enrollment/', data=body, content_type='application/x-ndjson')
+            lines = self.read_lines(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual('application/x-ndjson', response['Content-Type'])
+        self.assertEqual(['first', 'invalid', 'third'], [line['username'] for line in lines])
+        self.assertIn('mode', lines[1]['error']['detail'])
+        self.assertNotIn('error', lines[2])
+        self.assertEqual(2, m_create_enrollment.call_count)
+
+    @patch_permissions
+    @patch('eox_core.api.v1.serializers.validate_org')
+    @patch('eox_core.api.v1.serializers.get_valid_course_key', side_effect=lambda course_id: course_id)
+    @patch('eox_core.api.v1.serializers.check_edxapp_enrollment_is_valid', return_value=[])
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    @patch('eox_core.api.v1.views.get_edxapp_user')
+    @patch('eox_core.api.v1.views.create_enrollment')
+    def test_api_post_ndjson_identity_map(self, m_create_enrollment, _, m_get_edxapp_users, *__):
+        """ Test that the users of a chunk are dropped from the identity map once it is processed """
+        m_get_edxapp_users.side_effect = lambda identifiers, site: [
+            Mock(username=identifier['username'], email=f"{identifier['username']}@example.com")
+            for identifier in identifiers
+        ]
+        map_sizes = []
+
+        def create_enrollment(user, **kwargs):
+            map_sizes.append(len(get_request_identity_map().users))
+            return {'mode': 'audit', 'user': kwargs['username'], 'course_id': kwargs['course_id']}, None
+
+        m_create_enrollment.side_effect = create_enrollment
+        body = '\n'.join(
+            json.dumps({'mode': 'audit', 'username': f'user{index}', 'course_id': 'course-v1:org+course+run'})
+            for index in range(6)
+        )
+
+        with override_settings(EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE=2):
+            response = self.client.post('/api/v1/enrollment/', data=body, content_type='application/x-ndjson')
+            lines = self.read_lines(response)
+
+        self.assertEqual(6, len(lines))
+        self.assertEqual(3, m_get_edxapp_users.call_count)
+        # Each of the two users of the chunk is registered by username and email
+        self.assertEqual([4] * 6, map_sizes)
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.get_edxapp_users', return_value=[])
+    def test_api_post_ndjson_parse_error(self, *_):
+        """ Test that a malformed line ends the stream with an error """
+        response = self.client.post('/api/v1/enrollment/', data='{"username": ', content_type='application/x-ndjson')
+        lines = self.read_lines(response)
+
+        self.assertEqual(1, len(lines))
+        self.assertIn('NDJSON parse error on line 1', lines[0]['error']['detail'])
+
+    @patch_permissions
+    def test_api_get_delete_ndjson(self, *_):
+        """ Test that only POST and PUT accept a NDJSON body """
+        body = json.dumps({'username': 'test', 'course_id': 'course-v1:org+course+run'})
+
+        for method in ('GET', 'DELETE'):
+            response = self.client.generic(method, '/api/v1/enrollment/', body, content_type='application/x-ndjson')
+
+            self.assertEqual(response.status_code, 415)  # pylint: disable=no-member
@@ -26,7 +26,7 @@ class TestGradesAPI(TestCase):
         self.client.force_authenticate(user=self.api_user)
         self.url = reverse("eox-api:eox-api:edxapp-grade")
 
-    @patch("eox_core.api.v1.views.get_courseware_courses")
+    @patch("eox_core.api.v1.views.get_course_grading_data")
     @patch("eox_core.api.v1.views.get_valid_course_key")
     @patch("eox_core.api.v1.views.get_course_grade_factory")
     @patch("eox_core.api.v1.views.get_enrollment")
@@ -39,7 +39,7 @@ class TestGradesAPI(TestCase):
             get_enrollment,
             grade_factory,
             get_valid_course_key,
-            get_courseware_courses,
+            get_course_grading_data,
     ):
         """Test that the GET method works with default parameters"""
 
@@ -57,7 +57,7 @@ class TestGradesAPI(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, expected_response)
 
-    @patch("eox_core.api.v1.views.get_courseware_courses")
+    @patch("eox_core.api.v1.views.get_course_grading_data")
     @patch("eox_core.api.v1.views.get_valid_course_key")
     @patch("eox_core.api.v1.views.get_course_grade_factory")
     @patch("eox_core.api.v1.views.get_enrollment")
@@ -70,7 +70,7 @@ class TestGradesAPI(TestCase):
             get_enrollment,
             grade_factory,
             get_valid_course_key,
-            get_courseware_courses,
+            get_course_grading_data,
     ):
         """Test that the GET method works including section details"""
 
@@ -90,7 +90,7 @@ class TestGradesAPI(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, expected_response)
 
-    @patch("eox_core.api.v1.views.get_courseware_courses")
+    @patch("eox_core.api.v1.views.get_course_grading_data")
     @patch("eox_core.api.v1.views.get_valid_course_key")
     @patch("eox_core.api.v1.views.get_course_grade_factory")
     @patch("eox_core.api.v1.views.get_enrollment")
@@ -103,7 +103,7 @@ class TestGradesAPI(TestCase):
             get_enrollment,
             grade_factory,
             get_valid_course_key,
-            get_courseware_courses,
+            get_course_grading_data,
     ):
         """Test that the GET method works with section details and grading policy"""
 
@@ -111,9 +111,11 @@ class TestGradesAPI(TestCase):
         get_enrollment.return_value = None, None
         grade_factory.return_value.return_value.read.return_value.percent = 0.5
         grade_factory.return_value.return_value.read.return_value.subsection_grades = {}
-        get_courseware_courses.return_value.get_course_by_id.return_value.grading_policy = {
-            "GRADE_CUTOFFS": {},
-            "GRADER": [],
+        get_course_grading_data.return_value = {
+            "grading_policy": {
+                "GRADE_CUTOFFS": {},
+                "GRADER": [],
+            },
         }
         params = {
             "username": "test",
@@ -179,3 +181,132 @@ class TestGradesAPI(TestCase):
         ]
 
         self.assertEqual(section_breakdown, expected_subgrades)
+
+
+@patch("eox_core.api.v1.permissions.EoxCoreAPIPermission.has_permission", return_value=True)
+@patch("eox_core.api.v1.views.get_course_grading_data")
+@patch("eox_core.api.v1.views.get_valid_course_key")
+@patch("eox_core.api.v1.views.get_course_grade_factory")
+@patch("eox_core.api.v1.views.get_enrollment")
+class TestGradeBatchAPI(TestCase):
+    """ Tests for the grades batch endpoint """
+
+    def setUp(self):
+        """ setup """
+        self.api_user = User(1, "test@example.com", "test")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.api_user)
+        self.url = reverse("eox-api:eox-api:edxapp-grade-batch")
+
+    @patch("eox_core.api.v1.views.get_course_enrollment")
+    @patch("eox_core.api.v1.views.get_edxapp_users")
+    def test_course_grades_read_in_bulk(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+            self,
+            get_edxapp_users,
+            get_course_enrollment,
+            get_enrollment,
+            grade_factory,
+            get_valid_course_key,
+            get_course_grading_data,
+            __,
+    ):
+        """Test that the course is loaded once and the enrollments and grades of its users are read in one pass"""
+        users = [MagicMock(id=1, username="user1"), MagicMock(id=2, username="user2"), MagicMock(id=3, username="user3")]
+        for user in users:
+            user.email = f"{user.username}@example.com"
+        get_edxapp_users.return_value = users
+        enrollments = get_course_enrollment.return_value.objects.filter
+        enrollments.return_value.values_list.return_value = [1, 2]
+        grade_factory.return_value.return_value.iter.return_value = [
+            MagicMock(student=users[0], course_grade=MagicMock(percent=0.5), error=None),
+            MagicMock(student=users[1], error=Exception("Grade error")),
+        ]
+        data = {
+            "course_id": "course-v1:org+course+run",
+            "users": [{"username": "user1"}, {"email": "user2@example.com"}, {"username": "user3"}],
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response.data,
+            [
+                {"username": "user1", "course_id": "course-v1:org+course+run", "earned_grade": 0.5},
+                {
+                    "email": "user2@example.com",
+                    "course_id": "course-v1:org+course+run",
+                    "error": {"detail": "Grade error"},
+                },
+                {
+                    "username": "user3",
+                    "course_id": "course-v1:org+course+run",
+                    "error": {"detail": ["No enrollment found for user:`user3`"]},
+                },
+            ],
+        )
+        enrollments.assert_called_once_with(
+            course_id=get_valid_course_key.return_value,
+            user_id__in={1, 2, 3},
+        )
+        get_enrollment.assert_not_called()
+        grade_factory.return_value.return_value.iter.assert_called_once_with(
+            users[:2],
+            course_key=get_valid_course_key.return_value,
+        )
+        get_course_grading_data.assert_not_called()
+
+    @patch("eox_core.api.v1.views.get_edxapp_user")
+    def test_user_grades_with_grading_policy(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+            self,
+            get_edxapp_user,
+            get_enrollment,
+            grade_factory,
+            get_valid_course_key,
+            get_course_grading_data,
+            __,
+    ):
+        """Test that the grades of a user are read with the cached grading policy of each course"""
+        get_edxapp_user.return_value.username = "test"
+        get_enrollment.return_value = None, None
+        grade_factory.return_value.return_value.read.return_value.percent = 0.5
+        get_course_grading_data.return_value = {"grading_policy": {"GRADE_CUTOFFS": {"Pass": 0.5}, "GRADER": []}}
+        data = {
+            "username": "test",
+            "course_ids": ["course-v1:org+course+run", "course-v1:org+course+run2"],
+            "grading_policy": True,
+        }
+
+        response = self.client.post(self.url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "username": "test",
+                    "course_id": course_id,
+                    "earned_grade": 0.5,
+                    "grading_policy": {"grade_cutoffs": {"Pass": 0.5}, "grader": []},
+                }
+                for course_id in data["course_ids"]
+            ],
+        )
+        grade_factory.return_value.return_value.read.assert_called_with(
+            get_edxapp_user.return_value,
+            course_key=get_valid_course_key.return_value,
+        )
+
+    def test_batch_input_validation(self, *_):
+        """Test that the query has to be either for one course or for one user"""
+        invalid_queries = [
+            {},
+            {"course_id": "course-v1:org+course+run"},
+            {"username": "test"},
+            {"course_id": "course-v1:org+course+run", "users": [{"username": "test"}], "username": "test"},
+        ]
+
+        for data in invalid_queries:
+            response = self.client.post(self.url, data, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
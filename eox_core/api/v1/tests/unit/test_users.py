@@ -558,3 +558,68 @@ class UsersAPITest(TestCase):
         self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
         self.assertEqual(response.content, '{"mobile":["Ensure this field has no more than 12 characters."]}'
                          .encode())
+
+
+class UsersLookupAPITest(TestCase):
+    """Test class for EdxappUserLookup viewset."""
+
+    patch_permissions = patch('eox_core.api.v1.permissions.EoxCoreAPIPermission.has_permission', return_value=True)
+
+    def setUp(self):
+        """Setup method for test class."""
+        self.user = User(username="test", email="test@example.com", password="testtest")
+        self.client = APIClient()
+        self.url = reverse("eox-api:eox-api:edxapp-users-lookup")
+        self.client.force_authenticate(user=self.user)
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    @patch('eox_core.api.v1.views.EdxappUserReadOnlySerializer')
+    def test_lookup_success(self, user_serializer, get_edxapp_users, _):
+        """Used to test that all the users are resolved in a single backend call."""
+        request_data = [{"username": "test"}, {"email": "other@example.com"}]
+        user_serializer.return_value.data = {"username": "test"}
+        get_edxapp_users.return_value = [MagicMock(), MagicMock()]
+
+        response = self.client.post(self.url, data=request_data, format="json")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual([{"username": "test"}, {"username": "test"}], response.json())
+        get_edxapp_users.assert_called_once_with(request_data, site=None)
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    @patch('eox_core.api.v1.views.EdxappUserReadOnlySerializer')
+    def test_lookup_user_not_found(self, user_serializer, get_edxapp_users, _):
+        """Used to test that the users not found are reported in their own position."""
+        request_data = [{"username": "test"}, {"email": "other@example.com"}]
+        user_serializer.return_value.data = {"username": "test"}
+        get_edxapp_users.return_value = [MagicMock(), None]
+
+        response = self.client.post(self.url, data=request_data, format="json")
+
+        self.assertEqual(status.HTTP_202_ACCEPTED, response.status_code)
+        self.assertEqual({"username": "test"}, response.json()[0])
+        self.assertEqual("other@example.com", response.json()[1]["email"])
+        self.assertIn("error", response.json()[1])
+
+    @patch_permissions
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    def test_lookup_missing_identifier(self, get_edxapp_users, _):
+        """Used to test that every item must have an email or username."""
+        response = self.client.post(self.url, data=[{"username": "test"}, {}], format="json")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        get_edxapp_users.assert_not_called()
+
+    @patch_permissions
+    @override_settings(EOX_CORE_USERS_LOOKUP_MAX_SIZE=1)
+    @patch('eox_core.api.v1.views.get_edxapp_users')
+    def test_lookup_too_many_users(self, get_edxapp_users, _):
+        """Used to test that the size of the batch is limited."""
+        request_data = [{"username": "test"}, {"username": "other"}]
+
+        response = self.client.post(self.url, data=request_data, format="json")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        get_edxapp_users.assert_not_called()
@@ -9,8 +9,15 @@ app_name = 'eox_core'  # pylint: disable=invalid-name
 
 urlpatterns = [  # pylint: disable=invalid-name
     re_path(r'^user/$', views.EdxappUser.as_view(), name='edxapp-user'),
+    re_path(r'^users/lookup/$', views.EdxappUserLookup.as_view(), name='edxapp-users-lookup'),
     re_path(r'^enrollment/$', views.EdxappEnrollment.as_view(), name='edxapp-enrollment'),
+    re_path(
+        r'^enrollment/jobs/(?P<job_id>[\w-]+)/$',
+        views.EdxappEnrollmentJob.as_view(),
+        name='edxapp-enrollment-job',
+    ),
     re_path(r'^grade/$', views.EdxappGrade.as_view(), name='edxapp-grade'),
+    re_path(r'^grade/batch/$', views.EdxappGradeBatch.as_view(), name='edxapp-grade-batch'),
     re_path(r'^pre-enrollment/$', views.EdxappPreEnrollment.as_view(), name='edxapp-pre-enrollment'),
     re_path(r'^userinfo/$', views.UserInfo.as_view(), name='edxapp-userinfo'),
 ]
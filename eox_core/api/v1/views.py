@@ -5,34 +5,49 @@ API v1 views.
 # pylint: disable=too-many-lines
 from __future__ import absolute_import, unicode_literals
 
+import json
 import logging
+from collections import OrderedDict
+from itertools import islice
+from uuid import uuid4
 
 import edx_api_doc_tools as apidocs
 import six
+from celery.result import AsyncResult
+from crum import get_current_request, set_current_request
 from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.urls import reverse
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from rest_framework import status
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.exceptions import APIException, NotFound, ParseError, ValidationError
 from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
+from eox_core.api.data.v1.reports import get_report_name, get_reports_storage, read_report_rows, write_report_part
+from eox_core.api.v1.parsers import NDJSON_MEDIA_TYPE, NDJSONParser, NDJSONStream
 from eox_core.api.v1.permissions import EoxCoreAPIPermission
 from eox_core.api.v1.serializers import (
     EdxappCourseEnrollmentQuerySerializer,
     EdxappCourseEnrollmentSerializer,
     EdxappCoursePreEnrollmentSerializer,
+    EdxappGradeBatchSerializer,
     EdxappGradeSerializer,
+    EdxappUserLookupSerializer,
     EdxappUserQuerySerializer,
     EdxappUserReadOnlySerializer,
     EdxappUserSerializer,
     WrittableEdxappUserSerializer,
 )
+from eox_core.api.v1.tasks import bulk_enrollments
 from eox_core.edxapp_wrapper.bearer_authentication import BearerAuthentication
 from eox_core.edxapp_wrapper.coursekey import get_valid_course_key
-from eox_core.edxapp_wrapper.courseware import get_courseware_courses
 from eox_core.edxapp_wrapper.enrollments import create_enrollment, delete_enrollment, get_enrollment, update_enrollment
 from eox_core.edxapp_wrapper.grades import get_course_grade_factory
 from eox_core.edxapp_wrapper.pre_enrollments import (
@@ -41,7 +56,15 @@ from eox_core.edxapp_wrapper.pre_enrollments import (
     get_pre_enrollment,
     update_pre_enrollment,
 )
-from eox_core.edxapp_wrapper.users import create_edxapp_user, get_edxapp_user, get_user_read_only_serializer
+from eox_core.edxapp_wrapper.users import (
+    create_edxapp_user,
+    get_course_enrollment,
+    get_edxapp_user,
+    get_edxapp_users,
+    get_user_read_only_serializer,
+)
+from eox_core.grading import get_course_grading_data
+from eox_core.utils import get_request_identity_map
 
 try:
     from eox_audit_model.decorators import audit_drf_api
@@ -52,6 +75,24 @@ except ImportError:
 
 LOG = logging.getLogger(__name__)
 
+ENROLLMENT_JOB_CACHE_KEY_TPL = "eox_core.enrollment_jobs.{job_id}"
+
+
+def get_enrollment_batches(enrollment_queries, chunk_size):
+    """
+    Split the enrollment queries in batches of up to chunk_size queries of the same course or bundle
+
+    Returns: Iterator of lists of (position, enrollment_query) tuples
+    """
+    queries_by_target = OrderedDict()
+    for index, enrollment_query in enumerate(enrollment_queries):
+        target = (enrollment_query.get("course_id"), enrollment_query.get("bundle_id"))
+        queries_by_target.setdefault(target, []).append((index, enrollment_query))
+
+    for queries in queries_by_target.values():
+        for start in range(0, len(queries), chunk_size):
+            yield queries[start:start + chunk_size]
+
 
 class UserQueryMixin:
     """
@@ -111,6 +152,49 @@ class UserQueryMixin:
 
         return user_query
 
+    def get_edxapp_user(self, **user_query):
+        """
+        Utility to retrieve the user of a query once per request
+
+        The user is kept in the identity map of the request, so the backends
+        called later in the same request can use it instead of querying it again.
+        """
+        identity_map = get_request_identity_map(self.request)
+        user = identity_map.get_user(
+            username=user_query.get("username"),
+            email=user_query.get("email"),
+        )
+        if user is None:
+            user = get_edxapp_user(**user_query)
+            identity_map.add_user(user)
+        return user
+
+    def preload_edxapp_users(self, user_queries):
+        """
+        Utility to retrieve in one pass the users of many queries
+
+        The users found are kept in the identity map of the request, the ones
+        missing are left for get_edxapp_user to report.
+        """
+        identifiers = OrderedDict()
+        for user_query in user_queries:
+            if not isinstance(user_query, dict):
+                continue
+            if user_query.get("username"):
+                kind = "username"
+            elif user_query.get("email"):
+                kind = "email"
+            else:
+                continue
+            identifiers.setdefault((kind, user_query[kind]), {kind: user_query[kind]})
+        if not identifiers:
+            return
+
+        identity_map = get_request_identity_map(self.request)
+        for user in get_edxapp_users(list(identifiers.values()), site=self.site):
+            if user is not None:
+                identity_map.add_user(user)
+
 
 class EdxappUser(UserQueryMixin, APIView):
     """
@@ -327,7 +411,7 @@ class EdxappUser(UserQueryMixin, APIView):
         - 404: User not found
         """
         query = self.get_user_query(request)
-        user = get_edxapp_user(**query)
+        user = self.get_edxapp_user(**query)
         admin_fields = getattr(settings, "ACCOUNT_VISIBILITY_CONFIGURATION", {}).get(
             "admin_fields", {}
         )
@@ -345,6 +429,109 @@ class EdxappUser(UserQueryMixin, APIView):
         return Response(response_data)
 
 
+class EdxappUserLookup(UserQueryMixin, APIView):
+    """
+    Retrieves many edxapp users at once given their emails or usernames.
+
+    **Example Requests**
+
+        POST /eox-core/api/v1/users/lookup/
+
+        Request data: [
+            {"username": "johndoe"},
+            {"email": "janedoe@example.com"},
+        ]
+    """
+
+    authentication_classes = (BearerAuthentication, SessionAuthentication, JwtAuthentication)
+    permission_classes = (EoxCoreAPIPermission,)
+    renderer_classes = (JSONRenderer, BrowsableAPIRenderer)
+
+    @apidocs.schema(
+        body=EdxappUserLookupSerializer(many=True),
+        responses={
+            200: get_user_read_only_serializer(),
+            202: "Some of the users were not found.",
+            400: "Bad request, missing email or username or too many users requested.",
+            401: "Unauthorized user to make the request.",
+        },
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Retrieves information about many edxapp users, given their emails or usernames.
+
+        The users are found in a single query, instead of one per call to `GET /eox-core/api/v1/user/`.
+        Each user is still serialized as that endpoint does, so the platform serializer reads the
+        related data of the profile user by user.
+
+        **Example Requests**
+
+            POST /eox-core/api/v1/users/lookup/
+
+            Request data: [
+                {"username": "johndoe"},
+                {"email": "janedoe@example.com"},
+            ]
+
+        **Parameters**
+
+        A list of objects with the following keys. The username prevails over the email when both are provided.
+
+        - `username` (**required**, string, _body_):
+            The username used to identify the user. Use either username or email.
+
+        - `email` (**required**, string, _body_):
+            The email used to identify the user. Use either username or email.
+
+        **Response details**
+
+        A list in the same order of the request. Each item has the same fields returned by
+        `GET /eox-core/api/v1/user/` or, when the user was not found, the identifier sent along with an `error`.
+
+        **Returns**
+
+        - 200: Success, all the users were found.
+        - 202: Some of the users were not found, check the `error` of each item.
+        - 400: Bad request, missing email or username or more users than `EOX_CORE_USERS_LOOKUP_MAX_SIZE`.
+        - 401: Unauthorized user to make the request.
+        """
+        max_size = getattr(settings, "EOX_CORE_USERS_LOOKUP_MAX_SIZE", 1000)
+        if not isinstance(request.data, list):
+            raise ValidationError(detail="A list of users is expected")
+        if len(request.data) > max_size:
+            raise ValidationError(detail=f"No more than {max_size} users can be looked up at once")
+
+        serializer = EdxappUserLookupSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        identifiers = [
+            {"username": item["username"]} if item.get("username") else {"email": item["email"]}
+            for item in serializer.validated_data
+        ]
+        users = get_edxapp_users(identifiers, site=self.site)
+
+        admin_fields = getattr(settings, "ACCOUNT_VISIBILITY_CONFIGURATION", {}).get(
+            "admin_fields", {}
+        )
+        domain = getattr(self.site, "domain", None)
+        response_data = []
+        for identifier, user in zip(identifiers, users):
+            if user is None:
+                response_data.append({
+                    **identifier,
+                    "error": {"detail": f"No user found by {str(identifier)} on site {domain}."},
+                })
+                continue
+            serialized_user = EdxappUserReadOnlySerializer(
+                user, custom_fields=admin_fields, context={"request": request}
+            )
+            response_data.append(serialized_user.data)
+
+        response_status = status.HTTP_200_OK
+        if None in users:
+            response_status = status.HTTP_202_ACCEPTED
+        return Response(response_data, status=response_status)
+
+
 class EdxappUserUpdater(UserQueryMixin, APIView):
     """
     Partially updates a user from edxapp.
@@ -512,7 +699,7 @@ class EdxappUserUpdater(UserQueryMixin, APIView):
             "username": data.pop("username", None),
         }
         query = self.get_user_query(request, query_params=query_params)
-        user = get_edxapp_user(**query)
+        user = self.get_edxapp_user(**query)
 
         serializer = WrittableEdxappUserSerializer(user, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -535,6 +722,16 @@ class EdxappEnrollment(UserQueryMixin, APIView):
     authentication_classes = (BearerAuthentication, SessionAuthentication, JwtAuthentication)
     permission_classes = (EoxCoreAPIPermission,)
     renderer_classes = (JSONRenderer, BrowsableAPIRenderer)
+    parser_classes = (*api_settings.DEFAULT_PARSER_CLASSES, NDJSONParser)
+
+    def get_parsers(self):
+        """
+        Only POST and PUT read the enrollments of a NDJSON body, GET and DELETE answer it with a 415.
+        """
+        parsers = super().get_parsers()
+        if self.request.method not in ("POST", "PUT"):
+            parsers = [parser for parser in parsers if not isinstance(parser, NDJSONParser)]
+        return parsers
 
     @apidocs.schema(
         body=EdxappCourseEnrollmentQuerySerializer,
@@ -636,14 +833,28 @@ class EdxappEnrollment(UserQueryMixin, APIView):
              },
             ]
 
+        - `async` (boolean, _query_):
+            Flag to process a list of enrollments in the background. The response is a 202 with the
+            `job_id` and the `job_url` to check the progress and the results of the job.
+
+        Large lists can also be sent with the `application/x-ndjson` content type, one enrollment per
+        line. The enrollments are processed in chunks and the response is streamed with the result of
+        each enrollment per line, in the order of the request. Invalid enrollments are answered with
+        an `error` line instead of failing the whole request.
+
         **Returns**
 
         - 200: Success, enrollment created.
-        - 202: User doesn't belong to site.
+        - 202: User doesn't belong to site or the job was created in async mode.
         - 400: Bad request, invalid course_id or missing either email or username.
         """
+        if request.query_params.get("async") in ("True", "true", "on", "1"):
+            return self.enqueue_enrollment_job(request, "create")
+        if isinstance(request.data, NDJSONStream):
+            return self.stream_enrollments(request, self.single_enrollment_create)
+
         data = request.data
-        return EdxappEnrollment.prepare_multiresponse(
+        return self.prepare_multiresponse(
             data, self.single_enrollment_create
         )
 
@@ -713,14 +924,28 @@ class EdxappEnrollment(UserQueryMixin, APIView):
             - name: name of the attribute
             - value: value of the attribute
 
+        - `async` (boolean, _query_):
+            Flag to process a list of enrollments in the background. The response is a 202 with the
+            `job_id` and the `job_url` to check the progress and the results of the job.
+
+        Large lists can also be sent with the `application/x-ndjson` content type, one enrollment per
+        line. The enrollments are processed in chunks and the response is streamed with the result of
+        each enrollment per line, in the order of the request. Invalid enrollments are answered with
+        an `error` line instead of failing the whole request.
+
         **Returns**
 
         - 200: Success, enrollment updated.
-        - 202: User or enrollment doesn't belong to site.
+        - 202: User or enrollment doesn't belong to site or the job was created in async mode.
         - 400: Bad request, invalid course_id or missing either email or username.
         """
+        if request.query_params.get("async") in ("True", "true", "on", "1"):
+            return self.enqueue_enrollment_job(request, "update")
+        if isinstance(request.data, NDJSONStream):
+            return self.stream_enrollments(request, self.single_enrollment_update)
+
         data = request.data
-        return EdxappEnrollment.prepare_multiresponse(
+        return self.prepare_multiresponse(
             data, self.single_enrollment_update
         )
 
@@ -769,7 +994,7 @@ class EdxappEnrollment(UserQueryMixin, APIView):
         - 404: User or course not found
         """
         user_query = self.get_user_query(request)
-        user = get_edxapp_user(**user_query)
+        user = self.get_edxapp_user(**user_query)
 
         course_id = self.query_params.get("course_id", None)
 
@@ -826,7 +1051,7 @@ class EdxappEnrollment(UserQueryMixin, APIView):
             }
         """
         user_query = self.get_user_query(request)
-        user = get_edxapp_user(**user_query)
+        user = self.get_edxapp_user(**user_query)
 
         course_id = self.query_params.get("course_id", None)
 
@@ -841,7 +1066,7 @@ class EdxappEnrollment(UserQueryMixin, APIView):
         Handle one create at the time
         """
         user_query = self.get_user_query(None, query_params=kwargs)
-        user = get_edxapp_user(**user_query)
+        user = self.get_edxapp_user(**user_query)
 
         enrollments, msgs = create_enrollment(user, **kwargs)
         # This logic block is needed to convert a single bundle_id enrollment in a list
@@ -863,7 +1088,7 @@ class EdxappEnrollment(UserQueryMixin, APIView):
         Handle one update at the time
         """
         user_query = self.get_user_query(None, query_params=kwargs)
-        user = get_edxapp_user(**user_query)
+        user = self.get_edxapp_user(**user_query)
 
         course_id = kwargs.pop("course_id", None)
         if not course_id:
@@ -872,8 +1097,7 @@ class EdxappEnrollment(UserQueryMixin, APIView):
 
         return update_enrollment(user, course_id, mode, **kwargs)
 
-    @staticmethod
-    def prepare_multiresponse(request_data, action_method):
+    def prepare_multiresponse(self, request_data, action_method):
         """
         Prepare a multiple part response according to the request_data and the action_method provided
         Args:
@@ -882,30 +1106,8 @@ class EdxappEnrollment(UserQueryMixin, APIView):
 
         Returns: List of responses
         """
-        multiple_responses = []
-        errors_in_bulk_response = False
         many = isinstance(request_data, list)
-        serializer = EdxappCourseEnrollmentQuerySerializer(data=request_data, many=many)
-        serializer.is_valid(raise_exception=True)
-        data = serializer.validated_data
-        if not isinstance(data, list):
-            data = [data]
-
-        for enrollment_query in data:
-
-            try:
-                result = action_method(**enrollment_query)
-                # The result can be a list if the enrollment was in a bundle
-                if isinstance(result, list):
-                    multiple_responses += result
-                else:
-                    multiple_responses.append(result)
-            except APIException as error:
-                errors_in_bulk_response = True
-                enrollment_query["error"] = {
-                    "detail": error.detail,
-                }
-                multiple_responses.append(enrollment_query)
+        multiple_responses, errors_in_bulk_response = self.process_enrollments(request_data, action_method)
 
         if many or "bundle_id" in request_data:
             response = multiple_responses
@@ -917,6 +1119,178 @@ class EdxappEnrollment(UserQueryMixin, APIView):
             response_status = status.HTTP_202_ACCEPTED
         return Response(response, status=response_status)
 
+    def process_enrollments(self, request_data, action_method, on_batch=None):
+        """
+        Apply the action_method to the query or queries of the request_data
+
+        Bulk requests are processed as a batch: the users are retrieved in one pass before
+        the validation, and the enrollments are applied grouped by course. Each enrollment is
+        written by the platform as a single request does, so a failure does not affect the
+        others. The results keep the order of the request.
+
+        Args:
+            request_data: Data dictionary containing the query or queries to be processed
+            action_method: Function to be applied to the queries (create, update)
+            on_batch: Optional function called every EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE queries
+                with the number of queries processed and the number of them that failed
+
+        Returns: List of results and the number of queries that failed
+        """
+        if isinstance(request_data, list):
+            self.preload_edxapp_users(request_data)
+
+        serializer = EdxappCourseEnrollmentQuerySerializer(data=request_data, many=isinstance(request_data, list))
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not isinstance(data, list):
+            data = [data]
+
+        results, errors = self.apply_enrollment_queries(data, action_method, on_batch=on_batch)
+        return self.flatten_enrollment_results(results), errors
+
+    def apply_enrollment_queries(self, enrollment_queries, action_method, on_batch=None):
+        """
+        Apply the action_method to validated enrollment queries, grouped by course in batches
+
+        Returns: List of results in the order of the queries and the number of queries that failed
+        """
+        results = [None] * len(enrollment_queries)
+        errors = 0
+        chunk_size = getattr(settings, "EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE", 100)
+        for batch in get_enrollment_batches(enrollment_queries, chunk_size):
+            for index, enrollment_query in batch:
+                results[index], failed = self.apply_enrollment_action(action_method, enrollment_query)
+                errors += int(failed)
+            if on_batch:
+                on_batch(len(results) - results.count(None), errors)
+        return results, errors
+
+    @staticmethod
+    def flatten_enrollment_results(results):
+        """
+        Flatten the results of the enrollments in bundles, which are lists
+        """
+        multiple_responses = []
+        for result in results:
+            multiple_responses += result if isinstance(result, list) else [result]
+        return multiple_responses
+
+    def stream_enrollments(self, request, action_method):
+        """
+        Apply the action_method to the enrollments of a NDJSON request while streaming the results
+
+        The body is read in chunks of EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE enrollments, so the
+        memory used does not depend on the size of the request. Every enrollment is validated
+        on its own and the result of each one is written as a line of the response, in the
+        order of the request.
+        """
+        django_request = request._request  # pylint: disable=protected-access
+
+        def stream_results():
+            # The response is consumed after the view returns, the backends still need the request.
+            previous_request = get_current_request()
+            set_current_request(django_request)
+            try:
+                for result in self.process_enrollments_stream(request.data, action_method):
+                    yield json.dumps(result, cls=JSONEncoder) + "\n"
+            except ParseError as error:
+                yield json.dumps({"error": {"detail": error.detail}}, cls=JSONEncoder) + "\n"
+            finally:
+                set_current_request(previous_request)
+
+        return StreamingHttpResponse(stream_results(), content_type=NDJSON_MEDIA_TYPE)
+
+    def process_enrollments_stream(self, enrollment_items, action_method):
+        """
+        Apply the action_method to an iterable of enrollments, one chunk at a time
+
+        The users of each chunk are dropped from the identity map of the request once
+        the chunk is processed, so its size does not depend on the size of the request.
+
+        Returns: Iterator of the results of the enrollments
+        """
+        chunk_size = getattr(settings, "EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE", 100)
+        identity_map = get_request_identity_map(self.request)
+        enrollment_items = iter(enrollment_items)
+        chunk = list(islice(enrollment_items, chunk_size))
+        while chunk:
+            self.preload_edxapp_users(chunk)
+
+            results = [None] * len(chunk)
+            valid_positions = []
+            valid_queries = []
+            for index, item in enumerate(chunk):
+                serializer = EdxappCourseEnrollmentQuerySerializer(data=item)
+                if serializer.is_valid():
+                    valid_positions.append(index)
+                    valid_queries.append(serializer.validated_data)
+                else:
+                    results[index] = {
+                        **(item if isinstance(item, dict) else {}),
+                        "error": {"detail": serializer.errors},
+                    }
+
+            valid_results, _ = self.apply_enrollment_queries(valid_queries, action_method)
+            for index, result in zip(valid_positions, valid_results):
+                results[index] = result
+
+            identity_map.clear_users()
+            yield from self.flatten_enrollment_results(results)
+            chunk = list(islice(enrollment_items, chunk_size))
+
+    def enqueue_enrollment_job(self, request, action):
+        """
+        Send a bulk enrollment request to be processed by a celery worker
+
+        Returns: 202 response with the id of the job and the url to check its status
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError(detail="The async mode is only available for a list of enrollments")
+
+        site_id = getattr(self.site, "id", None)
+        job_id = str(uuid4())
+        # The enrollments are passed to the worker in the reports storage instead of the celery message.
+        request_file = write_report_part(
+            get_report_name(f"enrollment-job-{job_id}-request", "jsonl"),
+            request.data,
+            "jsonl",
+        )
+        # The job can only be checked from the site that created it, see EdxappEnrollmentJob.
+        cache.set(
+            ENROLLMENT_JOB_CACHE_KEY_TPL.format(job_id=job_id),
+            {"task": bulk_enrollments.name, "site_id": site_id, "user_id": request.user.id},
+            getattr(settings, "EOX_CORE_BULK_ENROLLMENT_JOB_TTL", 86400),
+        )
+        job = bulk_enrollments.apply_async(
+            kwargs={
+                "action": action,
+                "request_file": request_file,
+                "site_id": site_id,
+            },
+            task_id=job_id,
+            routing_key=getattr(settings, "EOX_CORE_BULK_ENROLLMENT_ROUTING_KEY", None),
+        )
+        LOG.info("Bulk enrollment job %s (%s) enqueued by user %s on site %s", job.id, action, request.user.id, site_id)
+        job_url = request.build_absolute_uri(
+            reverse(f"{request.resolver_match.namespace}:edxapp-enrollment-job", kwargs={"job_id": job.id})
+        )
+        return Response({"job_id": job.id, "job_url": job_url}, status=status.HTTP_202_ACCEPTED)
+
+    @staticmethod
+    def apply_enrollment_action(action_method, enrollment_query):
+        """
+        Apply the action_method to one enrollment query
+
+        Returns: The result of the action or the query with the error, and whether it failed
+        """
+        try:
+            return action_method(**enrollment_query), False
+        except APIException as error:
+            enrollment_query["error"] = {
+                "detail": error.detail,
+            }
+            return enrollment_query, True
+
     def handle_exception(self, exc):
         """
         Handle exception: log it
@@ -927,6 +1301,67 @@ class EdxappEnrollment(UserQueryMixin, APIView):
         return super().handle_exception(exc)
 
 
+class EdxappEnrollmentJob(UserQueryMixin, APIView):
+    """
+    Handles API requests to check the bulk enrollment jobs
+    """
+
+    authentication_classes = (BearerAuthentication, SessionAuthentication, JwtAuthentication)
+    permission_classes = (EoxCoreAPIPermission,)
+    renderer_classes = (JSONRenderer, BrowsableAPIRenderer)
+
+    @apidocs.schema(
+        responses={
+            200: "The state of the job, its progress and, once finished, the results of each enrollment.",
+            401: "Unauthorized user to make the request.",
+            404: "No bulk enrollment job with the given id was created on the site.",
+        },
+    )
+    def get(self, request, job_id, *args, **kwargs):
+        """
+        Retrieves the state of a bulk enrollment job
+
+        **Example Requests**
+
+            GET /eox-core/api/v1/enrollment/jobs/7faf4b00-b526-4787-8ef2-f543dadfdb09/
+
+        **Response details**
+
+        - `state`: The celery state of the job: `PENDING`, `PROGRESS`, `SUCCESS` or `FAILURE`.
+        - `total`: The number of enrollments of the job.
+        - `processed`: The number of enrollments already processed.
+        - `errors`: The number of enrollments that failed.
+        - `results`: Once the job succeeds, the result of each enrollment, in the same
+            format and order of a synchronous request.
+        - `detail`: The validation errors of the request or a generic error when the job failed.
+
+        Only the jobs created on the site of the request can be checked.
+        """
+        job_data = cache.get(ENROLLMENT_JOB_CACHE_KEY_TPL.format(job_id=job_id)) or {}
+        site_id = getattr(self.site, "id", None)
+        if job_data.get("task") != bulk_enrollments.name or job_data.get("site_id") != site_id:
+            raise NotFound(detail=f"No bulk enrollment job found by id {job_id}.")
+
+        job = AsyncResult(job_id)
+        response = {
+            "job_id": job_id,
+            "state": job.state,
+        }
+        if job.failed():
+            LOG.error("Bulk enrollment job %s failed: %r", job_id, job.result)
+            response["detail"] = "The job failed, the enrollments were not completed."
+        elif isinstance(job.info, dict):
+            info = dict(job.info)
+            results_file = info.pop("results_file", None)
+            response.update(info)
+            if results_file and get_reports_storage().exists(results_file):
+                response["results"] = list(read_report_rows(results_file))
+            elif results_file:
+                response["detail"] = "The results of the job have expired."
+
+        return Response(response)
+
+
 class EdxappPreEnrollment(APIView):
     """
     Handles API requests to manage whitelistings (pre-enrollments)
@@ -1133,7 +1568,7 @@ class EdxappGrade(UserQueryMixin, APIView):
         - 404: User, course or enrollment not found.
         """
         user_query = self.get_user_query(request)
-        user = get_edxapp_user(**user_query)
+        user = self.get_edxapp_user(**user_query)
 
         course_id = self.query_params.get("course_id", None)
         detailed = self.query_params.get("detailed", False)
@@ -1149,17 +1584,29 @@ class EdxappGrade(UserQueryMixin, APIView):
 
         grade_factory = get_course_grade_factory()
         course_key = get_valid_course_key(course_id)
-        course = get_courseware_courses().get_course_by_id(course_key)
-        course_grade = grade_factory().read(user, course)
-        response = {"earned_grade": course_grade.percent}
+        course_grade = grade_factory().read(user, course_key=course_key)
+
+        return Response(self._grade_data(
+            course_key,
+            course_grade,
+            detailed=detailed in ("True", "true", "on", "1"),
+            grading_policy=grading_policy in ("True", "true", "on", "1"),
+        ))
 
-        if detailed in ("True", "true", "on", "1"):
-            breakdown = self._section_breakdown(course_grade.subsection_grades)
-            response["section_breakdown"] = breakdown
-        if grading_policy in ("True", "true", "on", "1"):
-            response["grading_policy"] = course.grading_policy
+    def _grade_data(self, course_key, course_grade, detailed=False, grading_policy=False):
+        """
+        Serializes the grade of a user in a course.
 
-        return Response(EdxappGradeSerializer(response).data)
+        The grading policy comes from the grading data cached for the published course.
+        """
+        grade = {"earned_grade": course_grade.percent}
+
+        if detailed:
+            grade["section_breakdown"] = self._section_breakdown(course_grade.subsection_grades)
+        if grading_policy:
+            grade["grading_policy"] = get_course_grading_data(course_key)["grading_policy"]
+
+        return EdxappGradeSerializer(grade).data
 
     def _section_breakdown(self, subsection_grades):
         """
@@ -1198,6 +1645,159 @@ class EdxappGrade(UserQueryMixin, APIView):
         return breakdown
 
 
+class EdxappGradeBatch(EdxappGrade):
+    """
+    Handles API requests to read many course grades at once
+    """
+
+    http_method_names = ["post", "options"]
+
+    @apidocs.schema(
+        body=EdxappGradeBatchSerializer,
+        responses={
+            200: EdxappGradeSerializer(many=True),
+            202: "Some of the grades could not be read.",
+            400: "Bad request, invalid query or too many grades requested.",
+            404: "User not found",
+        },
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Retrieves the grades of many users in a course, or of a user in many courses
+
+        The grades of the users in the same course are read in bulk, so this endpoint should be preferred over many calls to
+        `GET /eox-core/api/v1/grade/`.
+
+        **Example Requests**
+
+            POST /eox-core/api/v1/grade/batch/
+
+            Request data: {
+              "course_id": "course-v1:edX+DemoX+Demo_Course",
+              "users": [{"username": "johndoe"}, {"email": "janedoe@example.com"}],
+              "detailed": true
+            }
+
+            POST /eox-core/api/v1/grade/batch/
+
+            Request data: {
+              "username": "johndoe",
+              "course_ids": ["course-v1:edX+DemoX+Demo_Course", "course-v1:edX+DemoX+Demo_Course_2"]
+            }
+
+        **Parameters**
+
+        - `course_id` and `users`: The course and the list of users, identified by username or email,
+          to read the grades of.
+        - `username` or `email` and `course_ids`: The user and the list of courses to read the grades of.
+        - `detailed` (**optional**, boolean): If true include detailed data for each graded subsection.
+        - `grading_policy` (**optional**, boolean): If true include course grading policy.
+
+        **Response details**
+
+        A list in the same order of the request. Each item has the user identifier and the `course_id`
+        along with the fields returned by `GET /eox-core/api/v1/grade/` or, when the grade could not be
+        read, an `error`.
+
+        **Returns**
+
+        - 200: Success, all the grades were read.
+        - 202: Some of the grades could not be read, check the `error` of each item.
+        - 400: Bad request, invalid query or more grades than `EOX_CORE_GRADES_BATCH_MAX_SIZE`.
+        - 404: User not found.
+        """
+        serializer = EdxappGradeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        options = {"detailed": query["detailed"], "grading_policy": query["grading_policy"]}
+
+        if query.get("course_id"):
+            response_data = self._read_course_grades(query["course_id"], query["users"], **options)
+        else:
+            identifier = {"username": query["username"]} if query.get("username") else {"email": query["email"]}
+            response_data = self._read_user_grades(identifier, query["course_ids"], **options)
+
+        if any("error" in item for item in response_data):
+            return Response(response_data, status=status.HTTP_202_ACCEPTED)
+        return Response(response_data)
+
+    def _read_course_grades(self, course_id, identifiers, **options):
+        """
+        Reads in bulk the grades of the users enrolled in the course.
+        """
+        course_key = get_valid_course_key(course_id)
+        identifiers = [
+            {"username": item["username"]} if item.get("username") else {"email": item["email"]}
+            for item in identifiers
+        ]
+        self.preload_edxapp_users(identifiers)
+
+        response_data = []
+        found_users = []
+        for identifier in identifiers:
+            item = {**identifier, "course_id": course_id}
+            response_data.append(item)
+            try:
+                found_users.append((item, self.get_edxapp_user(**self._user_query(identifier))))
+            except NotFound as error:
+                item["error"] = {"detail": error.detail}
+
+        # The enrollments of all the users are checked with a single query.
+        enrolled_user_ids = set(
+            get_course_enrollment().objects.filter(
+                course_id=course_key,
+                user_id__in={user.id for _, user in found_users},
+            ).values_list("user_id", flat=True)
+        )
+        items_by_user = OrderedDict()
+        for item, user in found_users:
+            if user.id not in enrolled_user_ids:
+                item["error"] = {"detail": [f"No enrollment found for user:`{user.username}`"]}
+                continue
+            items_by_user.setdefault(user.id, (user, []))[1].append(item)
+
+        users = [user for user, _ in items_by_user.values()]
+        for result in get_course_grade_factory()().iter(users, course_key=course_key):
+            for item in items_by_user[result.student.id][1]:
+                if result.error:
+                    item["error"] = {"detail": str(result.error)}
+                else:
+                    item.update(self._grade_data(course_key, result.course_grade, **options))
+
+        return response_data
+
+    def _read_user_grades(self, identifier, course_ids, **options):
+        """
+        Reads the grades of the user in each course.
+        """
+        user = self.get_edxapp_user(**self._user_query(identifier))
+        grade_factory = get_course_grade_factory()()
+
+        response_data = []
+        for course_id in course_ids:
+            item = {**identifier, "course_id": course_id}
+            response_data.append(item)
+
+            _, errors = get_enrollment(username=user.username, course_id=course_id)
+            if errors:
+                item["error"] = {"detail": errors}
+                continue
+
+            course_key = get_valid_course_key(course_id)
+            course_grade = grade_factory.read(user, course_key=course_key)
+            item.update(self._grade_data(course_key, course_grade, **options))
+
+        return response_data
+
+    def _user_query(self, identifier):
+        """
+        Returns the query to retrieve the user of the identifier on the current site.
+        """
+        if self.site:
+            return {"site": self.site, **identifier}
+        return dict(identifier)
+
+
 class UserInfo(APIView):
     """
     Auth-only view to check some basic info about the current user
@@ -12,15 +12,22 @@ from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.site_configuration.helpers import get_all_orgs, get_current_site_orgs
 from rest_framework.serializers import ValidationError
 
+from eox_core.utils import get_request_identity_map
+
 
 def get_valid_course_key(course_id):
     """
     Return the CourseKey if the course_id is valid
     """
-    try:
-        return CourseKey.from_string(course_id)
-    except InvalidKeyError:
-        raise ValidationError(f"Invalid course_id {course_id}") from InvalidKeyError
+    identity_map = get_request_identity_map()
+    course_key = identity_map.get_course_key(course_id)
+    if course_key is None:
+        try:
+            course_key = CourseKey.from_string(course_id)
+        except InvalidKeyError:
+            raise ValidationError(f"Invalid course_id {course_id}") from InvalidKeyError
+        identity_map.add_course_key(course_id, course_key)
+    return course_key
 
 
 def validate_org(course_id):
@@ -37,6 +44,14 @@ def validate_org(course_id):
         return True
 
     course_key = get_valid_course_key(course_id)
+    # The orgs of the sites do not change during a request, so the result is the same for every course of the org.
+    return get_request_identity_map().memoize(('valid_org', course_key.org), _validate_course_org, course_key)
+
+
+def _validate_course_org(course_key):
+    """
+    Validate the organization of the course_key against all possible orgs for the site
+    """
     course_org_filter = getattr(settings, "course_org_filter", [])
     course_org_filter = course_org_filter if isinstance(course_org_filter, list) else [course_org_filter]
     current_site_orgs = get_current_site_orgs() or course_org_filter or []
@@ -2,17 +2,29 @@
 Functions copied from a version higer than hawthorn (for backwards compatibility with it)
 Must be deleted some day and replaced with calls to the actual functions
 """
+import logging
+import time
+
 from django.conf import settings
 # pylint: disable=import-error
 from django.core.cache import cache
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
 from openedx.core.djangoapps.catalog.utils import create_catalog_api_client
 
+LOG = logging.getLogger(__name__)
+PROGRAM_CACHE_KEY_TPL = 'eox_core.programs.api.data.{program_uuid}'
+PROGRAM_REFRESH_LOCK_KEY_TPL = 'eox_core.programs.api.refresh_lock.{program_uuid}'
+PROGRAM_REFRESH_LOCK_TIMEOUT = 30
+
 
 def get_program(program_uuid, ignore_cache=False):
     """
     Retrieves the details for the specified program.
 
+    A program is fresh for PROGRAMS_CACHE_TTL seconds. After that, the first caller
+    refreshes it from the catalog while the rest keep getting the stale copy, which
+    is kept for EOX_CORE_PROGRAMS_STALE_TTL seconds.
+
      Args:
          program_uuid (UUID): Program identifier
          ignore_cache (bool): Indicates if previously-cached data should be ignored.
@@ -21,19 +33,75 @@ def get_program(program_uuid, ignore_cache=False):
          dict
     """
     program_uuid = str(program_uuid)
-    cache_key = f'programs.api.data.{program_uuid}'
 
-    if not ignore_cache:
-        program = cache.get(cache_key)
+    if ignore_cache:
+        return _fetch_program(program_uuid)
 
-        if program:
-            return program
+    cached = cache.get(PROGRAM_CACHE_KEY_TPL.format(program_uuid=program_uuid))
+    if not cached:
+        return _fetch_program(program_uuid)
+    if cached['fresh_until'] > time.time():
+        return cached['program']
+
+    lock_key = PROGRAM_REFRESH_LOCK_KEY_TPL.format(program_uuid=program_uuid)
+    if not cache.add(lock_key, True, PROGRAM_REFRESH_LOCK_TIMEOUT):
+        return cached['program']
+    try:
+        return _fetch_program(program_uuid)
+    except Exception:  # pylint: disable=broad-except
+        LOG.exception('Could not refresh the program %s, using the cached copy', program_uuid)
+        return cached['program']
+    finally:
+        cache.delete(lock_key)
 
-    catalog_integration = CatalogIntegration.current()
-    user = catalog_integration.get_service_user()
-    api = create_catalog_api_client(user)
 
-    program = api.programs(program_uuid).get()
-    cache.set(cache_key, program, getattr(settings, 'PROGRAMS_CACHE_TTL', 60))
+def get_program_uuids():
+    """
+    Retrieves the uuids of all the programs of the catalog.
+    """
+    return _get_catalog_api().programs.get(uuids_only=1)
+
 
+def prefetch_programs(program_uuids=None):
+    """
+    Retrieves the given programs, or all of them, from the catalog and caches them.
+
+     Returns:
+         tuple: The uuids of the programs cached and the ones that failed.
+    """
+    cached_uuids = []
+    failed_uuids = []
+    for program_uuid in program_uuids or get_program_uuids():
+        try:
+            get_program(program_uuid, ignore_cache=True)
+        except Exception:  # pylint: disable=broad-except
+            LOG.exception('Could not prefetch the program %s', program_uuid)
+            failed_uuids.append(str(program_uuid))
+        else:
+            cached_uuids.append(str(program_uuid))
+    return cached_uuids, failed_uuids
+
+
+def _fetch_program(program_uuid):
+    """
+    Retrieves the program from the catalog and caches it.
+    """
+    program = _get_catalog_api().programs(program_uuid).get()
+    cache.set(
+        PROGRAM_CACHE_KEY_TPL.format(program_uuid=program_uuid),
+        {
+            'program': program,
+            'fresh_until': time.time() + getattr(settings, 'PROGRAMS_CACHE_TTL', 60),
+        },
+        getattr(settings, 'PROGRAMS_CACHE_TTL', 60) + getattr(settings, 'EOX_CORE_PROGRAMS_STALE_TTL', 86400),
+    )
     return program
+
+
+def _get_catalog_api():
+    """
+    Returns a catalog api client for the catalog service user.
+    """
+    catalog_integration = CatalogIntegration.current()
+    user = catalog_integration.get_service_user()
+    return create_catalog_api_client(user)
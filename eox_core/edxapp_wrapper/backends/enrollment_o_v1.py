@@ -5,11 +5,15 @@ Backend for the create_edxapp_user that works under the open-release/lilac.maste
 """
 # pylint: disable=import-error, protected-access
 import datetime
+import json
 import logging
 
 from common.djangoapps.course_modes.models import CourseMode
 from common.djangoapps.student.models import CourseEnrollment
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
@@ -22,9 +26,13 @@ from openedx.core.lib.exceptions import CourseNotFoundError
 from pytz import utc
 from rest_framework.exceptions import APIException, NotFound
 
-from eox_core.edxapp_wrapper.backends.edxfuture_o_v1 import get_program
+from eox_core.edxapp_wrapper.backends.edxfuture_o_v1 import (  # pylint: disable=unused-import
+    get_program,
+    prefetch_programs,
+)
 from eox_core.edxapp_wrapper.coursekey import get_valid_course_key, validate_org
 from eox_core.edxapp_wrapper.users import check_edxapp_account_conflicts
+from eox_core.utils import fasthash, get_request_identity_map
 
 LOG = logging.getLogger(__name__)
 
@@ -226,6 +234,9 @@ def _enroll_on_course(user, course_id, *args, **kwargs):
 def _enroll_on_program(user, program_uuid, *arg, **kwargs):
     """
     enroll user on each of the courses of a program
+
+    The enrollment of each course is committed on its own, the changes of a
+    course that fails are rolled back without affecting the others.
     """
     results = []
     errors = []
@@ -236,38 +247,68 @@ def _enroll_on_program(user, program_uuid, *arg, **kwargs):
         raise NotFound(repr(err)) from err
     if not data['courses']:
         raise NotFound("No courses found for this program")
-    for course in data['courses']:
-        if course['course_runs']:
-            course_run = _get_preferred_course_run(course)
-            LOG.info('Enrolling on course_run: %s', course_run['key'])
-            course_id = course_run['key']
-            try:
+
+    for course_id in _get_program_course_runs(program_uuid, data['courses']):
+        LOG.info('Enrolling on course_run: %s', course_id)
+        try:
+            with transaction.atomic():
                 result, errors_list = _enroll_on_course(user, course_id, *arg, **kwargs)
-            except APIException as error:
-                result = {
-                    'username': user.username,
-                    'mode': None,
-                    'course_id': course_id,
-                }
-                errors_list = [error.detail]
-
-            results.append(result)
-            errors.append(errors_list)
-        else:
-            raise NotFound("No course runs available for this course")
+        except APIException as error:
+            result = {
+                'username': user.username,
+                'mode': None,
+                'course_id': course_id,
+            }
+            errors_list = [error.detail]
+
+        results.append(result)
+        errors.append(errors_list)
     return results, errors
 
 
-def _get_preferred_course_run(course):
+def _get_program_course_runs(program_uuid, courses):
+    """
+    Returns the key of the preferred course run of each course of a program
+
+    The result is cached for the course runs published for the program, so it is
+    computed again as soon as the program changes or the cache expires.
+    """
+    if not all(course['course_runs'] for course in courses):
+        raise NotFound("No course runs available for this course")
+
+    program_runs = [[run['key'], str(run['start'])] for course in courses for run in course['course_runs']]
+    cache_key = f'eox_core.programs.course_runs.{program_uuid}.{fasthash(json.dumps(program_runs))}'
+    course_ids = cache.get(cache_key)
+    if course_ids is None:
+        course_overviews = _get_course_overviews([run_key for run_key, _ in program_runs])
+        course_ids = [_get_preferred_course_run(course, course_overviews)['key'] for course in courses]
+        cache.set(cache_key, course_ids, getattr(settings, 'EOX_CORE_PROGRAM_COURSE_RUNS_CACHE_TTL', 300))
+    return course_ids
+
+
+def _get_course_overviews(course_run_keys):
+    """
+    Returns the course overviews of the given course runs by their key, in a single query
+    """
+    course_keys = [CourseKey.from_string(run_key) for run_key in course_run_keys]
+    return {
+        str(course_overview.id): course_overview
+        for course_overview in CourseOverview.objects.filter(id__in=course_keys)
+    }
+
+
+def _get_preferred_course_run(course, course_overviews=None):
     """
     Returns the course run more likely to be the intended one
     """
+    course_overviews = course_overviews or {}
     sorted_course_runs = sorted(course['course_runs'], key=lambda run: run['start'])
 
     for run in sorted_course_runs:
         default_enrollment_start_date = datetime.datetime(1900, 1, 1, tzinfo=utc)
-        course_run_key = CourseKey.from_string(run['key'])
-        course_overview = CourseOverview.get_from_id(course_run_key)
+        course_overview = course_overviews.get(run['key'])
+        if course_overview is None:
+            course_overview = CourseOverview.get_from_id(CourseKey.from_string(run['key']))
         enrollment_end = course_overview.enrollment_end or datetime.datetime.max.replace(tzinfo=utc)
         enrollment_start = course_overview.enrollment_start or default_enrollment_start_date
         run['is_enrollment_open'] = enrollment_start <= datetime.datetime.now(utc) < enrollment_end
@@ -297,7 +338,9 @@ def check_edxapp_enrollment_is_valid(*args, **kwargs):
         return ['You have to provide a course_id or bundle_id']
     if not email and not username:
         return ['Email or username needed']
-    if not check_edxapp_account_conflicts(email=email, username=username):
+    # A user already resolved in this request exists, there is no need to look it up again.
+    resolved_user = get_request_identity_map().get_user(username=username, email=email)
+    if not resolved_user and not check_edxapp_account_conflicts(email=email, username=username):
         return ['User not found']
     if mode not in CourseMode.ALL_MODES:
         return ['Invalid mode given:' + mode]
@@ -305,15 +348,30 @@ def check_edxapp_enrollment_is_valid(*args, **kwargs):
         if not validate_org(course_id):
             errors.append('Enrollment not allowed for given org')
     if course_id and not force:
-        try:
-            api.validate_course_mode(course_id, mode, is_active=is_active)
-        except CourseModeNotFoundError:
-            errors.append('Mode not found')
-        except CourseNotFoundError:
-            errors.append('Course not found')
+        # Every enrollment of a bulk request on the same course and mode gets the same result.
+        errors += get_request_identity_map().memoize(
+            ('course_mode_errors', course_id, mode, is_active),
+            _get_course_mode_errors,
+            course_id,
+            mode,
+            is_active,
+        )
     return errors
 
 
+def _get_course_mode_errors(course_id, mode, is_active):
+    """
+    Validate that the mode is available for the course
+    """
+    try:
+        api.validate_course_mode(course_id, mode, is_active=is_active)
+    except CourseModeNotFoundError:
+        return ['Mode not found']
+    except CourseNotFoundError:
+        return ['Course not found']
+    return []
+
+
 def _create_or_update_enrollment(username, course_id, mode, is_active, try_update):
     """
     non-forced create or update enrollment internal function
@@ -334,7 +392,7 @@ def _force_create_enrollment(username, course_id, mode, is_active):
     """
     try:
         course_key = get_valid_course_key(course_id)
-        user = User.objects.get(username=username)
+        user = get_request_identity_map().get_user(username=username) or User.objects.get(username=username)
         enrollment = CourseEnrollment.enroll(user, course_key, check_access=False)
         api._data_api()._update_enrollment(enrollment, is_active=is_active, mode=mode)
     except Exception as err:  # pylint: disable=broad-except
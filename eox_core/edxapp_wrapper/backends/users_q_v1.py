@@ -4,6 +4,9 @@
 Quince backend for users module
 """
 import logging
+import operator
+from collections import defaultdict
+from functools import lru_cache, reduce
 
 from common.djangoapps.student.helpers import (  # pylint: disable=import-error,no-name-in-module
     create_or_set_user_attribute_created_on_site,
@@ -26,6 +29,7 @@ from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from edx_django_utils.user import generate_password  # pylint: disable=import-error,unused-import
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY  # pylint: disable=import-error
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers  # pylint: disable=import-error
@@ -51,6 +55,7 @@ from social_django.models import UserSocialAuth  # pylint: disable=import-error
 
 LOG = logging.getLogger(__name__)
 User = get_user_model()  # pylint: disable=invalid-name
+UNFILTERED_SOURCE = 'fetch_from_unfiltered_table'
 
 
 def get_user_read_only_serializer():
@@ -254,17 +259,66 @@ def get_edxapp_user(**kwargs):
         domain = None
 
     try:
-        user = User.objects.get(**params)
-        for source_method in FetchUserSiteSources.get_enabled_source_methods():
-            if source_method(user, domain):
-                break
-        else:
+        membership = FetchUserSiteSources.get_membership_filter(domain)
+        if membership is None:
             raise User.DoesNotExist
+        user = User.objects.get(membership, **params)
     except User.DoesNotExist:
         raise NotFound(f'No user found by {str(params)} on site {domain}.') from User.DoesNotExist
     return user
 
 
+def get_edxapp_users(identifiers, site=None):
+    """
+    Retrieve many users of the site by username or email in a single query
+
+    Each identifier is a dict with the same `username` or `email` keys used by
+    get_edxapp_user, where the username prevails over the email. The result is
+    a list aligned with the identifiers holding the user found for each one, or
+    None when no user of the calling site matches it.
+
+    Examples:
+        >>> get_edxapp_users(
+            [{"username": "Bob"}, {"email": "alice@mailserver.com"}],
+            site=request.site,
+        )
+    """
+    try:
+        domain = site.domain
+    except AttributeError:
+        domain = None
+
+    usernames = {item["username"] for item in identifiers if item.get("username")}
+    emails = {item["email"] for item in identifiers if not item.get("username") and item.get("email")}
+    membership = FetchUserSiteSources.get_membership_filter(domain)
+    if membership is None or (not usernames and not emails):
+        return [None] * len(identifiers)
+
+    users = User.objects.filter(
+        Q(username__in=usernames) | Q(email__in=emails),
+        membership,
+    ).select_related("profile")
+
+    # The database collation may match usernames and emails ignoring the case.
+    users_by_username = {}
+    users_by_lower_username = {}
+    users_by_email = defaultdict(list)
+    for user in users:
+        users_by_username[user.username] = user
+        users_by_lower_username.setdefault(user.username.lower(), user)
+        users_by_email[user.email.lower()].append(user)
+
+    results = []
+    for item in identifiers:
+        username = item.get("username")
+        if username:
+            results.append(users_by_username.get(username) or users_by_lower_username.get(username.lower()))
+            continue
+        matches = users_by_email.get((item.get("email") or "").lower(), [])
+        results.append(matches[0] if len(matches) == 1 else None)
+    return results
+
+
 def permanently_delete_user(*args, **kwargs):
     """Hard deletes a user from the platform.
 
@@ -379,20 +433,83 @@ def get_course_team_user(*args, **kwargs):
     return None
 
 
+@lru_cache(maxsize=128)
+def get_membership_sources(sources):
+    """
+    Normalize the sources configured to check if an user belongs to a site.
+
+    The result is memoized by the configured value, so it is only computed again
+    when the site configuration changes. Repeated sources are dropped and so are
+    the ones after a source that accepts every user.
+    """
+    membership_sources = []
+    for source in sources:
+        if source in membership_sources:
+            continue
+        membership_sources.append(source)
+        if source == UNFILTERED_SOURCE:
+            break
+    return tuple(membership_sources)
+
+
 class FetchUserSiteSources:
     """
     Methods to make the comparison to check if an user belongs to a site plus the
     get_enabled_source_methods that just brings an array of functions enabled to do so
     """
 
+    @staticmethod
+    def get_enabled_sources():
+        """ Brings the names of the sources used to check if an user belongs to a site. """
+        return get_membership_sources(tuple(configuration_helpers.get_value(
+            'EOX_CORE_USER_ORIGIN_SITE_SOURCES',
+            getattr(settings, 'EOX_CORE_USER_ORIGIN_SITE_SOURCES')
+        )))
+
     @classmethod
     def get_enabled_source_methods(cls):
         """ Brings the array of methods to check if an user belongs to a site. """
-        sources = configuration_helpers.get_value(
-            'EOX_CORE_USER_ORIGIN_SITE_SOURCES',
-            getattr(settings, 'EOX_CORE_USER_ORIGIN_SITE_SOURCES')
-        )
-        return [getattr(cls, source) for source in sources]
+        return [getattr(cls, source) for source in cls.get_enabled_sources()]
+
+    @classmethod
+    def get_membership_filter(cls, domain):
+        """
+        Build a single filter over the User model matching the members of the site.
+
+        Every enabled source contributes an EXISTS condition, so checking all of them
+        takes one query. An empty Q is returned when every user belongs to the site and
+        None when no user can belong to it.
+        """
+        conditions = []
+        for source in cls.get_enabled_sources():
+            if source == UNFILTERED_SOURCE:
+                return Q()
+            condition = getattr(cls, f"filter_{source}")(domain)
+            if condition is not None:
+                conditions.append(Q(condition))
+        if not conditions:
+            return None
+        return reduce(operator.or_, conditions)
+
+    @classmethod
+    def is_site_member(cls, user, domain):
+        """ Check in one query if the user belongs to the site. """
+        membership = cls.get_membership_filter(domain)
+        if membership is None or not user:
+            return False
+        if not membership:
+            return True
+        return User.objects.filter(membership, pk=user.pk).exists()
+
+    @classmethod
+    def get_site_member_ids(cls, user_ids, domain):
+        """ Return in one query the subset of user_ids that belong to the site. """
+        membership = cls.get_membership_filter(domain)
+        if membership is None or not user_ids:
+            return set()
+        if not membership:
+            return set(user_ids)
+        return set(User.objects.filter(membership, pk__in=user_ids).values_list('pk', flat=True))
 
     @staticmethod
     def fetch_from_created_on_site_prop(user, domain):
@@ -404,13 +521,32 @@ class FetchUserSiteSources:
     @staticmethod
     def fetch_from_user_signup_source(user, domain):
         """ Read the signup source. """
-        return len(UserSignupSource.objects.filter(user=user, site=domain)) > 0
+        return UserSignupSource.objects.filter(user=user, site=domain).exists()
 
     @staticmethod
     def fetch_from_unfiltered_table(user, site):
         """ Fetch option that does not take into account the multi-tentancy model of the installation. """
         return bool(user)
 
+    @staticmethod
+    def filter_fetch_from_created_on_site_prop(domain):
+        """ Condition version of fetch_from_created_on_site_prop. """
+        if not domain:
+            return None
+        return Exists(UserAttribute.objects.filter(
+            user_id=OuterRef('pk'),
+            name='created_on_site',
+            value=domain,
+        ))
+
+    @staticmethod
+    def filter_fetch_from_user_signup_source(domain):
+        """ Condition version of fetch_from_user_signup_source. """
+        return Exists(UserSignupSource.objects.filter(
+            user_id=OuterRef('pk'),
+            site=domain,
+        ))
+
 
 def get_course_enrollment():
     """ get CourseEnrollment model """
@@ -16,6 +16,13 @@ def get_edxapp_user(**kwargs):
     return Mock()
 
 
+def get_edxapp_users(identifiers, site=None):
+    """
+    Return a fake user for every identifier
+    """
+    return [Mock() for _ in identifiers]
+
+
 def create_edxapp_user(*args, **kwargs):
     """
     Return a fake user and a list of errors
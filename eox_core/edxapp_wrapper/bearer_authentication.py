@@ -1,15 +1,12 @@
 """
 Authentication definitions.
 """
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def get_bearer_authentication():
     """ Gets BearerAuthentication class. """
-    backend_function = settings.EOX_CORE_BEARER_AUTHENTICATION
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_BEARER_AUTHENTICATION")
 
     return backend.get_bearer_authentication()
 
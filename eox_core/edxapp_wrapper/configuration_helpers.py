@@ -1,11 +1,8 @@
 """ Backend abstraction. """
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def get_configuration_helper(*args, **kwargs):
     """ Get configuration helper module """
-    backend_function = settings.EOX_CORE_CONFIGURATION_HELPER_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_CONFIGURATION_HELPER_BACKEND")
     return backend.get_configuration_helper(*args, **kwargs)
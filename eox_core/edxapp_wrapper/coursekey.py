@@ -4,9 +4,7 @@
 CourseKey public function definitions
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def get_valid_course_key(course_id):
@@ -14,8 +12,7 @@ def get_valid_course_key(course_id):
     Return a valid CourseKey for the given course_id
     """
 
-    backend_function = settings.EOX_CORE_COURSEKEY_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_COURSEKEY_BACKEND")
 
     return backend.get_valid_course_key(course_id)
 
@@ -25,7 +22,6 @@ def validate_org(course_id):
     Return a valid CourseKey for the given course_id
     """
 
-    backend_function = settings.EOX_CORE_COURSEKEY_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_COURSEKEY_BACKEND")
 
     return backend.validate_org(course_id)
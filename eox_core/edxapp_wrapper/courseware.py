@@ -2,15 +2,12 @@
 Courseware definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def get_courseware_courses():
     """ Gets courses. """
 
-    backend_function = settings.EOX_CORE_COURSEWARE_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_COURSEWARE_BACKEND")
 
     return backend.get_courseware_courses()
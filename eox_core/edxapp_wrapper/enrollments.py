@@ -4,16 +4,13 @@
 Users public function definitions
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def create_enrollment(*args, **kwargs):
     """ Creates the edxapp user """
 
-    backend_function = settings.EOX_CORE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
 
     return backend.create_enrollment(*args, **kwargs)
 
@@ -21,8 +18,7 @@ def create_enrollment(*args, **kwargs):
 def update_enrollment(*args, **kwargs):
     """ Update enrollments on edxapp """
 
-    backend_function = settings.EOX_CORE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
 
     return backend.update_enrollment(*args, **kwargs)
 
@@ -30,8 +26,7 @@ def update_enrollment(*args, **kwargs):
 def get_enrollment(*args, **kwargs):
     """ Get enrollments on edxapp """
 
-    backend_function = settings.EOX_CORE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
 
     return backend.get_enrollment(*args, **kwargs)
 
@@ -39,17 +34,23 @@ def get_enrollment(*args, **kwargs):
 def delete_enrollment(*args, **kwargs):
     """ Delete enrollments on edxapp """
 
-    backend_function = settings.EOX_CORE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
 
     return backend.delete_enrollment(*args, **kwargs)
 
 
+def prefetch_programs(*args, **kwargs):
+    """ Caches the programs used for bundle enrollments """
+
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
+
+    return backend.prefetch_programs(*args, **kwargs)
+
+
 # pylint: disable=invalid-name
 def check_edxapp_enrollment_is_valid(*args, **kwargs):
     """ Checks the db for accounts with the same email or password """
 
-    backend_function = settings.EOX_CORE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_ENROLLMENT_BACKEND")
 
     return backend.check_edxapp_enrollment_is_valid(*args, **kwargs)
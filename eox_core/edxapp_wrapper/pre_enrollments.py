@@ -4,9 +4,7 @@
 Pre-enrollment public function definitions
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from eox_core.edxapp_wrapper.registry import get_backend
 
 
 def create_pre_enrollment(*args, **kwargs):
@@ -14,8 +12,7 @@ def create_pre_enrollment(*args, **kwargs):
     Create a pre-enrollment for an existing or future user
     """
 
-    backend_function = settings.EOX_CORE_PRE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_PRE_ENROLLMENT_BACKEND")
 
     return backend.create_pre_enrollment(*args, **kwargs)
 
@@ -25,8 +22,7 @@ def update_pre_enrollment(*args, **kwargs):
     Update a pre-enrollment for an existing or future user
     """
 
-    backend_function = settings.EOX_CORE_PRE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_PRE_ENROLLMENT_BACKEND")
 
     return backend.update_pre_enrollment(*args, **kwargs)
 
@@ -36,8 +32,7 @@ def delete_pre_enrollment(*args, **kwargs):
     Delete a pre-enrollment for an existing or future user
     """
 
-    backend_function = settings.EOX_CORE_PRE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_PRE_ENROLLMENT_BACKEND")
 
     return backend.delete_pre_enrollment(*args, **kwargs)
 
@@ -47,7 +42,6 @@ def get_pre_enrollment(*args, **kwargs):
     Get a pre-enrollment for an existing or future user
     """
 
-    backend_function = settings.EOX_CORE_PRE_ENROLLMENT_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("EOX_CORE_PRE_ENROLLMENT_BACKEND")
 
     return backend.get_pre_enrollment(*args, **kwargs)
@@ -0,0 +1,47 @@
+"""
+Registry of the resolved edxapp backends.
+
+The public wrappers ask the registry for the backend module configured in a
+setting. The module is imported only the first time and the resolved module is
+reused by every later call, until the setting changes (e.g. with
+override_settings in tests) or reset_backends is called.
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_backends = {}
+
+
+def get_backend(setting_name):
+    """
+    Return the backend module configured in the given setting.
+    """
+    try:
+        return _backends[setting_name]
+    except KeyError:
+        backend = import_module(getattr(settings, setting_name))
+        _backends[setting_name] = backend
+        return backend
+
+
+def reset_backends(setting_name=None):
+    """
+    Forget the resolved backends so they are imported again on the next call.
+
+    Only the backend of setting_name is forgotten when it is given.
+    """
+    if setting_name is None:
+        _backends.clear()
+    else:
+        _backends.pop(setting_name, None)
+
+
+@receiver(setting_changed)
+def reset_changed_backend(setting, **kwargs):  # pylint: disable=unused-argument
+    """
+    Reload the backend of a setting changed at runtime.
+    """
+    reset_backends(setting)
@@ -6,19 +6,26 @@ from django.conf import settings
 from django.test import TestCase
 
 from ..enrollments import create_enrollment
+from ..registry import reset_backends
 
 
 class CreateEdxappUserTest(TestCase):
     """ Tests for the public API module """
 
-    @mock.patch('eox_core.edxapp_wrapper.enrollments.import_module')
+    def setUp(self):
+        """ setup """
+        super().setUp()
+        reset_backends()
+        self.addCleanup(reset_backends)
+
+    @mock.patch('eox_core.edxapp_wrapper.registry.import_module')
     def test_import_the_backend(self, m_import):
         """ Test we import the correct backend defined in the settings """
 
         create_enrollment()
         m_import.assert_called_with(settings.EOX_CORE_ENROLLMENT_BACKEND)
 
-    @mock.patch('eox_core.edxapp_wrapper.enrollments.import_module')
+    @mock.patch('eox_core.edxapp_wrapper.registry.import_module')
     def test_call_the_backend(self, m_import):
         """ Test we use the imported backend """
         m_enrollment_backend = mock.MagicMock()
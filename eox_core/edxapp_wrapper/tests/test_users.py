@@ -5,20 +5,27 @@ import mock
 from django.conf import settings
 from django.test import TestCase
 
+from ..registry import reset_backends
 from ..users import create_edxapp_user
 
 
 class CreateEdxappUserTest(TestCase):
     """ Tests for the public API module """
 
-    @mock.patch('eox_core.edxapp_wrapper.users.import_module')
+    def setUp(self):
+        """ setup """
+        super().setUp()
+        reset_backends()
+        self.addCleanup(reset_backends)
+
+    @mock.patch('eox_core.edxapp_wrapper.registry.import_module')
     def test_import_the_backend(self, m_import):
         """ Test we import the correct backend defined in the settings """
 
         create_edxapp_user()
         m_import.assert_called_with(settings.EOX_CORE_USERS_BACKEND)
 
-    @mock.patch('eox_core.edxapp_wrapper.users.import_module')
+    @mock.patch('eox_core.edxapp_wrapper.registry.import_module')
     def test_call_the_backend(self, m_import):
         """ Test we use the imported backend """
         m_user_backend = mock.MagicMock()
@@ -0,0 +1,61 @@
+"""
+Course level grading data shared by the grades endpoints.
+
+The data only changes when the course is published, so it is cached by course
+key and published version. The version is the modification time of the course
+overview, which the platform writes to the shared database on every publish,
+so every service sees a new version as soon as the course is published and the
+previous entries are left to expire on their own.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from eox_core.edxapp_wrapper.courses import get_course_overview
+from eox_core.edxapp_wrapper.courseware import get_courseware_courses
+
+GRADING_DATA_CACHE_KEY_TPL = "eox_core.grading.data.{course_key}.{version}"
+
+
+def get_course_grading_data(course_key):
+    """
+    Return the grading data of the course: its grading policy with the grader
+    configuration and the grade cutoffs, and the metadata of its subsections.
+
+    The modulestore is only used the first time the data of a published version is requested.
+    """
+    version = get_course_published_version(course_key)
+    cache_key = GRADING_DATA_CACHE_KEY_TPL.format(course_key=course_key, version=version)
+    grading_data = cache.get(cache_key) if version else None
+    if grading_data is None:
+        grading_data = load_course_grading_data(course_key)
+        if version:
+            cache.set(cache_key, grading_data, getattr(settings, "EOX_CORE_COURSE_GRADING_DATA_CACHE_TTL", 86400))
+    return grading_data
+
+
+def get_course_published_version(course_key):
+    """
+    Return the published version of the course, None when it has no course overview yet.
+    """
+    modified = get_course_overview().objects.filter(id=course_key).values_list("modified", flat=True).first()
+    return f"{modified:%Y%m%d%H%M%S%f}" if modified else None
+
+
+def load_course_grading_data(course_key):
+    """
+    Read the grading data of the course from the modulestore.
+    """
+    course = get_courseware_courses().get_course_by_id(course_key, depth=2)
+    return {
+        "grading_policy": course.grading_policy,
+        "subsections": [
+            {
+                "location": str(subsection.location),
+                "display_name": subsection.display_name,
+                "format": subsection.format,
+                "graded": subsection.graded,
+            }
+            for section in course.get_children()
+            for subsection in section.get_children()
+        ],
+    }
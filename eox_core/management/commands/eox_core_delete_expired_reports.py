@@ -0,0 +1,23 @@
+"""
+Management command to delete the expired data-api reports.
+"""
+from django.core.management.base import BaseCommand
+
+from eox_core.api.data.v1.reports import delete_expired_reports
+
+
+class Command(BaseCommand):
+    """
+    Delete the data-api report files older than EOX_CORE_DATA_API_REPORTS_TTL
+    seconds, along with the parts left by failed reports.
+
+    Meant to be run periodically, e.g. from a cron job.
+    """
+    help = "Delete the expired data-api reports from the storage."
+
+    def handle(self, *args, **options):
+        deleted = delete_expired_reports()
+
+        for name in deleted:
+            self.stdout.write(f"{name}: deleted")
+        self.stdout.write(f"Deleted {len(deleted)} expired reports.")
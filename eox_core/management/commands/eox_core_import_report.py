@@ -0,0 +1,65 @@
+"""
+Management command to report how long it takes to import the eox-core modules.
+"""
+import sys
+import time
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+
+# Modules loaded by the platform on worker boot or by most management commands.
+DEFAULT_MODULES = [
+    "eox_core.utils",
+    "eox_core.middleware",
+    "eox_core.pipeline",
+    "eox_core.api.v1.serializers",
+]
+
+
+class Command(BaseCommand):
+    """
+    Import the given modules one by one and report the time spent and the
+    number of modules pulled in by each one.
+
+    Modules already imported by the running process are reported as such, so
+    the command is more accurate when run before anything else uses eox-core.
+    """
+    help = "Report the import time of the eox-core modules."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules",
+            nargs="*",
+            default=DEFAULT_MODULES,
+            help="Dotted paths of the modules to import.",
+        )
+        parser.add_argument(
+            "--show-modules",
+            action="store_true",
+            help="List the modules imported as a side effect of each module.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0.0
+        for module_name in options["modules"]:
+            if module_name in sys.modules:
+                self.stdout.write(f"{module_name}: already imported")
+                continue
+
+            loaded_modules = set(sys.modules)
+            start = time.perf_counter()
+            try:
+                import_module(module_name)
+            except ImportError as error:
+                self.stderr.write(f"{module_name}: could not be imported ({error})")
+                continue
+            elapsed = time.perf_counter() - start
+            total += elapsed
+
+            new_modules = sorted(set(sys.modules) - loaded_modules - {module_name})
+            self.stdout.write(f"{module_name}: {elapsed * 1000:.1f} ms, {len(new_modules)} modules pulled in")
+            if options["show_modules"]:
+                for new_module in new_modules:
+                    self.stdout.write(f"    {new_module}")
+
+        self.stdout.write(f"Total: {total * 1000:.1f} ms")
@@ -0,0 +1,34 @@
+"""
+Management command to warm up the cache of the programs used for bundle enrollments.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from eox_core.edxapp_wrapper.enrollments import prefetch_programs
+
+
+class Command(BaseCommand):
+    """
+    Fetch the given programs, or every program of the catalog, and store them
+    in the cache so bundle enrollments never wait for the catalog service.
+
+    Meant to be run periodically, e.g. from a cron job, more often than
+    PROGRAMS_CACHE_TTL + EOX_CORE_PROGRAMS_STALE_TTL.
+    """
+    help = "Fetch the catalog programs and store them in the cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "program_uuids",
+            nargs="*",
+            help="UUIDs of the programs to prefetch. All the programs of the catalog by default.",
+        )
+
+    def handle(self, *args, **options):
+        cached_uuids, failed_uuids = prefetch_programs(options["program_uuids"] or None)
+
+        for program_uuid in failed_uuids:
+            self.stderr.write(f"{program_uuid}: could not be fetched")
+        self.stdout.write(f"Cached {len(cached_uuids)} programs, {len(failed_uuids)} failed.")
+
+        if failed_uuids:
+            raise CommandError(f"{len(failed_uuids)} programs could not be prefetched.")
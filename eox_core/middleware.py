@@ -6,20 +6,27 @@ A microsite enables the following features:
 2) Present a landing page with a listing of courses that are specific to the 'brand'
 3) Ability to swap out some branding elements in the website
 """
+import json
 import logging
 import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import six
 from django.conf import settings
 from django.contrib.auth import REDIRECT_FIELD_NAME
 from django.contrib.auth.views import redirect_to_login
-from django.db import IntegrityError
-from django.db.models.signals import post_save
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.http import Http404, HttpResponseRedirect, parse_cookie
 from django.urls import reverse
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from requests.exceptions import HTTPError
 from social_core.exceptions import AuthAlreadyAssociated, AuthFailed, AuthUnreachableProvider
 
@@ -27,7 +34,7 @@ from eox_core.edxapp_wrapper.configuration_helpers import get_configuration_help
 from eox_core.edxapp_wrapper.language_preference import get_language_preference_middleware
 from eox_core.edxapp_wrapper.third_party_auth import get_tpa_exception_middleware
 from eox_core.models import Redirection
-from eox_core.utils import cache, fasthash
+from eox_core.utils import LocalLRUCache, cache, fasthash
 
 LOG = logging.getLogger(__name__)
 
@@ -41,9 +48,223 @@ except ImportError:
     LOG.warning("ImportError while importing %s", EoxTenantAuthException)
 
 
-configuration_helper = get_configuration_helper()  # pylint: disable=invalid-name
-ExceptionMiddleware = get_tpa_exception_middleware()
-LanguagePreferenceMiddleware = get_language_preference_middleware()
+# edx-platform modules are resolved on first use to keep the import of this module cheap.
+configuration_helper = SimpleLazyObject(get_configuration_helper)  # pylint: disable=invalid-name
+
+# Number of distinct redirect configurations compiled per worker. Each tenant
+# (or each new version of a tenant's configuration) uses one slot.
+REDIRECT_RULES_CACHE_SIZE = 256
+
+NAMED_GROUP_REGEX = re.compile(r'(?<!\\)\(\?P<\w+>')
+BACKREFERENCE_REGEX = re.compile(r'\(\?P=|\\[1-9]')
+
+# Per worker cache of the domain redirections, checked before the shared cache.
+local_redirect_cache = LocalLRUCache(  # pylint: disable=invalid-name
+    max_size=getattr(settings, 'EOX_CORE_REDIRECTION_LOCAL_CACHE_SIZE', 1024),
+    timeout=getattr(settings, 'EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL', 30),
+)
+
+REDIRECTIONS_VERSION_KEY = "redirect_cache.version"
+REDIRECTIONS_SNAPSHOT_LOCAL_KEY = "##snapshot"
+
+
+class RedirectionsVersion:
+    """
+    Redirections version last read by the worker from the shared cache.
+
+    The shared version is read again at most once per `timeout` seconds, so the
+    requests answered from the worker cache do not reach the shared cache. A
+    change made by another worker is seen within that interval, as the worker
+    cache entries expire in the same time.
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+
+    def get(self):
+        """
+        Return the known version, reading the shared one when it was checked more than `timeout` seconds ago.
+        """
+        with self._lock:
+            if self._version is not None and time.monotonic() - self._checked_at < self.timeout:
+                return self._version
+        return self.set(read_redirections_version())
+
+    def set(self, version):
+        """
+        Store the version as the one just read from the shared cache and return it.
+        """
+        with self._lock:
+            self._version = version
+            self._checked_at = time.monotonic()
+        return version
+
+    def clear(self):
+        """
+        Forget the known version so the shared one is read on the next call.
+        """
+        with self._lock:
+            self._version = None
+
+
+local_redirections_version = RedirectionsVersion(  # pylint: disable=invalid-name
+    timeout=getattr(settings, 'EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL', 30),
+)
+
+
+class CompiledPathRedirects:
+    """
+    Compiled form of an EDNX_CUSTOM_PATH_REDIRECTS setting.
+
+    All the rules are merged into a single alternation regex in which every
+    rule is wrapped by a group named after its position, so one `match` call
+    finds the first matching rule in configuration order. Rules that can not
+    be merged safely (e.g. because they use backreferences) make the engine
+    fall back to matching the precompiled rules one by one.
+    """
+
+    def __init__(self, redirects):
+        self.rules = []
+        for regex, values in six.iteritems(redirects):
+            if isinstance(values, dict):
+                key = next(iter(values))
+            else:
+                key = values
+            pattern = regex.format(
+                COURSE_ID_PATTERN=settings.COURSE_ID_PATTERN,
+                USERNAME_PATTERN=settings.USERNAME_PATTERN,
+            )
+            self.rules.append((re.compile(pattern), key, values))
+
+        self.matcher = self._build_matcher()
+
+    def _build_matcher(self):
+        """
+        Return the combined regex for all the rules or None if they can not be combined.
+        """
+        alternatives = []
+        for index, (regex_path_match, _, _) in enumerate(self.rules):
+            if BACKREFERENCE_REGEX.search(regex_path_match.pattern):
+                return None
+            # Inner named groups are not needed to pick the rule and would clash between rules.
+            pattern = NAMED_GROUP_REGEX.sub('(?:', regex_path_match.pattern)
+            alternatives.append(f'(?P<rule_{index}>(?:{pattern}))')
+
+        try:
+            return re.compile('|'.join(alternatives))
+        except re.error:
+            return None
+
+    def match(self, path):
+        """
+        Return the (key, values) of the first rule matching the path or None.
+        """
+        if not self.rules:
+            return None
+
+        if self.matcher is not None:
+            path_match = self.matcher.match(path)
+            if not path_match:
+                return None
+            _, key, values = self.rules[int(path_match.lastgroup[len('rule_'):])]
+            return key, values
+
+        for regex_path_match, key, values in self.rules:
+            if regex_path_match.match(path):
+                return key, values
+        return None
+
+
+class RedirectsCache:
+    """
+    Per worker cache of the structures built from a redirects setting.
+
+    The site configuration keeps returning the same setting object until it is
+    loaded again, so the entries are keyed by the identity of that object and a
+    hit is a dict lookup. Every entry keeps a reference to its object, so the
+    id can not be reused by another one while it is cached. A new object is
+    only serialized once, to reuse the structure built for the same content.
+    """
+
+    def __init__(self, build, max_size=REDIRECT_RULES_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_serialized = lru_cache(maxsize=max_size)(
+            lambda serialized_redirects: build(json.loads(serialized_redirects))
+        )
+
+    def get(self, redirects):
+        """
+        Return the structure built for the redirects setting.
+        """
+        key = id(redirects)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is redirects:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        built = self._build_serialized(json.dumps(redirects, default=str))
+        with self._lock:
+            self._entries[key] = (redirects, built)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return built
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+        self._build_serialized.cache_clear()
+
+
+compiled_path_redirects_cache = RedirectsCache(CompiledPathRedirects)  # pylint: disable=invalid-name
+
+
+def get_compiled_path_redirects(redirects):
+    """
+    Return the CompiledPathRedirects for the given EDNX_CUSTOM_PATH_REDIRECTS value.
+
+    The rules are compiled again only when the site configuration returns a new
+    value with a different content.
+    """
+    return compiled_path_redirects_cache.get(redirects)
+
+
+def index_mktg_redirects(redirects):
+    """
+    Build the path index for a MKTG_REDIRECTS value.
+    """
+    index = {}
+    for key, value in six.iteritems(redirects):
+        # Empty values keep the default LMS template, so they never redirect.
+        if not value:
+            continue
+
+        # Strip off html extension to have backwards
+        # compatibility to keys defined with template style.
+        # TODO: validate that the key corresponds to a Marketing path
+        index.setdefault(f"/{key.replace('.html', '')}", value)
+    return index
+
+
+mktg_redirects_index_cache = RedirectsCache(index_mktg_redirects)  # pylint: disable=invalid-name
+
+
+def get_mktg_redirects_index(redirects):
+    """
+    Return a dict mapping normalized request paths to the MKTG_REDIRECTS target.
+
+    Like the custom path rules, the index is rebuilt only when the setting changes.
+    """
+    return mktg_redirects_index_cache.get(redirects)
 
 
 class PathRedirectionMiddleware(MiddlewareMixin):
@@ -80,34 +301,26 @@ class PathRedirectionMiddleware(MiddlewareMixin):
         Redirect the request according to the configured action to take.
         """
         redirects = configuration_helper.get_value("EDNX_CUSTOM_PATH_REDIRECTS", {})
+        if not redirects:
+            return None
 
         path = request.path_info
+        rule = get_compiled_path_redirects(redirects).match(path)
+        if not rule:
+            return None
 
-        for regex, values in six.iteritems(redirects):
-
-            if isinstance(values, dict):
-                key = next(iter(values))
-            else:
-                key = values
-
-            regex_path_match = re.compile(regex.format(
-                COURSE_ID_PATTERN=settings.COURSE_ID_PATTERN,
-                USERNAME_PATTERN=settings.USERNAME_PATTERN,
-            ))
-
-            if regex_path_match.match(path):
-                try:
-                    action = getattr(self, key)
-                    return action(request=request, key=key, values=values, path=path)
-                except Http404:  # we expect 404 to be raised
-                    raise
-                except Exception as error:  # pylint: disable=broad-except
-                    LOG.error("The PathRedirectionMiddleware generated an error at: %s%s",
-                              request.get_host(),
-                              request.get_full_path())
-                    LOG.error(error)
-                    return None
-        return None
+        key, values = rule
+        try:
+            action = getattr(self, key)
+            return action(request=request, key=key, values=values, path=path)
+        except Http404:  # we expect 404 to be raised
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            LOG.error("The PathRedirectionMiddleware generated an error at: %s%s",
+                      request.get_host(),
+                      request.get_full_path())
+            LOG.error(error)
+            return None
 
     def process_mktg_redirect(self, request):
         """
@@ -115,30 +328,23 @@ class PathRedirectionMiddleware(MiddlewareMixin):
         present that match the request path.
         """
         redirects = configuration_helper.get_value("MKTG_REDIRECTS", {})
-        path = request.path_info
-
-        for key, value in six.iteritems(redirects):
-
-            # Strip off html extension to have backwards
-            # compatibility to keys defined with template style.
-            key = key.replace('.html', '')
-            key = f'/{key}'
+        if not redirects:
+            return None
 
-            # Just continue if the path does not match or the redirect value is empty
-            # TODO: validate that the key corresponds to a Marketing path
-            if path != key or not value:
-                continue
+        key = request.path_info
+        value = get_mktg_redirects_index(redirects).get(key)
+        if not value:
+            return None
 
-            try:
-                values = {key: value}
-                return self.redirect_always(key=key, values=values)
-            except Exception as error:  # pylint: disable=broad-except
-                LOG.error("The PathRedirectionMiddleware generated an error at: %s%s",
-                          request.get_host(),
-                          request.get_full_path())
-                LOG.error(error)
-                return None
-        return None
+        try:
+            values = {key: value}
+            return self.redirect_always(key=key, values=values)
+        except Exception as error:  # pylint: disable=broad-except
+            LOG.error("The PathRedirectionMiddleware generated an error at: %s%s",
+                      request.get_host(),
+                      request.get_full_path())
+            LOG.error(error)
+            return None
 
     def login_required(self, request, path, **kwargs):  # pylint: disable=unused-argument
         """
@@ -194,22 +400,51 @@ class PathRedirectionMiddleware(MiddlewareMixin):
         return None
 
 
-class RedirectionsMiddleware(MiddlewareMixin):
+def get_redirections_version():
     """
-    Middleware for Redirecting microsites to other domains or to error pages
+    Return the version of the redirections known by the worker, see RedirectionsVersion.
     """
+    return local_redirections_version.get()
 
-    def process_request(self, request):
-        """
-        This middleware handles redirections and error pages according to the
-        business logic at edunext
-        """
-        if not settings.FEATURES.get('USE_REDIRECTION_MIDDLEWARE', True):
-            return None
 
-        domain = request.META.get('HTTP_HOST', "")
+def read_redirections_version():
+    """
+    Return the current version of the redirections in the shared cache, starting one if there is none yet.
 
-        # First handle the event where a domain has a redirect target
+    Saving or deleting a Redirection sets a new version, so the workers can tell
+    whether their local copies are still valid.
+    """
+    version = cache.get(REDIRECTIONS_VERSION_KEY)  # pylint: disable=maybe-no-member
+    if version is None:
+        version = uuid.uuid4().hex
+        # add keeps the version another worker may have set in the meantime.
+        if not cache.add(REDIRECTIONS_VERSION_KEY, version, None):  # pylint: disable=maybe-no-member
+            version = cache.get(REDIRECTIONS_VERSION_KEY, version)  # pylint: disable=maybe-no-member
+    return version
+
+
+def get_local_redirection(key, version):
+    """
+    Return the value stored in the worker cache under the given redirections version, or None.
+    """
+    entry = local_redirect_cache.get(key)
+    if entry is None or entry[0] != version:
+        return None
+    return entry[1]
+
+
+def get_domain_redirection(domain):
+    """
+    Return the Redirection object for the domain or '##none' if there is no redirection.
+
+    The result is looked up in the worker cache, the shared cache and finally the database.
+    The worker cache entries are only used while the redirections version is the same.
+    """
+    local_cache_key = domain.lower()
+    version = get_redirections_version()
+    target = get_local_redirection(local_cache_key, version)
+
+    if not target:
         cache_key = "redirect_cache." + fasthash(domain)
         target = cache.get(cache_key)  # pylint: disable=maybe-no-member
 
@@ -223,6 +458,59 @@ class RedirectionsMiddleware(MiddlewareMixin):
                 cache_key, target, 5 * 60
             )
 
+        local_redirect_cache.set(local_cache_key, (version, target))
+
+    return target
+
+
+def get_redirections_snapshot():
+    """
+    Return a dict with every Redirection object keyed by its lower-cased domain.
+
+    The whole table is stored under a single cache key that includes the
+    current redirections version, so it is only loaded from the database again
+    after a Redirection changes. While the worker copy is valid, the requests
+    do not reach the shared cache, not even to read the version.
+    """
+    version = get_redirections_version()
+    snapshot = get_local_redirection(REDIRECTIONS_SNAPSHOT_LOCAL_KEY, version)
+    if snapshot is not None:
+        return snapshot
+
+    cache_key = f"redirect_cache.snapshot.{version}"
+    snapshot = cache.get(cache_key)  # pylint: disable=maybe-no-member
+    if snapshot is None:
+        snapshot = {
+            redirection.domain.lower(): redirection
+            for redirection in Redirection.objects.all()  # pylint: disable=no-member
+        }
+        cache.set(cache_key, snapshot, None)  # pylint: disable=maybe-no-member
+
+    local_redirect_cache.set(REDIRECTIONS_SNAPSHOT_LOCAL_KEY, (version, snapshot))
+    return snapshot
+
+
+class RedirectionsMiddleware(MiddlewareMixin):
+    """
+    Middleware for Redirecting microsites to other domains or to error pages
+    """
+
+    def process_request(self, request):
+        """
+        This middleware handles redirections and error pages according to the
+        business logic at edunext
+        """
+        if not settings.FEATURES.get('USE_REDIRECTION_MIDDLEWARE', True):
+            return None
+
+        domain = request.META.get('HTTP_HOST', "")
+
+        # First handle the event where a domain has a redirect target
+        if getattr(settings, 'EOX_CORE_REDIRECTION_SNAPSHOT', False):
+            target = get_redirections_snapshot().get(domain.lower(), '##none')
+        else:
+            target = get_domain_redirection(domain)
+
         if target != '##none':
             # If we are already at the target, just return
             if domain == target.target and request.scheme == target.scheme:  # pylint: disable=no-member
@@ -237,16 +525,32 @@ class RedirectionsMiddleware(MiddlewareMixin):
         return None
 
     @staticmethod
-    @receiver(post_save, sender=Redirection)
+    @receiver([post_save, post_delete], sender=Redirection)
     def clear_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
         """
-        Clear the cached template when the model is saved
+        Clear the cached template when the model is saved or deleted.
+
+        The caches are cleared once the transaction of the change is committed, so
+        no worker can cache the old rows again under the new version. The new
+        redirections version makes every worker drop its local copies once it
+        checks the shared version again, and rebuild the snapshot.
         """
-        cache_key = "redirect_cache." + fasthash(instance.domain)
-        cache.delete(cache_key)  # pylint: disable=maybe-no-member
+        domain = instance.domain
 
+        def clear_redirection_caches():
+            cache_key = "redirect_cache." + fasthash(domain)
+            cache.delete(cache_key)  # pylint: disable=maybe-no-member
+            local_redirect_cache.delete(domain.lower())
 
-class TPAExceptionMiddleware(ExceptionMiddleware):
+            version = uuid.uuid4().hex
+            cache.set(REDIRECTIONS_VERSION_KEY, version, None)  # pylint: disable=maybe-no-member
+            local_redirections_version.set(version)
+            local_redirect_cache.delete(REDIRECTIONS_SNAPSHOT_LOCAL_KEY)
+
+        transaction.on_commit(clear_redirection_caches)
+
+
+class TPAExceptionMiddlewareMixin:
     """Middleware to handle exceptions not catched by Social Django"""
 
     def process_exception(self, request, exception):
@@ -288,7 +592,7 @@ class TPAExceptionMiddleware(ExceptionMiddleware):
         return super().process_exception(request, exception)
 
 
-class UserLanguagePreferenceMiddleware(LanguagePreferenceMiddleware):
+class UserLanguagePreferenceMiddlewareMixin:
     """This Middleware allows the user set the language preference for the site, avoiding the default LANGUAGE_CODE.
 
         The previous behavior was modified here
@@ -307,3 +611,29 @@ class UserLanguagePreferenceMiddleware(LanguagePreferenceMiddleware):
             request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = original_user_language_cookie
 
         return self.get_response(request)
+
+
+# Middlewares extending edx-platform classes, built when they are first accessed.
+LAZY_MIDDLEWARES = {
+    "TPAExceptionMiddleware": (TPAExceptionMiddlewareMixin, get_tpa_exception_middleware),
+    "UserLanguagePreferenceMiddleware": (UserLanguagePreferenceMiddlewareMixin, get_language_preference_middleware),
+}
+
+
+def __getattr__(name):
+    """
+    Build the middlewares that extend edx-platform classes the first time they are accessed.
+
+    Django imports MIDDLEWARE entries with import_string, which ends up here, so the
+    edx-platform base classes are only imported when the middleware is really used.
+    """
+    if name not in LAZY_MIDDLEWARES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    mixin, get_base_class = LAZY_MIDDLEWARES[name]
+    middleware_class = type(name, (mixin, get_base_class()), {
+        "__module__": __name__,
+        "__doc__": mixin.__doc__,
+    })
+    globals()[name] = middleware_class
+    return middleware_class
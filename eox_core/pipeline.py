@@ -5,6 +5,7 @@ import logging
 
 from crum import get_current_request
 from django.db.models.signals import post_save
+from django.utils.functional import SimpleLazyObject
 from social_core.exceptions import AuthFailed, NotAllowedToDisconnect
 
 from eox_core.edxapp_wrapper.users import (
@@ -15,7 +16,7 @@ from eox_core.edxapp_wrapper.users import (
 )
 from eox_core.logging import logging_pipeline_step
 
-UserSignupSource = get_user_signup_source()  # pylint: disable=invalid-name
+UserSignupSource = SimpleLazyObject(get_user_signup_source)  # pylint: disable=invalid-name
 LOG = logging.getLogger(__name__)
 
 
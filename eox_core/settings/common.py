@@ -19,7 +19,7 @@ INSTALLED_APPS = (
 EOX_AUDIT_MODEL_APP = 'eox_audit_model.apps.EoxAuditModelConfig'
 
 
-def plugin_settings(settings):
+def plugin_settings(settings):  # pylint: disable=too-many-statements
     """
     Defines eox-core settings when app is used as a plugin to edx-platform.
     See: https://github.com/openedx/edx-platform/blob/master/openedx/core/djangoapps/plugins/README.rst
@@ -38,6 +38,15 @@ def plugin_settings(settings):
     settings.EOX_CORE_LOAD_PERMISSIONS = True
     settings.DATA_API_DEF_PAGE_SIZE = 1000
     settings.DATA_API_MAX_PAGE_SIZE = 5000
+    settings.EOX_CORE_DATA_API_COUNT_STRATEGY = "exact"
+    settings.EOX_CORE_DATA_API_COUNT_CACHE_TTL = 300
+    settings.EOX_CORE_GRADES_REPORT_CHUNK_SIZE = 500
+    settings.EOX_CORE_DATA_API_REPORTS_STORAGE = None
+    settings.EOX_CORE_DATA_API_REPORTS_PATH = "eox_core/data_api_reports"
+    settings.EOX_CORE_DATA_API_REPORTS_TTL = 604800
+    settings.EOX_CORE_DATA_API_REPORTS_URL_TTL = 3600
+    settings.EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE = 2000
+    settings.EOX_CORE_DATA_API_VALUES_SERIALIZATION = True
     settings.EOX_CORE_COURSES_BACKEND = "eox_core.edxapp_wrapper.backends.courses_h_v1"
     settings.EOX_CORE_COURSEKEY_BACKEND = "eox_core.edxapp_wrapper.backends.coursekey_m_v1"
     settings.EOX_CORE_COURSE_MANAGEMENT_REQUEST_TIMEOUT = 1000
@@ -52,6 +61,17 @@ def plugin_settings(settings):
     settings.EOX_CORE_LANG_PREF_BACKEND = 'eox_core.edxapp_wrapper.backends.lang_pref_middleware_p_v1'
     settings.EOX_CORE_JWT_SIGNED_OAUTH_APP_PUBLIC_KEY = ''
     settings.EOX_CORE_ALLOW_PERMANENT_USER_DELETION = False
+    settings.EOX_CORE_USERS_LOOKUP_MAX_SIZE = 1000
+    settings.EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE = 100
+    settings.EOX_CORE_BULK_ENROLLMENT_ROUTING_KEY = None
+    settings.EOX_CORE_BULK_ENROLLMENT_JOB_TTL = 86400
+    settings.EOX_CORE_PROGRAM_COURSE_RUNS_CACHE_TTL = 300
+    settings.EOX_CORE_PROGRAMS_STALE_TTL = 86400
+    settings.EOX_CORE_GRADES_BATCH_MAX_SIZE = 1000
+    settings.EOX_CORE_COURSE_GRADING_DATA_CACHE_TTL = 86400
+    settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_SIZE = 1024
+    settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL = 30
+    settings.EOX_CORE_REDIRECTION_SNAPSHOT = False
 
     if settings.EOX_CORE_USER_ENABLE_MULTI_TENANCY:
         settings.EOX_CORE_USER_ORIGIN_SITE_SOURCES = [
@@ -15,7 +15,7 @@ except ImportError:
     LOG.error("ImportError while importing %s", ImportError)
 
 
-def plugin_settings(settings):  # pylint: disable=function-redefined
+def plugin_settings(settings):  # pylint: disable=function-redefined, too-many-statements
     """
     Set of plugin settings used by the Open Edx platform.
     More info: https://github.com/openedx/edx-platform/blob/master/openedx/core/djangoapps/plugins/README.rst
@@ -80,6 +80,42 @@ def plugin_settings(settings):  # pylint: disable=function-redefined
         'DATA_API_MAX_PAGE_SIZE',
         settings.DATA_API_MAX_PAGE_SIZE
     )
+    settings.EOX_CORE_DATA_API_COUNT_STRATEGY = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_COUNT_STRATEGY',
+        settings.EOX_CORE_DATA_API_COUNT_STRATEGY
+    )
+    settings.EOX_CORE_DATA_API_COUNT_CACHE_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_COUNT_CACHE_TTL',
+        settings.EOX_CORE_DATA_API_COUNT_CACHE_TTL
+    )
+    settings.EOX_CORE_GRADES_REPORT_CHUNK_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_GRADES_REPORT_CHUNK_SIZE',
+        settings.EOX_CORE_GRADES_REPORT_CHUNK_SIZE
+    )
+    settings.EOX_CORE_DATA_API_REPORTS_STORAGE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_REPORTS_STORAGE',
+        settings.EOX_CORE_DATA_API_REPORTS_STORAGE
+    )
+    settings.EOX_CORE_DATA_API_REPORTS_PATH = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_REPORTS_PATH',
+        settings.EOX_CORE_DATA_API_REPORTS_PATH
+    )
+    settings.EOX_CORE_DATA_API_REPORTS_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_REPORTS_TTL',
+        settings.EOX_CORE_DATA_API_REPORTS_TTL
+    )
+    settings.EOX_CORE_DATA_API_REPORTS_URL_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_REPORTS_URL_TTL',
+        settings.EOX_CORE_DATA_API_REPORTS_URL_TTL
+    )
+    settings.EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE',
+        settings.EOX_CORE_DATA_API_EXPORT_CHUNK_SIZE
+    )
+    settings.EOX_CORE_DATA_API_VALUES_SERIALIZATION = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_DATA_API_VALUES_SERIALIZATION',
+        settings.EOX_CORE_DATA_API_VALUES_SERIALIZATION
+    )
     settings.EOX_CORE_COURSES_BACKEND = getattr(settings, 'ENV_TOKENS', {}).get(
         'EOX_CORE_COURSES_BACKEND',
         settings.EOX_CORE_COURSES_BACKEND
@@ -111,6 +147,51 @@ def plugin_settings(settings):  # pylint: disable=function-redefined
         user_origin_sources
     )
 
+    settings.EOX_CORE_USERS_LOOKUP_MAX_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_USERS_LOOKUP_MAX_SIZE',
+        settings.EOX_CORE_USERS_LOOKUP_MAX_SIZE
+    )
+    settings.EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE',
+        settings.EOX_CORE_BULK_ENROLLMENT_CHUNK_SIZE
+    )
+    settings.EOX_CORE_BULK_ENROLLMENT_ROUTING_KEY = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_BULK_ENROLLMENT_ROUTING_KEY',
+        settings.EOX_CORE_BULK_ENROLLMENT_ROUTING_KEY
+    )
+    settings.EOX_CORE_BULK_ENROLLMENT_JOB_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_BULK_ENROLLMENT_JOB_TTL',
+        settings.EOX_CORE_BULK_ENROLLMENT_JOB_TTL
+    )
+    settings.EOX_CORE_PROGRAM_COURSE_RUNS_CACHE_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_PROGRAM_COURSE_RUNS_CACHE_TTL',
+        settings.EOX_CORE_PROGRAM_COURSE_RUNS_CACHE_TTL
+    )
+    settings.EOX_CORE_PROGRAMS_STALE_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_PROGRAMS_STALE_TTL',
+        settings.EOX_CORE_PROGRAMS_STALE_TTL
+    )
+    settings.EOX_CORE_GRADES_BATCH_MAX_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_GRADES_BATCH_MAX_SIZE',
+        settings.EOX_CORE_GRADES_BATCH_MAX_SIZE
+    )
+    settings.EOX_CORE_COURSE_GRADING_DATA_CACHE_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_COURSE_GRADING_DATA_CACHE_TTL',
+        settings.EOX_CORE_COURSE_GRADING_DATA_CACHE_TTL
+    )
+    settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_SIZE = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_REDIRECTION_LOCAL_CACHE_SIZE',
+        settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_SIZE
+    )
+    settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL',
+        settings.EOX_CORE_REDIRECTION_LOCAL_CACHE_TTL
+    )
+    settings.EOX_CORE_REDIRECTION_SNAPSHOT = getattr(settings, 'ENV_TOKENS', {}).get(
+        'EOX_CORE_REDIRECTION_SNAPSHOT',
+        settings.EOX_CORE_REDIRECTION_SNAPSHOT
+    )
+
     settings.EOX_CORE_APPEND_LMS_MIDDLEWARE_CLASSES = getattr(settings, 'ENV_TOKENS', {}).get(
         'EOX_CORE_APPEND_LMS_MIDDLEWARE_CLASSES',
         settings.EOX_CORE_APPEND_LMS_MIDDLEWARE_CLASSES
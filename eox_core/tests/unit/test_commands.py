@@ -0,0 +1,91 @@
+#!/usr/bin/python
+"""
+Test module for the eox-core management commands.
+"""
+import sys
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from mock import patch
+
+
+class ImportReportCommandTest(TestCase):
+    """
+    Test the eox_core_import_report command.
+    """
+
+    def test_already_imported_module(self):
+        """
+        Test that modules already loaded are not imported again.
+        """
+        out = StringIO()
+
+        call_command("eox_core_import_report", "eox_core.utils", stdout=out)
+
+        self.assertIn("eox_core.utils: already imported", out.getvalue())
+
+    def test_import_report(self):
+        """
+        Test that the import time of a module not loaded yet is reported.
+        """
+        out = StringIO()
+        module_name = "eox_core.api.data.aggregated_collector.queries"
+
+        with patch.dict(sys.modules):
+            sys.modules.pop(module_name, None)
+            call_command("eox_core_import_report", module_name, stdout=out)
+
+        self.assertRegex(out.getvalue(), rf"{module_name}: [\d.]+ ms, \d+ modules pulled in")
+        self.assertIn("Total:", out.getvalue())
+
+
+@patch("eox_core.management.commands.eox_core_prefetch_programs.prefetch_programs")
+class PrefetchProgramsCommandTest(TestCase):
+    """
+    Test the eox_core_prefetch_programs command.
+    """
+
+    def test_prefetch_all_programs(self, prefetch_mock):
+        """
+        Test that every program of the catalog is prefetched when no uuids are given.
+        """
+        prefetch_mock.return_value = (["uuid-1", "uuid-2"], [])
+        out = StringIO()
+
+        call_command("eox_core_prefetch_programs", stdout=out)
+
+        prefetch_mock.assert_called_once_with(None)
+        self.assertIn("Cached 2 programs, 0 failed.", out.getvalue())
+
+    def test_prefetch_failed_programs(self, prefetch_mock):
+        """
+        Test that the command fails when some program could not be prefetched.
+        """
+        prefetch_mock.return_value = (["uuid-1"], ["uuid-2"])
+        out, err = StringIO(), StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command("eox_core_prefetch_programs", "uuid-1", "uuid-2", stdout=out, stderr=err)
+
+        prefetch_mock.assert_called_once_with(["uuid-1", "uuid-2"])
+        self.assertIn("uuid-2: could not be fetched", err.getvalue())
+
+
+class DeleteExpiredReportsCommandTest(TestCase):
+    """
+    Test the eox_core_delete_expired_reports command.
+    """
+
+    @patch("eox_core.management.commands.eox_core_delete_expired_reports.delete_expired_reports")
+    def test_delete_expired_reports(self, delete_mock):
+        """
+        Test that the deleted reports are listed.
+        """
+        delete_mock.return_value = ["eox_core/data_api_reports/task-id.jsonl.gz"]
+        out = StringIO()
+
+        call_command("eox_core_delete_expired_reports", stdout=out)
+
+        self.assertIn("eox_core/data_api_reports/task-id.jsonl.gz: deleted", out.getvalue())
+        self.assertIn("Deleted 1 expired reports.", out.getvalue())
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+"""
+Test module for the course grading data cache.
+"""
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from mock import Mock, patch
+
+from eox_core.grading import get_course_grading_data
+
+
+@patch("eox_core.grading.get_course_overview")
+@patch("eox_core.grading.get_courseware_courses")
+class CourseGradingDataTest(TestCase):
+    """
+    Test the grading data cached by course key and published version.
+    """
+
+    course_key = "course-v1:org+grading+run"
+
+    def setUp(self):
+        """
+        Start every test with an empty cache.
+        """
+        cache.clear()
+
+    @staticmethod
+    def set_published(get_course_overview, modified):
+        """
+        Set the modification time of the course overview, None when there is no overview.
+        """
+        values_list = get_course_overview.return_value.objects.filter.return_value.values_list
+        values_list.return_value.first.return_value = modified
+
+    @staticmethod
+    def set_course(get_courseware_courses, cutoff):
+        """
+        Set the course returned by the modulestore, with a single graded subsection.
+        """
+        subsection = Mock(location="block-v1:org+grading+run+type@sequential+block@hw", display_name="Homework 1",
+                          format="Homework", graded=True)
+        course = get_courseware_courses.return_value.get_course_by_id.return_value
+        course.grading_policy = {"GRADER": [], "GRADE_CUTOFFS": {"Pass": cutoff}}
+        course.get_children.return_value = [Mock(get_children=Mock(return_value=[subsection]))]
+        return course
+
+    def test_grading_data_cached(self, get_courseware_courses, get_course_overview):
+        """
+        Test that the course is only loaded the first time its grading data is requested.
+        """
+        self.set_published(get_course_overview, datetime(2024, 1, 1))
+        self.set_course(get_courseware_courses, 0.5)
+
+        first = get_course_grading_data(self.course_key)
+        second = get_course_grading_data(self.course_key)
+
+        self.assertEqual(first, {
+            "grading_policy": {"GRADER": [], "GRADE_CUTOFFS": {"Pass": 0.5}},
+            "subsections": [{
+                "location": "block-v1:org+grading+run+type@sequential+block@hw",
+                "display_name": "Homework 1",
+                "format": "Homework",
+                "graded": True,
+            }],
+        })
+        self.assertEqual(first, second)
+        get_courseware_courses.return_value.get_course_by_id.assert_called_once_with(self.course_key, depth=2)
+
+    def test_grading_data_read_again_on_publish(self, get_courseware_courses, get_course_overview):
+        """
+        Test that the grading data is read again once the course overview is updated by a publish.
+        """
+        published = datetime(2024, 1, 1)
+        self.set_published(get_course_overview, published)
+        self.set_course(get_courseware_courses, 0.5)
+        get_course_grading_data(self.course_key)
+
+        self.set_course(get_courseware_courses, 0.8)
+        self.set_published(get_course_overview, published + timedelta(seconds=1))
+
+        self.assertEqual(
+            get_course_grading_data(self.course_key)["grading_policy"],
+            {"GRADER": [], "GRADE_CUTOFFS": {"Pass": 0.8}},
+        )
+        self.assertEqual(get_courseware_courses.return_value.get_course_by_id.call_count, 2)
+
+    def test_grading_data_not_cached_without_overview(self, get_courseware_courses, get_course_overview):
+        """
+        Test that the grading data of a course without a course overview is not cached.
+        """
+        self.set_published(get_course_overview, None)
+        self.set_course(get_courseware_courses, 0.5)
+
+        get_course_grading_data(self.course_key)
+        get_course_grading_data(self.course_key)
+
+        self.assertEqual(get_courseware_courses.return_value.get_course_by_id.call_count, 2)
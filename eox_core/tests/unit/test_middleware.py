@@ -2,14 +2,28 @@
 """
 Test module for the custom Middlewares
 """
+import time
+
 import mock
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.http import Http404
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 
-from eox_core.middleware import PathRedirectionMiddleware, RedirectionsMiddleware, UserLanguagePreferenceMiddleware
+from eox_core import middleware
+from eox_core.middleware import (
+    CompiledPathRedirects,
+    PathRedirectionMiddleware,
+    RedirectionsMiddleware,
+    RedirectionsVersion,
+    get_compiled_path_redirects,
+    get_mktg_redirects_index,
+    get_redirections_snapshot,
+    local_redirect_cache,
+    local_redirections_version,
+)
 from eox_core.models import Redirection
+from eox_core.utils import LocalLRUCache, fasthash
 
 
 class PathRedirectionMiddlewareTest(TestCase):
@@ -126,6 +140,116 @@ class PathRedirectionMiddlewareTest(TestCase):
         self.assertIn(target_url, result.url)
 
 
+class MktgRedirectsIndexTest(TestCase):
+    """
+    Testing the MKTG_REDIRECTS path index.
+    """
+
+    def test_index_normalizes_keys(self):
+        """
+        Test that keys are indexed as request paths and empty targets are skipped.
+        """
+        index = get_mktg_redirects_index({
+            "tos.html": "https://example.com/tos",
+            "about.html": "",
+            "contact": "https://example.com/contact",
+        })
+
+        self.assertEqual(index, {
+            "/tos": "https://example.com/tos",
+            "/contact": "https://example.com/contact",
+        })
+
+    def test_first_non_empty_entry_wins(self):
+        """
+        Test that keys normalized to the same path keep the first non empty target.
+        """
+        index = get_mktg_redirects_index({
+            "faq.html": "",
+            "faq": "https://example.com/faq",
+            "contact.html": "https://example.com/contact",
+            "contact": "https://example.com/other",
+        })
+
+        self.assertEqual(index["/faq"], "https://example.com/faq")
+        self.assertEqual(index["/contact"], "https://example.com/contact")
+
+    def test_index_built_once_per_setting(self):
+        """
+        Test that the setting object returned again by the site configuration reuses its index.
+        """
+        redirects = {"tos.html": "https://example.com/tos"}
+        index = get_mktg_redirects_index(redirects)
+
+        with mock.patch('eox_core.middleware.json.dumps') as dumps_mock:
+            self.assertIs(index, get_mktg_redirects_index(redirects))
+
+        dumps_mock.assert_not_called()
+        self.assertIsNot(index, get_mktg_redirects_index({"tos.html": "https://example.com/terms"}))
+
+
+class CompiledPathRedirectsTest(TestCase):
+    """
+    Testing the compiled rule engine used by PathRedirectionMiddleware.
+    """
+
+    def test_first_matching_rule_wins(self):
+        """
+        Test that rules are evaluated in configuration order.
+        """
+        engine = CompiledPathRedirects({
+            "/courses/{COURSE_ID_PATTERN}/about": {"redirect_always": "/about"},
+            "/courses/{COURSE_ID_PATTERN}/.*": "not_found",
+            "/courses/.*": "login_required",
+        })
+
+        self.assertIsNotNone(engine.matcher)
+        self.assertEqual(
+            engine.match("/courses/course-v1:org+course+run/about"),
+            ("redirect_always", {"redirect_always": "/about"}),
+        )
+        self.assertEqual(engine.match("/courses/course-v1:org+course+run/info"), ("not_found", "not_found"))
+        self.assertEqual(engine.match("/courses/"), ("login_required", "login_required"))
+        self.assertIsNone(engine.match("/dashboard"))
+
+    def test_backreferences_fallback(self):
+        """
+        Test that rules using backreferences are matched one by one.
+        """
+        engine = CompiledPathRedirects({
+            r"/(\w+)/\1/$": "not_found",
+            "/register.*": "login_required",
+        })
+
+        self.assertIsNone(engine.matcher)
+        self.assertEqual(engine.match("/foo/foo/"), ("not_found", "not_found"))
+        self.assertIsNone(engine.match("/foo/bar/"))
+        self.assertEqual(engine.match("/register"), ("login_required", "login_required"))
+
+    def test_compiled_once_per_configuration(self):
+        """
+        Test that the same configuration reuses the compiled engine and a changed one does not.
+        """
+        redirects = {"/register.*": "login_required"}
+
+        engine = get_compiled_path_redirects(redirects)
+
+        self.assertIs(engine, get_compiled_path_redirects(dict(redirects)))
+        self.assertIsNot(engine, get_compiled_path_redirects({"/register.*": "not_found"}))
+
+    def test_same_configuration_not_serialized(self):
+        """
+        Test that the setting object returned again by the site configuration is not serialized again.
+        """
+        redirects = {"/dashboard.*": "login_required"}
+        engine = get_compiled_path_redirects(redirects)
+
+        with mock.patch('eox_core.middleware.json.dumps') as dumps_mock:
+            self.assertIs(engine, get_compiled_path_redirects(redirects))
+
+        dumps_mock.assert_not_called()
+
+
 class RedirectionMiddlewareTest(TestCase):
     """
     Testing the middleware RedirectionsMiddleware.
@@ -134,6 +258,8 @@ class RedirectionMiddlewareTest(TestCase):
         """ setup """
         self.request_factory = RequestFactory()
         self.middleware_instance = RedirectionsMiddleware(get_response=lambda req: None)
+        local_redirect_cache.clear()
+        local_redirections_version.clear()
 
     def test_disabled_feature(self):
         """
@@ -167,6 +293,178 @@ class RedirectionMiddlewareTest(TestCase):
 
         self.assertIsNotNone(result)
 
+    @mock.patch('eox_core.middleware.cache')
+    @mock.patch('eox_core.models.Redirection.objects.get')
+    def test_local_cache_hit(self, redirection_get_mock, cache_mock):
+        """
+        Test that a domain already resolved by the worker does not reach the shared cache.
+        """
+        request = self.request_factory.get('/', HTTP_HOST='local.example.com')
+        cache_mock.get.side_effect = lambda key, default=None: (
+            'version' if key == middleware.REDIRECTIONS_VERSION_KEY else None
+        )
+        redirection_get_mock.side_effect = Redirection.DoesNotExist  # pylint: disable=no-member
+
+        self.middleware_instance.process_request(request)
+        self.middleware_instance.process_request(request)
+
+        self.assertEqual(
+            [call.args[0] for call in cache_mock.get.call_args_list],
+            [
+                middleware.REDIRECTIONS_VERSION_KEY,
+                'redirect_cache.' + fasthash('local.example.com'),
+            ],
+        )
+        redirection_get_mock.assert_called_once()
+
+    @mock.patch('eox_core.middleware.cache')
+    @mock.patch('eox_core.models.Redirection.objects.get')
+    def test_version_checked_once_per_ttl(self, redirection_get_mock, cache_mock):
+        """
+        Test that the shared redirections version is read again only once the local TTL has passed.
+        """
+        request = self.request_factory.get('/', HTTP_HOST='local.example.com')
+        cache_mock.get.side_effect = lambda key, default=None: (
+            'version' if key == middleware.REDIRECTIONS_VERSION_KEY else None
+        )
+        redirection_get_mock.side_effect = Redirection.DoesNotExist  # pylint: disable=no-member
+
+        for _ in range(3):
+            self.middleware_instance.process_request(request)
+        later = time.monotonic() + local_redirections_version.timeout
+        with mock.patch('eox_core.middleware.time.monotonic', return_value=later):
+            self.middleware_instance.process_request(request)
+
+        version_reads = [
+            call for call in cache_mock.get.call_args_list
+            if call.args[0] == middleware.REDIRECTIONS_VERSION_KEY
+        ]
+        self.assertEqual(len(version_reads), 2)
+
+    def test_local_cache_dropped_on_new_version(self):
+        """
+        Test that the local copies are dropped once the worker sees the version set by another worker.
+        """
+        request = self.request_factory.get('/', HTTP_HOST='other-worker.example.com')
+        self.assertIsNone(self.middleware_instance.process_request(request))
+
+        # Another worker saves a redirection: the shared cache changes but not this worker's local state.
+        with mock.patch('eox_core.middleware.local_redirect_cache', LocalLRUCache(max_size=10, timeout=30)), \
+                mock.patch('eox_core.middleware.local_redirections_version', RedirectionsVersion(timeout=30)):
+            with self.captureOnCommitCallbacks(execute=True):
+                Redirection.objects.create(  # pylint: disable=no-member
+                    domain='other-worker.example.com',
+                    target='example.com',
+                )
+
+        self.assertIsNone(self.middleware_instance.process_request(request))
+
+        later = time.monotonic() + local_redirections_version.timeout
+        with mock.patch('eox_core.middleware.time.monotonic', return_value=later):
+            result = self.middleware_instance.process_request(request)
+        self.assertEqual(result.url, 'http://example.com/')
+
+    def test_local_cache_cleared_on_change(self):
+        """
+        Test that saving or deleting a redirection drops the local copy.
+        """
+        request = self.request_factory.get('/', HTTP_HOST='changed.example.com')
+        self.assertIsNone(self.middleware_instance.process_request(request))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirection = Redirection.objects.create(  # pylint: disable=no-member
+                domain='changed.example.com',
+                target='example.com',
+            )
+        result = self.middleware_instance.process_request(request)
+        self.assertEqual(result.url, 'http://example.com/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redirection.delete()
+        self.assertIsNone(self.middleware_instance.process_request(request))
+
+    def test_caches_cleared_after_commit(self):
+        """
+        Test that the redirections version only changes once the transaction of the change is committed.
+        """
+        version = middleware.get_redirections_version()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Redirection.objects.create(  # pylint: disable=no-member
+                domain='uncommitted.example.com',
+                target='example.com',
+            )
+            self.assertEqual(middleware.get_redirections_version(), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(middleware.get_redirections_version(), version)
+
+
+@override_settings(EOX_CORE_REDIRECTION_SNAPSHOT=True)
+class RedirectionSnapshotTest(TestCase):
+    """
+    Testing the RedirectionsMiddleware when the whole table is loaded as a snapshot.
+    """
+    def setUp(self):
+        """ setup """
+        self.request_factory = RequestFactory()
+        self.middleware_instance = RedirectionsMiddleware(get_response=lambda req: None)
+        Redirection.objects.create(domain='Snapshot.example.com', target='example.com')  # pylint: disable=no-member
+        local_redirect_cache.clear()
+        local_redirections_version.clear()
+
+    def test_snapshot_lookup(self):
+        """
+        Test that every host is resolved from a single table load.
+        """
+        with self.assertNumQueries(1):
+            redirected = self.middleware_instance.process_request(
+                self.request_factory.get('/path', HTTP_HOST='snapshot.example.com'),
+            )
+            not_redirected = self.middleware_instance.process_request(
+                self.request_factory.get('/', HTTP_HOST='other.example.com'),
+            )
+
+        self.assertEqual(redirected.url, 'http://example.com/path')
+        self.assertIsNone(not_redirected)
+
+    def test_snapshot_without_shared_cache_reads(self):
+        """
+        Test that the requests answered from the worker snapshot do not read the shared cache.
+        """
+        get_redirections_snapshot()
+
+        with mock.patch('eox_core.middleware.cache') as cache_mock:
+            for host in ('snapshot.example.com', 'other.example.com'):
+                self.middleware_instance.process_request(self.request_factory.get('/', HTTP_HOST=host))
+
+        cache_mock.get.assert_not_called()
+
+    def test_snapshot_shared_between_workers(self):
+        """
+        Test that a worker with an empty local cache reuses the shared snapshot.
+        """
+        get_redirections_snapshot()
+        local_redirect_cache.clear()
+
+        with self.assertNumQueries(0):
+            snapshot = get_redirections_snapshot()
+
+        self.assertIn('snapshot.example.com', snapshot)
+
+    def test_snapshot_rebuilt_on_change(self):
+        """
+        Test that a Redirection change produces a new snapshot version.
+        """
+        get_redirections_snapshot()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Redirection.objects.create(domain='new.example.com', target='example.com')  # pylint: disable=no-member
+        local_redirect_cache.clear()
+
+        self.assertIn('new.example.com', get_redirections_snapshot())
+
 
 class UserLanguagePreferenceMiddlewareTestCase(TestCase):
     """
@@ -174,7 +472,7 @@ class UserLanguagePreferenceMiddlewareTestCase(TestCase):
     """
     def setUp(self):
         self.factory = RequestFactory()
-        self.middleware = UserLanguagePreferenceMiddleware(get_response=lambda req: None)
+        self.middleware = middleware.UserLanguagePreferenceMiddleware(get_response=lambda req: None)
 
     def test_process_request_with_language_cookie(self):
         """
@@ -199,3 +497,26 @@ class UserLanguagePreferenceMiddlewareTestCase(TestCase):
 
         # Check that the language cookie is not set in the request
         self.assertNotIn(settings.LANGUAGE_COOKIE_NAME, request.COOKIES)
+
+
+class LazyMiddlewaresTestCase(TestCase):
+    """
+    Test the middlewares built on first access.
+    """
+
+    def test_middleware_built_once(self):
+        """
+        Test that the middleware class extends the mixin and is reused.
+        """
+        tpa_middleware = middleware.TPAExceptionMiddleware
+
+        self.assertTrue(issubclass(tpa_middleware, middleware.TPAExceptionMiddlewareMixin))
+        self.assertEqual(tpa_middleware.__module__, "eox_core.middleware")
+        self.assertIs(tpa_middleware, middleware.TPAExceptionMiddleware)
+
+    def test_unknown_attribute(self):
+        """
+        Test that unknown attributes still raise AttributeError.
+        """
+        with self.assertRaises(AttributeError):
+            middleware.UnknownMiddleware  # pylint: disable=pointless-statement
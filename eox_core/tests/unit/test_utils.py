@@ -2,11 +2,18 @@
 """
 Test module for Utils
 """
+from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
-from django.test import TestCase
-from mock import patch
+from django.test import RequestFactory, TestCase
+from mock import Mock, patch
 
-from eox_core.utils import fasthash, get_domain_from_oauth_app_uris, get_or_create_site_from_oauth_app_uris
+from eox_core.utils import (
+    LocalLRUCache,
+    fasthash,
+    get_domain_from_oauth_app_uris,
+    get_or_create_site_from_oauth_app_uris,
+    get_request_identity_map,
+)
 
 
 class UtilsTest(TestCase):
@@ -115,3 +122,103 @@ class UtilsTest(TestCase):
         self.assertEqual(new_site_domain, site.domain)
         self.assertEqual(1, Site.objects.filter(domain=self.domain_1).count())
         mock_get_domain.assert_called_once()
+
+
+class LocalLRUCacheTest(TestCase):
+    """
+    Test the in-process LRU cache.
+    """
+
+    def test_evicts_least_recently_used(self):
+        """
+        Test that the oldest unused entry is evicted when the cache is full.
+        """
+        local_cache = LocalLRUCache(max_size=2, timeout=60)
+        local_cache.set("a", 1)
+        local_cache.set("b", 2)
+        local_cache.get("a")
+        local_cache.set("c", 3)
+
+        self.assertEqual(local_cache.get("a"), 1)
+        self.assertIsNone(local_cache.get("b"))
+        self.assertEqual(local_cache.get("c"), 3)
+
+    @patch("eox_core.utils.time.monotonic")
+    def test_expired_entries(self, monotonic_mock):
+        """
+        Test that entries are not returned after their timeout.
+        """
+        local_cache = LocalLRUCache(max_size=2, timeout=30)
+        monotonic_mock.return_value = 100
+        local_cache.set("a", 1)
+
+        monotonic_mock.return_value = 131
+
+        self.assertIsNone(local_cache.get("a"))
+
+    def test_delete(self):
+        """
+        Test that deleted entries are no longer returned.
+        """
+        local_cache = LocalLRUCache(max_size=2, timeout=60)
+        local_cache.set("a", 1)
+        local_cache.delete("a")
+        local_cache.delete("missing")
+
+        self.assertIsNone(local_cache.get("a"))
+
+
+class RequestIdentityMapTest(TestCase):
+    """
+    Test the identity map of resolved objects kept per request.
+    """
+
+    def test_map_is_kept_per_request(self):
+        """
+        Test that the same map is returned for a request and a new one for another request.
+        """
+        request = RequestFactory().get("/")
+        user = User(username="test", email="test@example.com")
+
+        get_request_identity_map(request).add_user(user)
+
+        self.assertIs(user, get_request_identity_map(request).get_user(username="test"))
+        self.assertIs(user, get_request_identity_map(request).get_user(email="test@example.com"))
+        self.assertIsNone(get_request_identity_map(RequestFactory().get("/")).get_user(username="test"))
+
+    @patch("eox_core.utils.get_current_request", return_value=None)
+    def test_map_outside_of_request(self, _):
+        """
+        Test that nothing is kept when there is no request.
+        """
+        get_request_identity_map().add_course_key("course-v1:org+course+run", "key")
+
+        self.assertIsNone(get_request_identity_map().get_course_key("course-v1:org+course+run"))
+
+    def test_memoize(self):
+        """
+        Test that a memoized function is called once per key.
+        """
+        identity_map = get_request_identity_map(RequestFactory().get("/"))
+        func = Mock(return_value=["result"])
+
+        identity_map.memoize("key", func, "arg")
+        result = identity_map.memoize("key", func, "arg")
+
+        self.assertEqual(["result"], result)
+        func.assert_called_once_with("arg")
+
+    def test_clear_users(self):
+        """
+        Test that clearing the users drops the memoized results and keeps the course keys.
+        """
+        identity_map = get_request_identity_map(RequestFactory().get("/"))
+        identity_map.add_user(User(username="test", email="test@example.com"))
+        identity_map.add_course_key("course-v1:org+course+run", "key")
+        identity_map.memoize("key", Mock())
+
+        identity_map.clear_users()
+
+        self.assertIsNone(identity_map.get_user(username="test"))
+        self.assertEqual({}, identity_map.results)
+        self.assertEqual("key", identity_map.get_course_key("course-v1:org+course+run"))
@@ -2,10 +2,17 @@
 """
 Tests the separation layer between edxapp and the plugin
 """
-from django.test import TestCase
+import importlib
+import sys
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils.functional import SimpleLazyObject
 from mock import Mock, patch
 
-from eox_core.edxapp_wrapper import configuration_helpers
+from eox_core.edxapp_wrapper import configuration_helpers, registry
+from eox_core.edxapp_wrapper.registry import reset_backends
+from eox_core.edxapp_wrapper.users import get_user_profile
 
 
 class ConfigurationHelpersTest(TestCase):
@@ -13,7 +20,14 @@ class ConfigurationHelpersTest(TestCase):
     Making sure that the configuration_helpers backend works
     """
 
-    @patch('eox_core.edxapp_wrapper.configuration_helpers.import_module')
+    def setUp(self):
+        """
+        Make sure the backend is imported again in every test.
+        """
+        reset_backends()
+        self.addCleanup(reset_backends)
+
+    @patch('eox_core.edxapp_wrapper.registry.import_module')
     def test_imported_module_is_used(self, import_mock):
         """
         Testing the backend is imported and used
@@ -25,3 +39,45 @@ class ConfigurationHelpersTest(TestCase):
 
         import_mock.assert_called()
         backend.assert_called()
+
+    @patch('eox_core.edxapp_wrapper.registry.import_module')
+    def test_backend_resolved_once(self, import_mock):
+        """
+        Testing the backend is imported only once and reloaded when the setting changes
+        """
+        configuration_helpers.get_configuration_helper()
+        configuration_helpers.get_configuration_helper()
+
+        import_mock.assert_called_once_with(settings.EOX_CORE_CONFIGURATION_HELPER_BACKEND)
+
+        with override_settings(EOX_CORE_CONFIGURATION_HELPER_BACKEND="other.backend"):
+            configuration_helpers.get_configuration_helper()
+
+        import_mock.assert_called_with("other.backend")
+
+
+class LazyImportTest(TestCase):
+    """
+    Making sure that importing the API modules does not load the edxapp backends.
+    """
+
+    def setUp(self):
+        """
+        Start without any resolved backend.
+        """
+        reset_backends()
+        self.addCleanup(reset_backends)
+
+    def test_v1_serializers_import(self):
+        """
+        Testing that the v1 serializers only resolve the users backend when they are instantiated.
+        """
+        with patch.dict(sys.modules), patch("eox_core.utils.UserProfile", SimpleLazyObject(get_user_profile)):
+            sys.modules.pop("eox_core.api.v1.serializers", None)
+            serializers = importlib.import_module("eox_core.api.v1.serializers")
+
+            self.assertNotIn("EOX_CORE_USERS_BACKEND", registry._backends)  # pylint: disable=protected-access
+
+            serializers.EdxappExtendedUserSerializer()
+
+            self.assertIn("EOX_CORE_USERS_BACKEND", registry._backends)  # pylint: disable=protected-access
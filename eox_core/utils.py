@@ -5,17 +5,22 @@ Util function definitions.
 import datetime
 import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
 
 import requests
+from crum import get_current_request
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import cache
+from django.utils.functional import SimpleLazyObject
 from pytz import UTC
 from rest_framework import serializers
 
 from eox_core.edxapp_wrapper.users import get_user_profile
 
-UserProfile = get_user_profile()
+UserProfile = SimpleLazyObject(get_user_profile)  # pylint: disable=invalid-name
 
 try:
     cache = cache.caches['general']  # pylint: disable=invalid-name
@@ -32,6 +37,144 @@ def fasthash(string):
     return md5.hexdigest()
 
 
+class LocalLRUCache:
+    """
+    Bounded, thread safe, in-process cache with a per entry time to live.
+
+    It is meant to sit in front of the shared cache for values that are read on
+    every request, so the common case does not need a network round trip.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for key or default if it is missing or expired.
+        """
+        with self._lock:
+            try:
+                expires_at, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Store value under key, evicting the least recently used entries if needed.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove key from the cache if present.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+
+class RequestIdentityMap:
+    """
+    Users, course keys and checks already resolved while handling a request.
+
+    Views register the objects they resolve so the backends called later in the
+    same request can use them instead of querying or parsing them again.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.course_keys = {}
+        self.results = {}
+
+    def add_user(self, user):
+        """
+        Register a resolved user by its username and email.
+        """
+        self.users[("username", user.username)] = user
+        self.users[("email", user.email)] = user
+
+    def get_user(self, username=None, email=None):
+        """
+        Return the resolved user for the username, or the email when no username is given.
+        """
+        if username:
+            return self.users.get(("username", username))
+        if email:
+            return self.users.get(("email", email))
+        return None
+
+    def add_course_key(self, course_id, course_key):
+        """
+        Register a resolved course key by its course_id.
+        """
+        self.course_keys[str(course_id)] = course_key
+
+    def get_course_key(self, course_id):
+        """
+        Return the resolved course key for the course_id.
+        """
+        return self.course_keys.get(str(course_id))
+
+    def clear_users(self):
+        """
+        Drop the resolved users and the memoized results, keeping the course keys.
+
+        Used between the chunks of a streamed request, so the map does not grow with its size.
+        """
+        self.users.clear()
+        self.results.clear()
+
+    def memoize(self, key, func, *args, **kwargs):
+        """
+        Return the result of calling func, calling it only the first time the key is used.
+        """
+        if key not in self.results:
+            self.results[key] = func(*args, **kwargs)
+        return self.results[key]
+
+
+def get_request_identity_map(request=None):
+    """
+    Return the identity map of the given or current request.
+
+    Outside of a request a new map is returned every time, so nothing is kept.
+    """
+    request = request if request is not None else get_current_request()
+    if request is None:
+        return RequestIdentityMap()
+
+    # Use the django request so the map is shared with the code that only sees it.
+    request = getattr(request, "_request", request)
+    identity_map = getattr(request, "eox_core_identity_map", None)
+    if identity_map is None:
+        identity_map = RequestIdentityMap()
+        request.eox_core_identity_map = identity_map
+    return identity_map
+
+
 def get_valid_years():
     """
     Return valid list of year range, for the YEAR_OF_BIRTH_CHOICES